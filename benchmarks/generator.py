@@ -0,0 +1,88 @@
+"""
+Synthetic documents generator. Model objects are filled with generated values by walking the model definitions
+(the field mappers and the field type annotations), the documents are produced by serializing the objects.
+"""
+
+import datetime as dt
+import decimal
+import random
+
+import attr
+
+import paxb as pb
+from paxb import mappers
+from paxb import plan
+
+
+def generate_value(value_type, rnd):
+    """
+    Generates a field value of `value_type` type. Fields without a type annotation get string values.
+    """
+
+    if value_type is bool:
+        return rnd.random() < 0.5
+    if value_type is int:
+        return rnd.randint(0, 10 ** 6)
+    if value_type is float:
+        return round(rnd.uniform(0, 10 ** 3), 3)
+    if value_type is decimal.Decimal:
+        return decimal.Decimal(rnd.randint(0, 10 ** 6)) / 100
+    if value_type is dt.datetime:
+        return dt.datetime(2020, 1, 1) + dt.timedelta(seconds=rnd.randint(0, 10 ** 7))
+    if value_type is dt.date:
+        return dt.date(2020, 1, 1) + dt.timedelta(days=rnd.randint(0, 10 ** 3))
+
+    return 'value{}'.format(rnd.randint(0, 10 ** 6))
+
+
+def generate_field(mapper, value_type, list_length, rnd):
+    while isinstance(mapper, mappers.WrapperXmlMapper):
+        mapper = mapper.wrapped
+
+    if isinstance(mapper, mappers.ModelXmlMapper):
+        return generate_object(mapper.cls, list_length, rnd)
+    if isinstance(mapper, mappers.ListXmlWrapper):
+        item_type = plan.item_type(value_type)
+        return [generate_field(mapper.wrapped, item_type, list_length, rnd) for _ in range(list_length)]
+    if isinstance(mapper, mappers.ArrayXmlMapper):
+        return [generate_value(float, rnd) for _ in range(list_length)]
+
+    return generate_value(value_type, rnd)
+
+
+def generate_object(cls, list_length=10, rnd=None):
+    """
+    Generates a model object. All the fields including the optional ones are set.
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :param int list_length: length of the generated lists
+    :param rnd: random numbers generator
+    :type rnd: :py:class:`random.Random`
+    :return: model object
+    """
+
+    rnd = rnd or random.Random(0)
+
+    kwargs = {}
+    for attribute in attr.fields(cls):
+        mapper = attribute.metadata.get('paxb.mapper')
+        if mapper is not None:
+            kwargs[attribute.name.lstrip('_')] = generate_field(mapper, attribute.type, list_length, rnd)
+
+    return cls(**kwargs)
+
+
+def generate_document(cls, list_length=10, seed=0, **kwargs):
+    """
+    Generates an xml document of a model.
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :param int list_length: length of the generated lists
+    :param int seed: random numbers generator seed. The same seed produces the same document
+    :param kwargs: arguments that will be passed to :py:func:`paxb.to_xml`
+    :return: (model object, xml document) pair
+    """
+
+    obj = generate_object(cls, list_length, random.Random(seed))
+
+    return obj, pb.to_xml(obj, **kwargs)
@@ -0,0 +1,85 @@
+"""
+Benchmark model factories. Every factory builds a model class stressing one aspect of the mapping:
+the number of fields, the list length, the nesting depth, the wrapper depth or the number of namespaces.
+"""
+
+import typing as tp
+
+import paxb as pb
+
+
+def build_model(name, fields, **kwargs):
+    return pb.model(type(name, (), fields), name=name.lower(), **kwargs)
+
+
+def flat_model(fields, kind):
+    """
+    A model with `fields` attributes (``kind='attribute'``) or elements (``kind='element'``).
+    Half of the fields are annotated as :py:class:`int` so that their values are encoded and decoded.
+    """
+
+    mapper = pb.attr if kind == 'attribute' else pb.field
+
+    return build_model('Flat', {
+        '__annotations__': {'field{}'.format(i): int for i in range(0, fields, 2)},
+        **{'field{}'.format(i): mapper() for i in range(fields)},
+    })
+
+
+ITEM = build_model('Item', {
+    '__annotations__': {'quantity': int, 'price': float},
+    'id': pb.attr(),
+    'name': pb.field(),
+    'quantity': pb.field(),
+    'price': pb.field(),
+})
+
+
+def list_model():
+    """
+    A model containing a list of nested items and a list of :py:class:`int` elements. The list length
+    is set by the document generator.
+    """
+
+    return build_model('Order', {
+        '__annotations__': {'values': tp.List[int]},
+        'id': pb.attr(),
+        'items': pb.wrap('items', pb.as_list(pb.nested(ITEM))),
+        'values': pb.as_list(pb.field(name='value')),
+    })
+
+
+def nested_model(depth):
+    """
+    A chain of `depth` nested models.
+    """
+
+    cls = build_model('Level{}'.format(depth), {'name': pb.attr(), 'value': pb.field()})
+    for level in reversed(range(depth - 1)):
+        cls = build_model('Level{}'.format(level), {'name': pb.attr(), 'value': pb.field(), 'child': pb.nested(cls)})
+
+    return cls
+
+
+def wrapper_model(depth, fields=5):
+    """
+    A model with `fields` fields wrapped into elements `depth` levels deep.
+    """
+
+    path = '/'.join('wrapper{}'.format(level) for level in range(depth))
+
+    return build_model('Wrapped', {
+        'field{}'.format(i): pb.wrap(path, pb.field(name='field{}'.format(i))) for i in range(fields)
+    })
+
+
+def namespace_model(count, fields=10):
+    """
+    A model with `fields` elements spread over `count` namespaces.
+    """
+
+    ns_map = {'ns{}'.format(i): 'http://www.test{}.org'.format(i) for i in range(count)}
+
+    return build_model('Namespaced', {
+        'field{}'.format(i): pb.field(ns='ns{}'.format(i % count)) for i in range(fields)
+    }, ns='ns0', ns_map=ns_map)
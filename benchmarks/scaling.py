@@ -0,0 +1,82 @@
+"""
+Input size scaling benchmark. Measures how the deserialization and serialization time grows with the number
+of list items and model fields. A linear implementation takes about `FACTOR` times longer for a `FACTOR` times
+larger input, a quadratic one about ``FACTOR ** 2`` times longer.
+
+Usage: python benchmarks/scaling.py
+"""
+
+import timeit
+
+import paxb as pb
+
+SIZE = 2000
+FACTOR = 8
+REPEAT = 3
+
+
+@pb.model(name='item')
+class Item:
+    attrib = pb.attr()
+    element = pb.field()
+
+
+@pb.model(name='field_list')
+class FieldList:
+    items = pb.as_list(pb.field(name='item'))
+
+
+@pb.model(name='nested_list')
+class NestedList:
+    items = pb.as_list(pb.nested(Item))
+    wrapped_items = pb.as_list(pb.wrap('wrapper', pb.field(name='item')))
+
+
+def field_list_xml(size):
+    return FieldList, '<field_list>{}</field_list>'.format('<item>value</item>' * size)
+
+
+def nested_list_xml(size):
+    items = '<item attrib="value"><element>value</element></item>' * size
+    return NestedList, '<nested_list>{}</nested_list>'.format(items)
+
+
+def wide_model_xml(size):
+    fields = {'element{}'.format(i): pb.field(default=None) for i in range(size)}
+    model = pb.model(type('WideModel', (), fields), name='wide_model')
+    return model, '<wide_model>{}</wide_model>'.format(''.join('<element{0}/>'.format(i) for i in range(size)))
+
+
+def field_list_obj(size):
+    return FieldList(items=['value'] * size),
+
+
+def nested_list_obj(size):
+    return NestedList(items=[Item(attrib='value', element='value')] * size, wrapped_items=['value'] * size),
+
+
+CASES = [
+    ('field list from_xml', pb.from_xml, field_list_xml, SIZE),
+    ('nested list from_xml', pb.from_xml, nested_list_xml, SIZE),
+    ('wide model from_xml', pb.from_xml, wide_model_xml, SIZE // 10),
+    ('field list to_xml', pb.to_xml, field_list_obj, SIZE),
+    ('nested list to_xml', pb.to_xml, nested_list_obj, SIZE),
+]
+
+
+def measure(func, args):
+    return min(timeit.repeat(lambda: func(*args), number=1, repeat=REPEAT))
+
+
+def main():
+    for name, func, make_args, size in CASES:
+        small = measure(func, make_args(size))
+        large = measure(func, make_args(size * FACTOR))
+
+        print('{:22} {:8.2f} ms -> {:8.2f} ms  growth: {:5.1f}x for {}x input'.format(
+            name, small * 1e3, large * 1e3, large / small, FACTOR,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Slotted models benchmark. Compares the deserialization time and the memory taken by the deserialized objects
+of a regular model and the same model declared with ``slots=True``.
+
+Usage: python benchmarks/slots.py
+"""
+
+import io
+import timeit
+import tracemalloc
+
+import paxb as pb
+
+FIELDS = 10
+RECORDS = 100000
+NUMBER = 5
+
+
+def record_model(slots):
+    return pb.model(
+        type('Record', (), {'field{}'.format(i): pb.attr() for i in range(FIELDS)}),
+        name='record', slots=slots,
+    )
+
+
+def document(cls):
+    obj = cls(**{'field{}'.format(i): 'value{}'.format(i) for i in range(FIELDS)})
+    records = pb.to_xml(obj, encoding='unicode') * RECORDS
+
+    return '<records>{}</records>'.format(records).encode()
+
+
+def main():
+    for slots in [False, True]:
+        cls = record_model(slots)
+        xml = document(cls)
+
+        def load():
+            return list(pb.iter_xml(cls, io.BytesIO(xml), 'records/record'))
+
+        elapsed = min(timeit.repeat(load, number=1, repeat=NUMBER))
+
+        tracemalloc.start()
+        snapshot = tracemalloc.take_snapshot()
+        objects = load()
+        size = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'filename'))
+        tracemalloc.stop()
+
+        print('slots={!s:5}  iter_xml: {:6.1f} ms  memory: {:5.1f} MiB ({:.0f} bytes per object)'.format(
+            slots, elapsed * 1e3, size / 2 ** 20, size / len(objects),
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+"""
+Serialization and deserialization benchmark suite. Every case is a model built by :py:mod:`models` and
+a document generated by :py:mod:`generator`. :py:func:`paxb.from_xml` and :py:func:`paxb.to_xml` are timed for
+every engine, the results are stored as JSON so that they can be compared between commits.
+
+Usage:
+
+    python benchmarks/suite.py --output before.json
+    git checkout feature-branch
+    python benchmarks/suite.py --output after.json --compare before.json
+"""
+
+import argparse
+import datetime as dt
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+import generator
+import models
+
+import paxb as pb
+
+DESERIALIZATION_ENGINES = ('codegen', 'mappers', 'expat')
+SERIALIZATION_ENGINES = ('codegen', 'mappers')
+
+
+def cases():
+    """
+    Returns benchmark cases: (case name, model class, generated list length) tuples.
+    """
+
+    for fields in (10, 100):
+        for kind in ('attribute', 'element'):
+            yield 'flat/{}/{}'.format(kind, fields), models.flat_model(fields, kind), 0
+
+    order = models.list_model()
+    for length in (10, 100, 1000):
+        yield 'list/{}'.format(length), order, length
+
+    for depth in (1, 5, 20):
+        yield 'nesting/{}'.format(depth), models.nested_model(depth), 0
+
+    for depth in (1, 5, 20):
+        yield 'wrappers/{}'.format(depth), models.wrapper_model(depth), 0
+
+    for count in (1, 5, 10):
+        yield 'namespaces/{}'.format(count), models.namespace_model(count), 0
+
+
+def measure(func, repeat, min_time):
+    """
+    Times `func` calls. The number of calls in a timing loop is chosen so that the loop takes at least
+    `min_time` seconds.
+
+    :return: dict of the minimal and the median call time in microseconds and the number of calls in a loop
+    """
+
+    timer = timeit.Timer(func)
+
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    times = [elapsed / number * 1e6 for elapsed in timer.repeat(repeat, number)]
+
+    return {'min': min(times), 'median': statistics.median(times), 'number': number}
+
+
+def run(pattern=None, repeat=5, min_time=0.05):
+    """
+    Runs the benchmarks.
+
+    :param str pattern: substring of the names of the cases to be run. If ``None`` all the cases are run
+    :param int repeat: number of timing loops
+    :param float min_time: minimal timing loop time in seconds
+    :return: mapping from a benchmark name to its timings
+    """
+
+    results = {}
+    for name, cls, list_length in cases():
+        if pattern and pattern not in name:
+            continue
+
+        obj, xml = generator.generate_document(cls, list_length=list_length)
+        size = len(xml)
+
+        for engine in DESERIALIZATION_ENGINES:
+            assert pb.from_xml(cls, xml, engine=engine) == obj
+
+            key = '{}/from_xml/{}'.format(name, engine)
+            results[key] = dict(measure(lambda: pb.from_xml(cls, xml, engine=engine), repeat, min_time), size=size)
+            print_result(key, results[key])
+
+        for engine in SERIALIZATION_ENGINES:
+            key = '{}/to_xml/{}'.format(name, engine)
+            results[key] = dict(measure(lambda: pb.to_xml(obj, engine=engine), repeat, min_time), size=size)
+            print_result(key, results[key])
+
+    return results
+
+
+def print_result(key, result):
+    print('{:40} {:10.1f} us  (median {:10.1f} us, {:7} bytes)'.format(
+        key, result['min'], result['median'], result['size'],
+    ))
+
+
+def metadata():
+    """
+    Returns the environment description stored with the results.
+    """
+
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        'commit': commit,
+        'date': dt.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'paxb': pb.__version__,
+    }
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the benchmark timings relative to the baseline ones.
+
+    :return: number of benchmarks that are slower than the baseline by more than `threshold`
+    """
+
+    regressions = 0
+    print()
+    print('{:40} {:>12} {:>12} {:>8}'.format('benchmark', 'baseline', 'current', 'ratio'))
+    for key, result in results.items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+
+        ratio = result['min'] / base['min']
+        regressed = ratio > 1 + threshold
+        regressions += regressed
+
+        print('{:40} {:9.1f} us {:9.1f} us {:7.2f}x{}'.format(
+            key, base['min'], result['min'], ratio, '  slower' if regressed else '',
+        ))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='paxb benchmark suite')
+    parser.add_argument('-o', '--output', help='file the results are stored to in JSON format')
+    parser.add_argument('-c', '--compare', help='baseline results file the results are compared with')
+    parser.add_argument('-k', '--filter', help='run only the cases which names contain the substring')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of timing loops')
+    parser.add_argument('-t', '--min-time', type=float, default=0.05, help='minimal timing loop time in seconds')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1, help='relative slowdown reported as a regression (default 0.1)',
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.filter, args.repeat, args.min_time)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'metadata': metadata(), 'results': results}, file, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
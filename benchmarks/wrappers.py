@@ -0,0 +1,43 @@
+"""
+Deep shared wrapper paths benchmark. Every field of the model is wrapped by the same deep element path
+so the wrapper elements are shared by all the fields.
+
+Usage: python benchmarks/wrappers.py
+"""
+
+import timeit
+
+import paxb as pb
+
+DEPTH = 5
+FIELDS = 20
+NUMBER = 2000
+
+PATH = '/'.join('wrapper{}'.format(depth) for depth in range(DEPTH))
+
+Model = pb.model(
+    type('Model', (), {
+        'field{}'.format(i): pb.wrap(PATH, pb.attr(name='attrib{}'.format(i))) for i in range(FIELDS)
+    }),
+    name='model',
+)
+
+obj = Model(**{'field{}'.format(i): 'value{}'.format(i) for i in range(FIELDS)})
+xml = pb.to_xml(obj)
+
+
+def main():
+    for engine in ['codegen', 'mappers']:
+        pb.from_xml(Model, xml, engine=engine)
+        pb.to_xml(obj, engine=engine)
+
+        deserialization = timeit.timeit(lambda: pb.from_xml(Model, xml, engine=engine), number=NUMBER) / NUMBER
+        serialization = timeit.timeit(lambda: pb.to_xml(obj, engine=engine), number=NUMBER) / NUMBER
+
+        print('{:8} from_xml: {:7.1f} us   to_xml: {:7.1f} us'.format(
+            engine, deserialization * 1e6, serialization * 1e6,
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -25,15 +25,24 @@ from .__about__ import (
     __license__
 )
 from .paxb import (
+    aiter_xml,
+    as_array,
     as_list,
     attribute,
     field,
     from_xml,
+    from_xml_many,
+    iter_xml,
+    materialize,
     nested,
     model,
+    to_columns,
     to_xml,
+    to_xml_chunks,
     wrapper,
 )
+from .aio import AsyncXmlWriter
+from .stream import FeedDeserializer, XmlWriter
 from . import exceptions as exc
 
 
@@ -52,16 +61,26 @@ __all__ = [
     '__email__',
     '__license__',
 
+    'aiter_xml',
+    'as_array',
     'as_list',
     'attr',
     'attribute',
+    'AsyncXmlWriter',
     'exc',
+    'FeedDeserializer',
     'field',
     'from_xml',
+    'from_xml_many',
+    'iter_xml',
     'lst',
+    'materialize',
     'nested',
     'model',
+    'to_columns',
     'to_xml',
+    'to_xml_chunks',
     'wrap',
     'wrapper',
+    'XmlWriter',
 ]
@@ -0,0 +1,106 @@
+"""
+The module implements :py:mod:`asyncio` streaming deserialization and serialization. Documents are read
+from and written to asyncio streams chunk by chunk so that the event loop is blocked only for the time
+a single chunk is processed and neither the whole document nor its element tree is kept in memory.
+"""
+
+import collections
+
+from . import encoder as default_encoder
+from . import stream
+
+
+class RecordIterator:
+    """
+    Asynchronous iterator of the objects deserialized from an asyncio stream (see :py:func:`paxb.aiter_xml`).
+    """
+
+    def __init__(self, cls, reader, path, ns_map=None, engine='codegen', backend='etree', chunk_size=64 * 1024):
+        self.reader = reader
+        self.chunk_size = chunk_size
+        self.deserializer = stream.FeedDeserializer(cls, path, ns_map, engine=engine, backend=backend)
+        self.objects = collections.deque()
+        self.eof = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self.objects:
+            if self.eof:
+                raise StopAsyncIteration
+
+            data = await self.reader.read(self.chunk_size)
+            if data:
+                self.deserializer.feed(data)
+            else:
+                self.eof = True
+                self.deserializer.close()
+
+            self.objects.extend(self.deserializer.read_objects())
+
+        return self.objects.popleft()
+
+
+class AsyncXmlWriter:
+    """
+    Asynchronous streaming xml writer. Serializes ``paxb`` model objects one by one into
+    an :py:class:`asyncio.StreamWriter` waiting for the stream buffer to be flushed (``drain``) after every
+    object so that the writing is slowed down to the peer reading speed. The stream is not closed by the writer.
+
+    The writer can be used as an asynchronous context manager closing the envelope elements on exit.
+
+    :param writer: :py:class:`asyncio.StreamWriter` or any object implementing ``write`` and ``drain`` methods
+    :param str envelope: slash-separated envelope elements path (see :py:class:`paxb.XmlWriter`)
+    :param dict ns_map: mapping from a namespace prefix to a full name
+    :param encoder: value encoder
+    :param str encoding: document encoding
+    :param bool xml_declaration: write xml declaration
+    :param str engine: serialization engine (see :py:func:`paxb.to_xml`)
+    """
+
+    def __init__(
+        self, writer, envelope=None, ns_map=None, encoder=default_encoder, encoding='utf-8', xml_declaration=False,
+        engine='codegen',
+    ):
+        self.writer = writer
+        self.xml_writer = stream.XmlWriter(
+            writer, envelope, ns_map, encoder=encoder, encoding=encoding, xml_declaration=xml_declaration,
+            engine=engine,
+        )
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.close()
+
+    async def open(self):
+        """
+        Writes xml declaration and envelope opening tags. Called automatically on the first object writing.
+        """
+
+        self.xml_writer.open()
+        await self.writer.drain()
+
+    async def write(self, obj, name=None, ns=None):
+        """
+        Serializes an object and writes it inside the envelope.
+
+        :param obj: object to be serialized
+        :param str name: name of the serialized object element. If `None` model decorator `name` argument will be used
+        :param str ns: namespace of the serialized object element. If `None` model decorator `ns` argument will be used
+        """
+
+        self.xml_writer.write(obj, name, ns)
+        await self.writer.drain()
+
+    async def close(self):
+        """
+        Writes envelope closing tags.
+        """
+
+        self.xml_writer.close()
+        await self.writer.drain()
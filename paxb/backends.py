@@ -0,0 +1,268 @@
+"""
+The module implements xml tree backends. A backend provides the element tree implementation used for parsing,
+building and serializing xml documents. The standard library :py:mod:`xml.etree.ElementTree` backend is used
+by default, the `lxml <https://lxml.de>`_ backend is available if ``lxml`` is installed. lxml is imported
+when the backend is requested for the first time.
+
+Deserialization only uses the element interface common to both implementations (``find``, ``findall``, ``get``
+and ``text``) so elements of any backend can be passed to :py:func:`paxb.from_xml` directly.
+"""
+
+import contextlib
+import io
+import mmap
+import os
+import stat
+import xml.etree.ElementTree as et
+
+from . import mappers
+
+# size of the buffer slices the parser is fed
+CHUNK_SIZE = 1024 * 1024
+
+
+class Backend:
+    """
+    Base backend class. Delegates to an ElementTree compatible module.
+
+    :param str name: backend name
+    :param module: ElementTree compatible module
+    """
+
+    def __init__(self, name, module):
+        self.name = name
+        self.module = module
+        self.Element = module.Element
+        self.SubElement = module.SubElement
+
+    def __repr__(self):
+        return '<{} backend>'.format(self.name)
+
+    def fromstring(self, text):
+        """
+        Parses an xml document.
+
+        :param text: xml document
+        :type text: :py:class:`str` or :py:class:`bytes`
+        :return: document root element
+        """
+
+        return self.module.fromstring(text)
+
+    def parser(self):
+        """
+        Creates a document parser.
+        """
+
+        return self.module.XMLParser()
+
+    def frombuffer(self, buffer):
+        """
+        Parses an xml document from a bytes-like object (for example a memory-mapped file). The parser is fed
+        the buffer slices so that the buffer is not copied.
+
+        :param buffer: bytes-like object
+        :return: document root element
+        """
+
+        parser = self.parser()
+        with memoryview(buffer) as view:
+            for start in range(0, len(view), CHUNK_SIZE):
+                parser.feed(self.chunk(view[start:start + CHUNK_SIZE]))
+
+        return parser.close()
+
+    def chunk(self, view):
+        return view
+
+    def iterparse(self, source, events):
+        """
+        Parses an xml document incrementally.
+
+        :param source: file name or file object containing xml data
+        :param tuple events: events to report
+        :return: iterator of (event, element) pairs
+        """
+
+        return self.module.iterparse(source, events=events)
+
+    def pull_parser(self, events):
+        """
+        Creates a non-blocking parser the data is fed to incrementally.
+
+        :param tuple events: events to report
+        :return: parser compatible with :py:class:`xml.etree.ElementTree.XMLPullParser`
+        """
+
+        return self.module.XMLPullParser(events=events)
+
+    def container(self):
+        """
+        Creates a detached element used as a parent of a document root element.
+        """
+
+        return self.Element(None)
+
+    def envelope(self, tag, ns_map):
+        """
+        Creates a serialized document envelope element.
+
+        :param str tag: envelope element name
+        :param dict ns_map: mapping from a namespace prefix to a full name
+        :return: envelope element
+        """
+
+        return self.Element(tag)
+
+    def register_namespace(self, prefix, uri):
+        self.module.register_namespace(prefix, uri)
+
+    def tostring(self, element, **kwargs):
+        """
+        Serializes an element.
+
+        :param element: element to be serialized
+        :param kwargs: backend specific arguments
+        :return: serialized element
+        """
+
+        return self.module.tostring(element, **kwargs)
+
+
+class LxmlBackend(Backend):
+    """
+    `lxml <https://lxml.de>`_ backend. lxml parsers are not thread-safe so a parser is created for every document.
+    All the parsers are created with the same options: entities are not resolved and network access is disabled.
+
+    :param module: ``lxml.etree`` module
+    """
+
+    PARSER_OPTIONS = dict(resolve_entities=False, no_network=True)
+
+    def __init__(self, module):
+        super().__init__('lxml', module)
+
+    def parser(self, encoding=None):
+        return self.module.XMLParser(encoding=encoding, **self.PARSER_OPTIONS)
+
+    def fromstring(self, text):
+        # lxml doesn't accept unicode strings with an encoding declaration
+        # so they are encoded and the declaration is overridden
+        if isinstance(text, str):
+            return self.module.fromstring(text.encode('utf-8'), self.parser(encoding='utf-8'))
+
+        return self.module.fromstring(text, self.parser())
+
+    def iterparse(self, source, events):
+        return self.module.iterparse(source, events=events, **self.PARSER_OPTIONS)
+
+    def pull_parser(self, events):
+        return self.module.XMLPullParser(events=events, **self.PARSER_OPTIONS)
+
+    def chunk(self, view):
+        # lxml parser doesn't accept buffers so the chunks are copied
+        return view.tobytes()
+
+    def container(self):
+        # lxml doesn't accept elements without a name
+        return self.Element('container')
+
+    def envelope(self, tag, ns_map):
+        # lxml doesn't accept prefixed names so the prefix is resolved
+        ns, _, name = tag.rpartition(':')
+
+        return self.Element(mappers.resolve_tag(ns, name, ns_map or {}))
+
+    def register_namespace(self, prefix, uri):
+        # lxml doesn't support default namespace registration
+        if prefix:
+            self.module.register_namespace(prefix, uri)
+
+
+def regular_file(source):
+    """
+    Checks that a file object reads a regular file directly so that the file can be memory-mapped.
+    Compressed files, pipes and sockets are not mapped.
+    """
+
+    if not isinstance(source, (io.FileIO, io.BufferedReader)):
+        return False
+
+    try:
+        return stat.S_ISREG(os.fstat(source.fileno()).st_mode)
+    except (OSError, ValueError, io.UnsupportedOperation):
+        return False
+
+
+@contextlib.contextmanager
+def mapped(source):
+    """
+    Maps a file into memory. The mapping is closed on the context manager exit and the file position
+    is moved to the end of the file.
+
+    :param source: file path or binary file object. A file object is mapped starting from its current position.
+                   File objects that don't read a regular file directly (in-memory, compressed files or pipes)
+                   are read as is
+    :return: context manager returning a bytes-like object
+    """
+
+    if not hasattr(source, 'read'):
+        with open(source, 'rb') as file:
+            with mapped(file) as buffer:
+                yield buffer
+        return
+
+    if not regular_file(source):
+        if not hasattr(source, 'getbuffer'):
+            yield source.read()
+            return
+
+        # the file object can't be resized while its buffer is referenced by a view
+        with source.getbuffer()[source.tell():] as view:
+            yield view
+        source.seek(0, io.SEEK_END)
+        return
+
+    fileno = source.fileno()
+    offset = source.tell()
+    if os.fstat(fileno).st_size <= offset:
+        # empty files can't be mapped
+        yield b''
+        return
+
+    # the mapping can't be closed while it is referenced by a view
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as mapping, memoryview(mapping)[offset:] as view:
+        yield view
+    source.seek(0, io.SEEK_END)
+
+
+etree = Backend('etree', et)
+# created by get_backend on the first request
+lxml = None
+
+
+def get_backend(backend):
+    """
+    Returns a backend by its name.
+
+    :param backend: backend name (``'etree'`` or ``'lxml'``) or a backend instance
+    :return: backend
+    :rtype: :py:class:`paxb.backends.Backend`
+    """
+
+    if isinstance(backend, Backend):
+        return backend
+
+    if backend == 'etree':
+        return etree
+    elif backend == 'lxml':
+        global lxml
+        if lxml is None:
+            try:
+                from lxml import etree as lxml_etree
+            except ImportError:
+                raise ImportError("lxml backend requires lxml package to be installed") from None
+            lxml = LxmlBackend(lxml_etree)
+        return lxml
+
+    raise ValueError("unknown backend '{}'".format(backend))
@@ -0,0 +1,762 @@
+"""
+The module implements the code generation engine. The same way `attrs` generates ``__init__`` methods
+straight-line python functions are generated for every compiled model plan. The deserialization function performs
+element lookups, attribute gets and the model constructor call, the serialization one creates elements and
+attributes in the model order with precomputed qualified names, both without generic mapper dispatch.
+
+Generated functions pass element paths (used in error messages only) as linked
+(parent path, element name, element index) tuples so that paths are formatted only when an error occurs.
+"""
+
+import collections
+import functools
+import itertools
+import linecache
+
+import attr
+
+from . import backends
+from . import decoder
+from . import encoder as default_encoder
+from . import exceptions as exc
+from . import plan
+
+
+def root_path(full_path):
+    """
+    Returns a linked path of the root element.
+
+    :param tuple full_path: full path to the root element
+    """
+
+    return None, full_path, None
+
+
+def flatten(path):
+    """
+    Converts a linked path to a full path tuple.
+
+    :param tuple path: linked path
+    :return: full path
+    :rtype: tuple
+    """
+
+    names = []
+    while path[0] is not None:
+        path, name, idx = path
+        names.append('{}[{}]'.format(name, idx))
+
+    return path[1] + tuple(reversed(names))
+
+
+def element_not_found(path):
+    return exc.DeserializationError("required element '/{}' not found".format('/'.join(flatten(path))))
+
+
+def attribute_not_found(path, name):
+    return exc.DeserializationError("required attribute '/{}' not found".format('/'.join(flatten(path) + (name,))))
+
+
+def never_none(field_plan):
+    """
+    Returns ``True`` if the deserialized field value is never ``None``.
+    """
+
+    if isinstance(field_plan, plan.ListPlan):
+        return True
+    if isinstance(field_plan, plan.WrapperPlan):
+        return field_plan.required and never_none(field_plan.wrapped)
+    if isinstance(field_plan, (plan.AttributePlan, plan.FieldPlan, plan.ModelPlan)):
+        return field_plan.required
+
+    return False
+
+
+class FunctionBuilder:
+    """
+    Python function source builder.
+
+    :param str name: function name
+    :param tuple args: function argument names
+    """
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+        self.lines = []
+        self.namespace = {}
+        self.counter = itertools.count()
+
+    def line(self, indent, code, *args, **kwargs):
+        self.lines.append('    ' * indent + code.format(*args, **kwargs))
+
+    def var(self, prefix):
+        """
+        Returns a new unique variable name.
+        """
+
+        return '{}{}'.format(prefix, next(self.counter))
+
+    def ref(self, value, prefix):
+        """
+        Makes `value` available for the function code and returns its name.
+        """
+
+        name = self.var(prefix)
+        self.namespace[name] = value
+
+        return name
+
+    def build(self, description):
+        """
+        Compiles the function. The source is registered in :py:mod:`linecache` so that tracebacks
+        and debuggers are able to show the generated code.
+
+        :param str description: function description used as a source file name
+        :return: compiled function
+        """
+
+        source = 'def {}({}):\n{}\n'.format(self.name, ', '.join(self.args), '\n'.join(self.lines))
+        filename = '<paxb generated {} {}>'.format(description, id(self))
+        linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+
+        exec(compile(source, filename, 'exec'), self.namespace)
+
+        return self.namespace[self.name]
+
+
+class LoaderBuilder(FunctionBuilder):
+    """
+    Deserialization function builder. The built function accepts a model element and its linked path and
+    returns the deserialized model object.
+    """
+
+    def __init__(self, model_plan):
+        super().__init__('load_{}'.format(model_plan.cls.__name__), ('element', 'path'))
+        self.model_plan = model_plan
+        self.namespace.update(
+            element_not_found=element_not_found,
+            attribute_not_found=attribute_not_found,
+            flatten=flatten,
+        )
+
+    def emit_obj(self, field_plan, element, path, target, indent, children=None):
+        """
+        Emits code looking up and deserializing a `field_plan` value from `element` children.
+        If `children` variable is passed the elements are looked up in the `element` children index
+        (see :py:func:`paxb.plan.index_elements`).
+        """
+
+        if isinstance(field_plan, plan.AttributePlan):
+            self.line(indent, '{} = {}.get({!r})', target, element, field_plan.tag)
+            if field_plan.required:
+                self.line(indent, 'if {} is None:', target)
+                self.line(indent + 1, 'raise attribute_not_found({}, {!r})', path, field_plan.name)
+
+        elif isinstance(field_plan, plan.ListPlan):
+            self.emit_list(field_plan, element, path, target, indent, children)
+
+        elif isinstance(field_plan, plan.ArrayPlan):
+            self.line(
+                indent, '{} = {}.obj({}, flatten({}), children={})',
+                target, self.ref(field_plan, 'plan'), element, path, children,
+            )
+
+        elif isinstance(field_plan, (plan.FieldPlan, plan.WrapperPlan, plan.ModelPlan)):
+            found, found_path = self.emit_find(field_plan, element, path, indent, children)
+            self.line(indent, 'if {} is None:', found)
+            if field_plan.required:
+                self.line(indent + 1, 'raise element_not_found({})', found_path)
+            else:
+                self.line(indent + 1, '{} = None', target)
+            self.line(indent, 'else:')
+            self.emit_load(field_plan, found, found_path, target, indent + 1)
+
+        else:
+            self.line(indent, '{} = {}.obj({}, flatten({}))', target, self.ref(field_plan, 'plan'), element, path)
+
+    def emit_find(self, element_plan, element, path, indent, children=None):
+        """
+        Emits code looking up an `element_plan` element in `element` children.
+
+        :return: found element variable and found element linked path expression
+        """
+
+        found = self.var('element')
+        found_path = '({}, {!r}, {})'.format(path, element_plan.path_name, element_plan.idx)
+
+        if children is not None:
+            self.line(indent, '{} = {}.get({!r})', found, children, element_plan.tag)
+            self.line(indent, 'if {} is not None:', found)
+            if element_plan.idx == 1:
+                self.line(indent + 1, '{0} = {0}[0]', found)
+            else:
+                self.line(indent + 1, '{0} = {0}[{1}] if len({0}) > {1} else None', found, element_plan.idx - 1)
+        elif element_plan.idx == 1:
+            self.line(indent, '{} = {}.find({!r})', found, element, element_plan.tag)
+        else:
+            # elements are selected by position, see paxb.plan.find
+            self.line(indent, '{} = {}.findall({!r})', found, element, element_plan.tag)
+            self.line(indent, '{0} = {0}[{1}] if len({0}) > {1} else None', found, element_plan.idx - 1)
+
+        return found, found_path
+
+    def emit_members(self, members, element, path, indent, children=None):
+        """
+        Emits code deserializing grouped fields (see :py:func:`paxb.plan.group_wrappers`). Every wrapper element
+        is looked up once for all the fields it wraps. The member keys are the value variables.
+        """
+
+        for member in members:
+            if isinstance(member, plan.WrapperGroup):
+                found, found_path = self.emit_find(member.wrapper, element, path, indent, children)
+                self.line(indent, 'if {} is None:', found)
+                if member.required:
+                    self.line(indent + 1, 'raise element_not_found({})', found_path)
+                else:
+                    self.line(indent + 1, '{} = None', ' = '.join(member.keys()))
+                self.line(indent, 'else:')
+                self.emit_members(member.wrapped, found, found_path, indent + 1)
+            else:
+                target, field_plan = member
+                self.emit_obj(field_plan, element, path, target, indent, children)
+
+    def emit_load(self, field_plan, element, path, target, indent):
+        """
+        Emits code deserializing a `field_plan` value from the already found `element`.
+        """
+
+        if isinstance(field_plan, plan.FieldPlan):
+            self.line(indent, '{} = {}.text', target, element)
+            if field_plan.required:
+                self.line(indent, 'if {} is None:', target)
+                self.line(indent + 1, 'raise element_not_found({})', path)
+
+        elif isinstance(field_plan, plan.WrapperPlan):
+            self.emit_obj(field_plan.wrapped, element, path, target, indent)
+
+        elif isinstance(field_plan, plan.ModelPlan):
+            self.line(indent, '{} = {}({}, {})', target, self.ref(loader(field_plan), 'load'), element, path)
+
+        else:
+            self.line(indent, '{} = {}.load({}, flatten({}))', target, self.ref(field_plan, 'plan'), element, path)
+
+    def emit_list(self, list_plan, element, path, target, indent, children=None):
+        item = list_plan.item
+        if children is not None:
+            elements = '{}.get({!r}, ())'.format(children, list_plan.tag)
+        else:
+            elements = '{}.findall({!r})'.format(element, list_plan.tag)
+
+        if isinstance(item, plan.FieldPlan):
+            self.line(indent, '{} = [item.text for item in {}]', target, elements)
+            if item.required:
+                self.line(indent, 'if None in {}:', target)
+                self.line(
+                    indent + 1, 'raise element_not_found(({}, {!r}, {}.index(None) + 1))', path, item.path_name, target,
+                )
+
+        elif isinstance(item, plan.ModelPlan):
+            self.line(
+                indent, '{} = [{}(item, ({}, {!r}, idx)) for idx, item in enumerate({}, 1)]',
+                target, self.ref(loader(item), 'load'), path, item.path_name, elements,
+            )
+
+        elif isinstance(item, plan.ElementPlan):
+            idx, found, value = self.var('idx'), self.var('element'), self.var('value')
+            self.line(indent, '{} = []', target)
+            self.line(indent, 'for {}, {} in enumerate({}, 1):', idx, found, elements)
+            self.emit_load(item, found, '({}, {!r}, {})'.format(path, item.path_name, idx), value, indent + 1)
+            self.line(indent + 1, '{}.append({})', target, value)
+
+        else:
+            self.line(indent, '{} = {}.obj({}, flatten({}))', target, self.ref(list_plan, 'plan'), element, path)
+
+    def emit_constructor(self, values):
+        """
+        Emits the model constructor call. Values that can be ``None`` are replaced by the field defaults.
+
+        :param values: list of (attribute name, initialization argument name, field plan, value variable) tuples
+        """
+
+        if self.model_plan.partial or self.model_plan.trusted:
+            self.emit_partial_constructor(values)
+            return
+
+        attributes = {attribute.name: attribute for attribute in attr.fields(self.model_plan.cls)}
+
+        args, optional_args = [], []
+        for name, init_name, field_plan, value in values:
+            default = attributes[name].default
+            if never_none(field_plan):
+                args.append('{}={}'.format(init_name, value))
+            elif default is attr.NOTHING or (isinstance(default, attr.Factory) and default.takes_self):
+                optional_args.append((init_name, value))
+            elif isinstance(default, attr.Factory):
+                args.append('{0}={1} if {1} is not None else {2}()'.format(
+                    init_name, value, self.ref(default.factory, 'factory'),
+                ))
+            else:
+                args.append('{0}={1} if {1} is not None else {2}'.format(
+                    init_name, value, self.ref(default, 'default'),
+                ))
+
+        if optional_args:
+            self.line(1, 'kwargs = {{}}')
+            for init_name, value in optional_args:
+                self.line(1, 'if {} is not None:', value)
+                self.line(2, 'kwargs[{!r}] = {}', init_name, value)
+            args.append('**kwargs')
+
+        self.line(1, 'return {}({})', self.ref(self.model_plan.cls, 'cls'), ', '.join(args))
+
+    def emit_decoders(self, values):
+        """
+        Emits typed field values decoding (see :py:func:`paxb.plan.field_decoders`).
+        """
+
+        values = {init_name: (field_plan, value) for _, init_name, field_plan, value in values}
+        for init_name, decode in self.model_plan.decoders:
+            field_plan, value = values[init_name]
+            if isinstance(decode, functools.partial) and decode.func is decoder.decode_list:
+                expression = 'list(map({}, {}))'.format(self.ref(decode.args[0], 'decode'), value)
+            else:
+                expression = '{}({})'.format(self.ref(decode, 'decode'), value)
+
+            if never_none(field_plan):
+                self.line(1, '{} = {}', value, expression)
+            else:
+                self.line(1, 'if {} is not None:', value)
+                self.line(2, '{} = {}', value, expression)
+
+    def emit_default(self, attribute):
+        """
+        Returns an expression calculating the `attribute` default value (see :py:func:`paxb.plan.default_value`).
+        """
+
+        default = attribute.default
+        if default is attr.NOTHING:
+            return 'None'
+        if attribute.converter is None and not isinstance(default, attr.Factory):
+            return self.ref(default, 'default')
+        if attribute.converter is None and not default.takes_self:
+            return '{}()'.format(self.ref(default.factory, 'factory'))
+
+        return 'default_value({}, obj)'.format(self.ref(attribute, 'attribute'))
+
+    def emit_partial_constructor(self, values):
+        """
+        Emits a partial model instance creation bypassing the model ``__init__`` method
+        (see :py:func:`paxb.plan.partial_instance`). ``__attrs_post_init__`` is called if the model defines it.
+        """
+
+        cls = self.ref(self.model_plan.cls, 'cls')
+        values = {name: (field_plan, value) for name, _, field_plan, value in values}
+        # attributes of the models not overriding __setattr__ (not frozen ones) are assigned directly
+        direct = self.model_plan.cls.__setattr__ is object.__setattr__
+
+        self.namespace.update(default_value=plan.default_value, set_attribute=object.__setattr__)
+        self.line(1, 'obj = {0}.__new__({0})', cls)
+        for attribute in attr.fields(self.model_plan.cls):
+            if attribute.name not in values:
+                expression = self.emit_default(attribute)
+            else:
+                field_plan, value = values[attribute.name]
+                expression = value
+                converter = attribute.converter
+                if converter is not None and not (self.model_plan.trusted and plan.passthrough(converter)):
+                    expression = '{}({})'.format(self.ref(converter, 'converter'), value)
+                if not never_none(field_plan):
+                    expression = '{} if {} is not None else {}'.format(expression, value, self.emit_default(attribute))
+
+            if direct:
+                self.line(1, 'obj.{} = {}', attribute.name, expression)
+            else:
+                self.line(1, 'set_attribute(obj, {!r}, {})', attribute.name, expression)
+
+        if hasattr(self.model_plan.cls, '__attrs_post_init__'):
+            self.line(1, 'obj.__attrs_post_init__()')
+
+        self.line(1, 'return obj')
+
+    def build(self):
+        values = [
+            (name, init_name, field_plan, self.var('value')) for name, init_name, field_plan in self.model_plan.fields
+        ]
+
+        # wrapper fields are grouped so that every wrapper element is looked up once
+        members = plan.group_wrappers((value, field_plan) for _, _, field_plan, value in values)
+
+        if self.model_plan.indexed:
+            # wide elements are indexed, narrow ones are scanned
+            self.namespace.update(index_elements=plan.index_elements)
+            self.line(1, 'if len(element) >= {}:', plan.INDEX_CHILDREN)
+            self.line(2, 'children = index_elements(element)')
+            self.emit_members(members, 'element', 'path', 2, children='children')
+            self.line(1, 'else:')
+            self.emit_members(members, 'element', 'path', 2)
+        else:
+            self.emit_members(members, 'element', 'path', 1)
+
+        self.emit_decoders(values)
+        self.emit_constructor(values)
+
+        return super().build('load {}'.format(self.model_plan.cls.__qualname__))
+
+
+def loader(model_plan):
+    """
+    Returns the model plan deserialization function. The function is generated on the first call.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`paxb.plan.ModelPlan`
+    :return: deserialization function
+    """
+
+    load = model_plan.compiled.get('load')
+    if load is None:
+        plan.check_lookups(model_plan)
+        load = model_plan.compiled['load'] = LoaderBuilder(model_plan).build()
+
+    return load
+
+
+def obj(model_plan, xml, full_path=()):
+    """
+    Deserializes a model object from the `xml` tree using the generated function.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`paxb.plan.ModelPlan`
+    :param xml: xml tree to deserialize the object from
+    :param tuple full_path: full path to the current element
+    :return: deserialized object
+    """
+
+    element = plan.find(xml, model_plan.tag, model_plan.idx)
+    if element is None:
+        if model_plan.required:
+            raise element_not_found((root_path(full_path), model_plan.path_name, model_plan.idx))
+        return None
+
+    return loader(model_plan)(element, (root_path(full_path), model_plan.path_name, model_plan.idx))
+
+
+def index_gap(name, idx):
+    return exc.SerializationError(
+        "serialization can't be completed because {name}[{cur}] is going to be serialized, "
+        "but {name}[{prev}] is not serialized.".format(name=name, cur=idx, prev=idx-1)
+    )
+
+
+def not_set(kind, name):
+    return exc.SerializationError("required {} '{}' is not set".format(kind, name))
+
+
+class Scope:
+    """
+    Serialization scope. Describes an element being built by the generated function: the element variable,
+    variables counting serialized children by tag and variables holding wrapper subelements.
+
+    :param builder: function builder
+    :param str element: element variable name
+    :param plans: plans serialized inside the element
+    """
+
+    def __init__(self, builder, element, plans):
+        self.element = element
+        self.counts = collections.OrderedDict()
+        self.wrappers = collections.OrderedDict()
+
+        wrapped_plans = collections.OrderedDict()
+        for field_plan in plans:
+            # list item wrappers are created by the list loop so only the list item tag is counted
+            if isinstance(field_plan, (plan.ListPlan, plan.ArrayPlan)):
+                field_plan = field_plan.item
+            elif isinstance(field_plan, plan.WrapperPlan):
+                wrapped_plans.setdefault((field_plan.xml_tag, field_plan.idx), []).append(field_plan.wrapped)
+
+            if isinstance(field_plan, plan.ElementPlan) and field_plan.xml_tag not in self.counts:
+                self.counts[field_plan.xml_tag] = builder.var('count')
+
+        for key, inner_plans in wrapped_plans.items():
+            wrapper = builder.var('wrapper')
+            self.wrappers[key] = (wrapper, Scope(builder, wrapper + '_current', inner_plans))
+
+    def init(self, builder, indent):
+        """
+        Emits scope variables initialization.
+        """
+
+        for count in self.counts.values():
+            builder.line(indent, '{} = 0', count)
+        for wrapper, _ in self.wrappers.values():
+            builder.line(indent, '{} = None', wrapper)
+
+    @classmethod
+    def supported(cls, plans):
+        """
+        Checks that the generated code is able to serialize `plans` into a single element. Wrapper elements
+        are located statically so a wrapper tag must not be shared with other elements or list items.
+        Plans of unknown types are not supported.
+        """
+
+        tags = collections.defaultdict(set)
+        wrapped_plans = collections.defaultdict(list)
+        for field_plan in plans:
+            kind = type(field_plan)
+            if isinstance(field_plan, plan.ListPlan):
+                field_plan = field_plan.item
+                kind = (plan.ListPlan, type(field_plan))
+                if isinstance(field_plan, plan.WrapperPlan) and not cls.supported([field_plan.wrapped]):
+                    return False
+            elif isinstance(field_plan, plan.ArrayPlan):
+                field_plan = field_plan.item
+                kind = (plan.ArrayPlan, type(field_plan))
+
+            if not isinstance(field_plan, (plan.AttributePlan, plan.FieldPlan, plan.WrapperPlan, plan.ModelPlan)):
+                return False
+            if isinstance(field_plan, plan.ElementPlan):
+                tags[field_plan.xml_tag].add(kind)
+            if kind is plan.WrapperPlan:
+                wrapped_plans[(field_plan.xml_tag, field_plan.idx)].append(field_plan.wrapped)
+
+        for kinds in tags.values():
+            if len(kinds) > 1 and (plan.WrapperPlan in kinds or (plan.ListPlan, plan.WrapperPlan) in kinds):
+                return False
+
+        return all(cls.supported(inner_plans) for inner_plans in wrapped_plans.values())
+
+
+class DumperBuilder(FunctionBuilder):
+    """
+    Serialization function builder. The built function accepts a model object and an encoder and returns
+    the model element or ``None`` if no model field is serialized. The returned element is not added
+    to any tree.
+
+    :param model_plan: model plan
+    :param bool inline: inline :py:class:`str` values encoding and call the encoders of the annotated field types
+                        directly. Can be used with the default encoder only
+    :param backend: xml tree backend the elements are created by
+    """
+
+    def __init__(self, model_plan, inline, backend):
+        super().__init__('dump_{}'.format(model_plan.cls.__name__), ('obj', 'encoder'))
+        self.model_plan = model_plan
+        self.inline = inline
+        self.backend = backend
+        self.namespace.update(
+            Element=backend.Element,
+            SubElement=backend.SubElement,
+            index_gap=index_gap,
+            not_set=not_set,
+        )
+
+    def encode(self, value, value_type=None):
+        """
+        Returns an expression encoding `value`. If the default encoder is used the encoder of the value annotated
+        type is resolved in advance and called directly for the values of that exact type.
+        """
+
+        if not self.inline:
+            return 'encode({})'.format(value)
+
+        if not isinstance(value_type, type) or value_type is object:
+            value_type = str
+
+        func = default_encoder.dispatch(value_type)
+        if value_type is str and func is default_encoder.encode_str:
+            return '{0} if {0}.__class__ is str else encode({0})'.format(value)
+        elif func is default_encoder.encode_str:
+            return '{0} if {0}.__class__ is {1} else encode({0})'.format(value, self.ref(value_type, 'type'))
+        else:
+            return '{1}({0}) if {0}.__class__ is {2} else encode({0})'.format(
+                value, self.ref(func, 'encode'), self.ref(value_type, 'type'),
+            )
+
+    def emit_check(self, element_plan, scope, idx, indent):
+        """
+        Emits the element index continuity check.
+        """
+
+        if idx != 1:
+            self.line(indent, 'if {} > {} + 1:', idx, scope.counts[element_plan.xml_tag])
+            self.line(indent + 1, 'raise index_gap({!r}, {})', element_plan.name, idx)
+
+    def emit_none(self, field_plan, value, indent):
+        """
+        Emits the ``None`` value check. Returns the indentation of the code serializing a not ``None`` value.
+        """
+
+        if field_plan.required:
+            kind = 'attribute' if isinstance(field_plan, plan.AttributePlan) else 'element'
+            self.line(indent, 'if {} is None:', value)
+            self.line(indent + 1, 'raise not_set({!r}, {!r})', kind, field_plan.name)
+            self.line(indent, 'else:')
+        else:
+            self.line(indent, 'if {} is not None:', value)
+
+        return indent + 1
+
+    def emit_xml(self, field_plan, value, scope, flag, indent, idx=None, value_type=None):
+        """
+        Emits code serializing `value` into the `scope` element. `flag` variable is set
+        to ``True`` if anything is serialized. `value_type` is the value type annotation if it is known.
+        """
+
+        if isinstance(field_plan, plan.AttributePlan):
+            indent = self.emit_none(field_plan, value, indent)
+            self.line(indent, '{}.attrib[{!r}] = {}', scope.element, field_plan.tag, self.encode(value, value_type))
+            self.line(indent, '{} = True', flag)
+
+        elif isinstance(field_plan, plan.FieldPlan):
+            self.emit_check(field_plan, scope, idx or field_plan.idx, indent)
+            indent = self.emit_none(field_plan, value, indent)
+            self.line(
+                indent, 'SubElement({}, {!r}).text = {}',
+                scope.element, field_plan.xml_tag, self.encode(value, value_type),
+            )
+            self.line(indent, '{} += 1', scope.counts[field_plan.xml_tag])
+            self.line(indent, '{} = True', flag)
+
+        elif isinstance(field_plan, plan.ModelPlan):
+            element = self.var('element')
+            dump = self.ref(dumper(field_plan, self.inline, self.backend), 'dump')
+            self.emit_check(field_plan, scope, idx or field_plan.idx, indent)
+            indent = self.emit_none(field_plan, value, indent)
+            self.line(indent, '{} = {}({}, encoder)', element, dump, value)
+            self.line(indent, 'if {} is not None:', element)
+            self.line(indent + 1, '{}.append({})', scope.element, element)
+            self.line(indent + 1, '{} += 1', scope.counts[field_plan.xml_tag])
+            self.line(indent + 1, '{} = True', flag)
+
+        elif isinstance(field_plan, plan.WrapperPlan) and idx is None:
+            wrapper, inner_scope = scope.wrappers[(field_plan.xml_tag, field_plan.idx)]
+            inner_flag = self.var('serialized')
+
+            self.line(indent, 'if {} is None:', wrapper)
+            self.emit_check(field_plan, scope, field_plan.idx, indent + 1)
+            self.line(indent + 1, '{} = Element({!r})', inner_scope.element, field_plan.xml_tag)
+            inner_scope.init(self, indent + 1)
+            self.line(indent, 'else:')
+            self.line(indent + 1, '{} = {}', inner_scope.element, wrapper)
+
+            self.line(indent, '{} = False', inner_flag)
+            self.emit_xml(field_plan.wrapped, value, inner_scope, inner_flag, indent, value_type=value_type)
+            self.line(indent, 'if {}:', inner_flag)
+            self.line(indent + 1, 'if {} is None:', wrapper)
+            self.line(indent + 2, '{}.append({})', scope.element, inner_scope.element)
+            self.line(indent + 2, '{} += 1', scope.counts[field_plan.xml_tag])
+            self.line(indent + 2, '{} = {}', wrapper, inner_scope.element)
+            self.line(indent + 1, '{} = True', flag)
+
+        elif isinstance(field_plan, plan.WrapperPlan):
+            # list item wrapper: the wrapper tag is not shared so every item creates a new element
+            inner_scope = Scope(self, self.var('wrapper'), [field_plan.wrapped])
+            inner_flag = self.var('serialized')
+
+            self.emit_check(field_plan, scope, idx, indent)
+            self.line(indent, '{} = Element({!r})', inner_scope.element, field_plan.xml_tag)
+            inner_scope.init(self, indent)
+            self.line(indent, '{} = False', inner_flag)
+            self.emit_xml(field_plan.wrapped, value, inner_scope, inner_flag, indent, value_type=value_type)
+            self.line(indent, 'if {}:', inner_flag)
+            self.line(indent + 1, '{}.append({})', scope.element, inner_scope.element)
+            self.line(indent + 1, '{} += 1', scope.counts[field_plan.xml_tag])
+
+        elif isinstance(field_plan, plan.ArrayPlan):
+            # arrays are formatted in bulk by the plan
+            serialized = self.var('serialized')
+            self.line(
+                indent, '{} = {}.xml({}, {}, encoder)', serialized, self.ref(field_plan, 'plan'), value, scope.element,
+            )
+            self.line(indent, 'if {} is not None:', serialized)
+            if isinstance(field_plan.item, plan.FieldPlan):
+                count = scope.counts[field_plan.item.xml_tag]
+                if field_plan.packed:
+                    self.line(indent + 1, '{} += 1', count)
+                else:
+                    self.line(indent + 1, '{} += len({})', count, serialized)
+            self.line(indent + 1, '{} = True', flag)
+
+        elif isinstance(field_plan, plan.ListPlan):
+            idx, item = self.var('idx'), self.var('item')
+            self.line(indent, 'if {}:', value)
+            self.line(indent + 1, 'for {}, {} in enumerate({}, 1):', idx, item, value)
+            self.emit_xml(
+                field_plan.item, item, scope, flag, indent + 2, idx=idx, value_type=plan.item_type(value_type),
+            )
+            self.line(indent + 1, '{} = True', flag)
+
+    def build(self):
+        scope = Scope(self, 'element', [field_plan for _, _, field_plan in self.model_plan.xml_fields])
+
+        self.line(1, 'encode = encoder.encode')
+        self.line(1, 'element = Element({!r})', self.model_plan.xml_tag)
+        self.line(1, 'serialized = False')
+        scope.init(self, 1)
+
+        types = plan.field_types(self.model_plan.cls)
+        for name, _, field_plan in self.model_plan.xml_fields:
+            value = self.var('value')
+            self.line(1, '{} = obj.{}', value, name)
+            self.emit_xml(field_plan, value, scope, 'serialized', 1, value_type=types[name])
+
+        self.line(1, 'return element if serialized else None')
+
+        return super().build('dump {}'.format(self.model_plan.cls.__qualname__))
+
+
+def dumper(model_plan, inline=False, backend=backends.etree):
+    """
+    Returns the model plan serialization function. The function is generated on the first call.
+    If the model can't be serialized by the generated code the compiled plan is used.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`paxb.plan.ModelPlan`
+    :param bool inline: inline :py:class:`str` values encoding and hoist the default encoder resolution
+    :param backend: xml tree backend the elements are created by
+    :return: serialization function
+    """
+
+    # functions with hoisted encoders are regenerated if an encoder is registered
+    key = ('dump', inline, backend.name, default_encoder.version if inline else None)
+
+    dump = model_plan.compiled.get(key)
+    if dump is None:
+        if Scope.supported([field_plan for _, _, field_plan in model_plan.xml_fields]):
+            dump = DumperBuilder(model_plan, inline, backend).build()
+        else:
+            def dump(obj, encoder):
+                return model_plan.xml(obj, backend.container(), encoder, idx=1, children={})
+
+        model_plan.compiled[key] = dump
+
+    return dump
+
+
+def xml(model_plan, obj, root, encoder, backend=backends.etree):
+    """
+    Serializes a model object into the `root` element using the generated function.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`paxb.plan.ModelPlan`
+    :param obj: object to be serialized
+    :param root: root element the object will be added inside
+    :param encoder: value encoder
+    :param backend: xml tree backend the elements are created by
+    :return: added xml tree node
+    """
+
+    if model_plan.idx > len(root.findall(model_plan.xml_tag)) + 1:
+        raise index_gap(model_plan.name, model_plan.idx)
+
+    if obj is None:
+        if model_plan.required:
+            raise not_set('element', model_plan.name)
+        return None
+
+    element = dumper(model_plan, encoder is default_encoder, backend)(obj, encoder)
+    if element is not None:
+        root.append(element)
+
+    return element
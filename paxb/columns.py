@@ -0,0 +1,167 @@
+"""
+The module implements columnar extraction of repeated records. Record fields are looked up by a function
+generated the same way the :py:mod:`paxb.codegen` loaders are, but the decoded values are appended
+to the column arrays directly instead of being passed to the model constructor.
+"""
+
+import array
+
+import attr
+
+from . import codegen
+from . import decoder
+from . import exceptions as exc
+from . import plan
+
+# array.array type codes of the numeric column types
+TYPECODES = {
+    int: 'q',
+    float: 'd',
+}
+
+KINDS = ('array', 'numpy')
+
+
+def value_field(field_plan):
+    """
+    Checks that a field is mapped to a single value (an attribute or an element text, possibly wrapped).
+    """
+
+    while isinstance(field_plan, plan.WrapperPlan):
+        field_plan = field_plan.wrapped
+
+    return isinstance(field_plan, (plan.AttributePlan, plan.FieldPlan))
+
+
+def value_missing(path, name):
+    return exc.DeserializationError(
+        "field '{}' of '/{}' is not set but its column can't hold missing values".format(
+            name, '/'.join(codegen.flatten(path)),
+        )
+    )
+
+
+class Column:
+    """
+    Column description.
+
+    :param attribute: `attrs` attribute the column is extracted from
+    :param value_type: resolved attribute type (see :py:func:`paxb.plan.field_types`).
+                       Optional types are unwrapped
+    :param str typecode: :py:mod:`array` type code of a numeric column or ``None`` if values are kept in a list
+    :param missing: the value missing values are replaced by. :py:data:`attr.NOTHING` if missing values
+                    are not allowed
+    """
+
+    __slots__ = ('attribute', 'value_type', 'typecode', 'missing')
+
+    def __init__(self, attribute, value_type):
+        self.attribute = attribute
+        self.value_type = decoder.optional_type(value_type)
+        self.typecode = TYPECODES.get(self.value_type) if attribute.converter is None else None
+
+        default = attribute.default
+        if default is attr.NOTHING or isinstance(default, attr.Factory):
+            default = None
+        elif attribute.converter is not None:
+            default = attribute.converter(default)
+
+        if default is not None or self.typecode is None:
+            self.missing = default
+        elif self.typecode == 'd':
+            self.missing = float('nan')
+        else:
+            self.missing = attr.NOTHING
+
+    def create(self):
+        return array.array(self.typecode) if self.typecode is not None else []
+
+
+class ColumnsBuilder(codegen.LoaderBuilder):
+    """
+    Record columns extraction function builder. The built function accepts a record element, its linked path
+    and the ``append`` methods of the columns.
+
+    :param model_plan: partial model plan of the extracted fields (see :py:func:`paxb.plan.project`)
+    :param columns: extracted columns in the model plan fields order
+    """
+
+    def __init__(self, model_plan, columns):
+        super().__init__(model_plan)
+        self.columns = columns
+        self.appends = tuple(self.var('append') for _ in columns)
+        self.args = ('element', 'path') + self.appends
+        self.namespace.update(value_missing=value_missing)
+
+    def emit_constructor(self, values):
+        for (name, _, field_plan, value), column, append in zip(values, self.columns, self.appends):
+            converter = column.attribute.converter
+            if converter is not None:
+                self.line(1, 'if {} is not None:', value)
+                self.line(2, '{0} = {1}({0})', value, self.ref(converter, 'converter'))
+
+            if codegen.never_none(field_plan):
+                self.line(1, '{}({})', append, value)
+            elif column.missing is attr.NOTHING:
+                self.line(1, 'if {} is None:', value)
+                self.line(2, 'raise value_missing(path, {!r})', name)
+                self.line(1, '{}({})', append, value)
+            else:
+                missing = self.ref(column.missing, 'missing')
+                self.line(1, '{0}({1} if {1} is not None else {2})', append, value, missing)
+
+
+def extractor(model_plan, fields):
+    """
+    Returns the record columns extraction function and the column descriptions.
+    The function is generated on the first call.
+
+    :param model_plan: record model plan
+    :param fields: extracted field names. If ``None`` all the value fields are extracted
+    :return: (extraction function, columns) pair
+    """
+
+    if fields is None:
+        fields = [name for name, _, field_plan in model_plan.fields if value_field(field_plan)]
+
+    key = ('columns', tuple(fields))
+
+    compiled = model_plan.compiled.get(key)
+    if compiled is None:
+        projected = plan.project(model_plan, fields)
+        plan.check_lookups(projected)
+        for name, _, field_plan in projected.fields:
+            if not value_field(field_plan):
+                raise ValueError("field '{}' can't be extracted into a column".format(name))
+
+        attributes = {attribute.name: attribute for attribute in attr.fields(model_plan.cls)}
+        types = plan.field_types(model_plan.cls)
+        columns = tuple(Column(attributes[name], types[name]) for name, _, _ in projected.fields)
+        compiled = model_plan.compiled[key] = (ColumnsBuilder(projected, columns).build(), columns)
+
+    return compiled
+
+
+def finalize(column, values, kind):
+    """
+    Converts extracted column values to the resulting column.
+
+    :param column: column description
+    :param values: extracted values
+    :param str kind: ``'array'`` or ``'numpy'``
+    """
+
+    if kind == 'array':
+        return values
+
+    numpy = plan.import_numpy()
+    if column.typecode is not None:
+        # numeric arrays are shared with numpy without copying
+        return numpy.frombuffer(values, dtype=values.typecode) if values else numpy.array([], dtype=values.typecode)
+    if column.value_type is bool and None not in values:
+        return numpy.array(values, dtype=bool)
+
+    result = numpy.empty(len(values), dtype=object)
+    result[:] = values
+
+    return result
@@ -0,0 +1,198 @@
+"""
+Typed value decoders. Field values are deserialized as strings. If a field type is annotated (or passed as
+the ``type`` argument) and the field has no converter the value is decoded by the decoder of that type.
+"""
+
+import base64
+import datetime as dt
+import decimal
+import enum
+import functools
+import re
+import types
+import typing as tp
+
+
+BOOLEANS = {'true': True, 'True': True, '1': True, 'false': False, 'False': False, '0': False}
+
+
+def decode_bool(value):
+    try:
+        return BOOLEANS[value.strip()]
+    except KeyError:
+        raise ValueError("invalid boolean value '{}'".format(value)) from None
+
+
+def decode_bytes(value):
+    return base64.b64decode(value)
+
+
+ISO_DATETIME = re.compile(
+    r'^(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d)(?::(\d\d)(?:\.(\d{1,6})\d*)?)?(Z|[+-]\d\d:?\d\d)?$'
+)
+
+
+def parse_datetime(value):
+    """
+    Parses an ISO 8601 formatted datetime. Used on Python versions not supporting
+    :py:meth:`datetime.datetime.fromisoformat`.
+    """
+
+    match = ISO_DATETIME.match(value)
+    if match is None:
+        raise ValueError("invalid datetime value '{}'".format(value))
+
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+
+    tzinfo = None
+    if offset == 'Z':
+        tzinfo = dt.timezone.utc
+    elif offset:
+        sign = -1 if offset[0] == '-' else 1
+        offset = offset[1:].replace(':', '')
+        tzinfo = dt.timezone(sign * dt.timedelta(hours=int(offset[:2]), minutes=int(offset[2:])))
+
+    return dt.datetime(
+        int(year), int(month), int(day), int(hour), int(minute), int(second or 0),
+        int((fraction or '0').ljust(6, '0')), tzinfo,
+    )
+
+
+# dates and datetimes are immutable so the parsed values are cached: documents often contain
+# a lot of repeated values (like dates of the records of the same day)
+@functools.lru_cache(maxsize=1024)
+def decode_datetime(value):
+    try:
+        return dt.datetime.fromisoformat(value)
+    except (AttributeError, ValueError):
+        return parse_datetime(value)
+
+
+@functools.lru_cache(maxsize=1024)
+def decode_date(value):
+    try:
+        try:
+            return dt.date.fromisoformat(value)
+        except AttributeError:
+            return dt.datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        # full datetime values are truncated to the date
+        return decode_datetime(value).date()
+
+
+def decode_list(decode, values):
+    """
+    Decodes list items converting the whole list at once.
+    """
+
+    return list(map(decode, values))
+
+
+def decode_optional_items(decode, values):
+    """
+    Decodes list items skipping missing (``None``) ones.
+    """
+
+    return [None if value is None else decode(value) for value in values]
+
+
+def enum_decoder(cls):
+    """
+    Returns an enumeration decoder. A member is looked up by its value string, its name or its string
+    representation (the way the default encoder encodes members).
+    """
+
+    members = {}
+    for member in cls:
+        members.setdefault(str(member), member)
+        members.setdefault(member.name, member)
+        members.setdefault(str(member.value), member)
+
+    def decode_enum(value):
+        try:
+            return members[value]
+        except KeyError:
+            raise ValueError("'{}' is not a valid {}".format(value, cls.__name__)) from None
+
+    return decode_enum
+
+
+registry = {
+    int: int,
+    float: float,
+    bool: decode_bool,
+    decimal.Decimal: decimal.Decimal,
+    dt.date: decode_date,
+    dt.datetime: decode_datetime,
+    bytes: decode_bytes,
+}
+
+# mapping from a value type to its decoder, None if the type has no decoder
+cache = {}
+
+
+def register(cls, func=None):
+    """
+    Registers a value decoder for `cls` type. Can be used as a decorator:
+
+    .. code-block:: python
+
+        @paxb.decoder.register(uuid.UUID)
+        def decode_uuid(value):
+            return uuid.UUID(value)
+
+    Decoders are resolved when a model is compiled so the decoders must be registered before the models
+    using the type are deserialized for the first time.
+
+    :param type cls: value type
+    :param func: decoder accepting a string and returning a `cls` instance
+    :return: the registered decoder
+    """
+
+    if func is None:
+        return lambda func: register(cls, func)
+
+    registry[cls] = func
+    cache.clear()
+
+    return func
+
+
+def optional_type(cls):
+    """
+    Returns the value type of an optional type annotation (``typing.Optional[int]`` or ``int | None``).
+    Other annotations are returned as is.
+    """
+
+    if getattr(cls, '__origin__', None) is tp.Union or isinstance(cls, getattr(types, 'UnionType', ())):
+        args = [arg for arg in cls.__args__ if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+
+    return cls
+
+
+def dispatch(cls):
+    """
+    Returns the decoder of `cls` type values. Optional types are decoded by the decoder of the value type.
+
+    :param cls: value type
+    :return: decoder or ``None`` if the type has no decoder
+    """
+
+    try:
+        return cache[cls]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable annotations
+        return None
+
+    value_type = optional_type(cls)
+    func = registry.get(value_type)
+    if func is None and isinstance(value_type, type) and issubclass(value_type, enum.Enum):
+        func = enum_decoder(value_type)
+
+    cache[cls] = func
+
+    return func
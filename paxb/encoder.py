@@ -1,25 +1,91 @@
 import base64
-import typing as tp
 import datetime as dt
+import functools
+
+
+def encode_str(value):
+    return value
+
+
+def encode_bytes(value):
+    return base64.b64encode(value)
+
+
+def encode_date(value):
+    return value.isoformat()
+
+
+# type based encoders registry, values of unregistered types are encoded by str
+registry = functools.singledispatch(str)
+registry.register(str, encode_str)
+registry.register(bytes, encode_bytes)
+registry.register(bytearray, encode_bytes)
+registry.register(memoryview, encode_bytes)
+# datetime.datetime is a datetime.date subclass
+registry.register(dt.date, encode_date)
+
+# mapping from a value type to its encoder resolved from the registry
+cache = {}
+# registry version, incremented on every registration so that the code the encoders are hoisted into is regenerated
+version = 0
+
+
+def register(cls, func=None):
+    """
+    Registers a value encoder for `cls` type and its subclasses. An encoder registered for the closest
+    type in the value type MRO is used. Can be used as a decorator:
+
+    .. code-block:: python
+
+        @paxb.encoder.register(decimal.Decimal)
+        def encode_decimal(value):
+            return '{:f}'.format(value)
+
+    :param type cls: value type
+    :param func: encoder accepting a value and returning its :py:class:`str` representation
+    :return: the registered encoder
+    """
+
+    global version
+
+    if func is None:
+        return lambda func: register(cls, func)
+
+    registry.register(cls, func)
+    cache.clear()
+    version += 1
+
+    return func
+
+
+def dispatch(cls):
+    """
+    Returns the encoder of `cls` type values.
+
+    :param type cls: value type
+    :return: encoder
+    """
+
+    func = cache.get(cls)
+    if func is None:
+        func = cache[cls] = registry.dispatch(cls)
+
+    return func
 
 
 def encode(value):
     """
     Default ``paxb`` value encoder. Encodes attributes or element text data during serialization.
-    Supports :py:class:`str`, :py:class:`bytes`, :py:class:`datetime.date` and :py:class:`datetime.datetime` types.
+    Supports :py:class:`str`, :py:class:`bytes`, :py:class:`datetime.date` and :py:class:`datetime.datetime` types
+    by default, encoders for other types can be added by :py:func:`paxb.encoder.register`.
 
     :param value: value to be encoded
     :return: encoded value string
     :rtype: str
     """
 
-    if isinstance(value, tp.Text):
-        return value
-    if isinstance(value, tp.ByteString):
-        return base64.b64encode(value)
-    if isinstance(value, dt.datetime):
-        return value.isoformat()
-    if isinstance(value, dt.date):
-        return value.isoformat()
+    func = cache.get(value.__class__)
+    if func is None:
+        func = dispatch(value.__class__)
 
-    return str(value)
+    return func(value)
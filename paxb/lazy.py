@@ -0,0 +1,186 @@
+"""
+The module implements lazy model instances. A lazy instance keeps a reference to its source element and
+deserializes a field only the first time the field is accessed. Deserialized values are cached in the instance.
+
+Lazy instances are instances of a model subclass generated for every model class. The subclass implements
+:py:meth:`object.__getattr__` which is called only for attributes missing in the instance so the fields
+already deserialized are accessed without any overhead.
+
+Validators and ``__attrs_post_init__`` are not run when a field is accessed: the field is returned
+as deserialized. Both are run by :py:func:`materialize`.
+"""
+
+import attr
+
+from . import plan
+
+SOURCE = '__paxb_source__'
+
+
+def load(field_plan, xml, full_path):
+    """
+    Deserializes a field value. Nested models are deserialized as lazy instances.
+
+    :param field_plan: field plan
+    :param xml: element the field is looked up in
+    :param tuple full_path: full path to the element
+    :return: deserialized value
+    """
+
+    if isinstance(field_plan, (plan.ModelPlan, plan.WrapperPlan)):
+        element, path = field_plan.find(xml, full_path, field_plan.idx)
+        if element is None:
+            if field_plan.required:
+                raise field_plan.not_found(path)
+            return None
+
+        if isinstance(field_plan, plan.ModelPlan):
+            return instance(field_plan, element, path)
+        else:
+            return load(field_plan.wrapped, element, path)
+
+    if isinstance(field_plan, plan.ListPlan) and isinstance(field_plan.item, plan.ModelPlan):
+        item = field_plan.item
+        return [
+            instance(item, element, full_path + ('{}[{}]'.format(item.path_name, idx),))
+            for idx, element in enumerate(xml.findall(field_plan.tag), start=1)
+        ]
+
+    return field_plan.obj(xml, full_path)
+
+
+def lazy_class(cls):
+    """
+    Returns the lazy subclass of a model class. The subclass is created on the first call.
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :return: lazy model class
+    """
+
+    lazy_cls = cls.__dict__.get('__paxb_lazy__')
+    if lazy_cls is not None:
+        return lazy_cls
+
+    attributes = {attribute.name: attribute for attribute in attr.fields(cls)}
+    # attrs < 19.2 attributes have no eq flag
+    compared = tuple(
+        name for name, attribute in attributes.items()
+        if (attribute.eq if hasattr(attribute, 'eq') else attribute.cmp)
+    )
+
+    def __getattr__(self, name):
+        attribute = attributes.get(name)
+        source = self.__dict__.get(SOURCE)
+        if attribute is None or source is None:
+            raise AttributeError("'{}' object has no attribute '{}'".format(cls.__name__, name))
+
+        model_plan, element, path = source
+
+        field_plans = model_plan.compiled.get('lazy')
+        if field_plans is None:
+            decoders = dict(model_plan.decoders)
+            field_plans = model_plan.compiled['lazy'] = {
+                field_name: (field_plan, decoders.get(init_name))
+                for field_name, init_name, field_plan in model_plan.fields
+            }
+
+        field_plan, decode = field_plans.get(name, (None, None))
+        value = load(field_plan, element, path) if field_plan is not None else None
+
+        if value is None:
+            value = plan.default_value(attribute, self)
+        elif attribute.converter is not None:
+            value = attribute.converter(value)
+        elif decode is not None:
+            value = decode(value)
+
+        # frozen models don't allow attributes assignment
+        object.__setattr__(self, name, value)
+
+        return value
+
+    def __eq__(self, other):
+        if not isinstance(other, cls):
+            return NotImplemented
+
+        return all(getattr(self, name) == getattr(other, name) for name in compared)
+
+    lazy_cls = type(cls.__name__, (cls,), {
+        '__getattr__': __getattr__,
+        '__eq__': __eq__,
+        '__hash__': cls.__hash__,
+        '__qualname__': cls.__qualname__,
+        '__module__': cls.__module__,
+    })
+    setattr(cls, '__paxb_lazy__', lazy_cls)
+
+    return lazy_cls
+
+
+def instance(model_plan, element, full_path):
+    """
+    Creates a lazy model instance.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`paxb.plan.ModelPlan`
+    :param element: model element
+    :param tuple full_path: full path to the model element
+    :return: lazy model instance
+    """
+
+    obj = object.__new__(lazy_class(model_plan.cls))
+    object.__setattr__(obj, SOURCE, (model_plan, element, full_path))
+
+    return obj
+
+
+def slotted(cls):
+    """
+    Checks that the model instances have no ``__dict__`` (the model is declared with ``slots=True``).
+    """
+
+    return cls.__dictoffset__ == 0
+
+
+def materialize(obj):
+    """
+    Deserializes all the fields of a lazy instance and its nested lazy instances, runs the model validators
+    and ``__attrs_post_init__`` and turns the instance into a regular model instance releasing the source element.
+
+    The layout of slotted model instances differs from the lazy subclass one so the instance class can't
+    be changed. A new regular instance is created for them instead.
+
+    :param obj: lazy model instance
+    :return: regular model instance
+    """
+
+    source = getattr(obj, '__dict__', {}).get(SOURCE)
+    if source is None:
+        return obj
+
+    cls = source[0].cls
+    values = []
+    for attribute in attr.fields(cls):
+        value = getattr(obj, attribute.name)
+        if isinstance(value, list):
+            value[:] = [materialize(item) for item in value]
+        else:
+            value = materialize(value)
+        values.append((attribute.name, value))
+
+    if slotted(cls):
+        obj = cls.__new__(cls)
+    else:
+        object.__delattr__(obj, SOURCE)
+        object.__setattr__(obj, '__class__', cls)
+
+    # frozen models don't allow attributes assignment
+    for name, value in values:
+        object.__setattr__(obj, name, value)
+
+    attr.validate(obj)
+
+    if hasattr(cls, '__attrs_post_init__'):
+        obj.__attrs_post_init__()
+
+    return obj
@@ -6,12 +6,11 @@ for mapping xml elements to python object fields and vise versa.
 import abc
 import collections
 import operator as op
-import xml.etree.ElementTree as et
 
 import attr
 
-from . import exceptions as exc
 from . import encoder as default_encoder
+from . import plan
 
 
 def get_attrs(cls):
@@ -45,6 +44,53 @@ def qname(ns, name):
     return '{{{}}}{}'.format(ns, name) if ns else name
 
 
+def resolve_tag(ns, name, ns_map):
+    """
+    Resolves an element name to a qualified name the same way ElementPath does: a prefixed name is looked up
+    in `ns_map`, an unprefixed one is qualified by the default (empty prefix) namespace if it is defined.
+    A prefix included in the name (like in wrapper paths) takes precedence over the `ns` one.
+
+    A name with an unknown prefix is left prefixed. Serialization doesn't use the resolved names
+    so such a name is reported only when an element is looked up by it (see :py:func:`paxb.plan.check_lookups`).
+
+    :param str ns: namespace prefix
+    :param str name: element local name
+    :param dict ns_map: mapping from namespace prefix to full name
+    :return: qualified name
+    """
+
+    if ':' in name:
+        ns, name = name.split(':', 1)
+
+    if ns:
+        uri = ns_map.get(ns)
+        return qname(uri, name) if uri is not None else tag_name(ns, name)
+    else:
+        return qname(ns_map.get(''), name)
+
+
+def resolve_path(path, ns_map):
+    """
+    Resolves a slash-separated path of prefixed element names the elements are looked up by to qualified names
+    (see :py:func:`resolve_tag`).
+
+    :param str path: slash-separated element names
+    :param dict ns_map: mapping from namespace prefix to full name
+    :return: qualified names
+    :rtype: tuple
+    :raises SyntaxError: if a prefix is not found in `ns_map`
+    """
+
+    tags = []
+    for name in path.split('/'):
+        ns, _, name = name.rpartition(':')
+        tag = resolve_tag(ns, name, ns_map or {})
+        plan.check_tag(tag)
+        tags.append(tag)
+
+    return tuple(tags)
+
+
 def drop_nones(d):
     """
     Drop none values from the dict
@@ -99,6 +145,53 @@ def reorder(fields, order, key):
     return ordered.values()
 
 
+def compile_model(cls, name, ns, ns_map, idx, required):
+    """
+    Compiles a model plan. Compiled plans are cached on the model class so that every model is
+    compiled only once for each context it is used in.
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :param str name: model element name
+    :param str ns: model element namespace
+    :param dict ns_map: mapping from namespace prefix to full name
+    :param int idx: model element index in the xml tree
+    :param bool required: is the model element required
+    :return: model plan
+    :rtype: :py:class:`paxb.plan.ModelPlan`
+    """
+
+    plans = cls.__dict__.get('__paxb_plans__')
+    if plans is None:
+        plans = {}
+        setattr(cls, '__paxb_plans__', plans)
+
+    key = (name, ns, tuple(sorted(ns_map.items())), idx, required)
+    model_plan = plans.get(key)
+    if model_plan is None:
+        fields = collections.OrderedDict()
+        for attr_field in attr.fields(cls):
+            mapper = attr_field.metadata.get('paxb.mapper')
+            if mapper:
+                # Class initialization arguments that start with underscore (_) are altered by `attrs`.
+                # See https://www.attrs.org/en/stable/init.html#private-attributes.
+                init_name = attr_field.name.lstrip('_')
+                fields[attr_field.name] = (attr_field.name, init_name, mapper.compile(attr_field.name, ns, ns_map))
+
+        order = get_attrs(cls)[3]
+        xml_fields = tuple(
+            fields[attr_field.name]
+            for attr_field in reorder(attr.fields(cls), order, op.attrgetter('name'))
+            if attr_field.name in fields
+        )
+
+        model_plan = plans[key] = plan.ModelPlan(
+            cls, name, resolve_tag(ns, name, ns_map), qname(ns_map.get(ns), name), tag_name(ns, name), idx, required,
+            tuple(fields.values()), xml_fields,
+        )
+
+    return model_plan
+
+
 class Mapper(abc.ABC):
     """
     Base mapper class. All mappers are inherited from it.
@@ -135,6 +228,21 @@ class Mapper(abc.ABC):
         :return: deserialized object
         """
 
+    def compile(self, name=None, ns=None, ns_map=None, idx=None):
+        """
+        Compiles the mapper into a plan bound to the containing element context.
+        The default implementation returns a plan delegating to :py:meth:`Mapper.xml` and :py:meth:`Mapper.obj`.
+
+        :param str name: element name
+        :param str ns: element namespace
+        :param dict ns_map: mapping from namespace prefix to full name
+        :param int idx: element index in the xml tree
+        :return: compiled plan
+        :rtype: :py:class:`paxb.plan.Plan`
+        """
+
+        return plan.MapperPlan(self, name, ns, ns_map)
+
 
 class AttributeXmlMapper(Mapper):
     """
@@ -148,32 +256,16 @@ class AttributeXmlMapper(Mapper):
         self.required = required
 
     def xml(self, obj, root, name=None, ns=None, ns_map=None, _=None, encoder=default_encoder):
-        name = first(self.name, name)
-        ns = self.ns
-        ns_map = merge_dicts(self.ns_map, ns_map)
-
-        if obj is None:
-            if self.required:
-                raise exc.SerializationError("required attribute '{}' is not set".format(name))
-            else:
-                return None
-
-        attrib = encoder.encode(obj)
-        root.attrib[qname(ns=ns_map.get(ns), name=name)] = attrib
-
-        return attrib
+        return self.compile(name, ns, ns_map).xml(obj, root, encoder)
 
     def obj(self, xml, name=None, ns=None, ns_map=None, _=None, full_path=()):
-        name = first(self.name, name)
-        ns = self.ns
-
-        tag = qname(ns=ns_map.get(ns), name=name)
+        return self.compile(name, ns, ns_map).obj(xml, full_path)
 
-        attribute = xml.get(tag)
-        if attribute is None and self.required:
-            raise exc.DeserializationError("required attribute '/{}' not found".format('/'.join(full_path + (name, ))))
+    def compile(self, name=None, ns=None, ns_map=None, _=None):
+        name = first(self.name, name)
+        ns_map = merge_dicts(self.ns_map, ns_map)
 
-        return attribute
+        return plan.AttributePlan(name, qname(ns=ns_map.get(self.ns), name=name), self.required)
 
 
 class FieldXmlMapper(Mapper):
@@ -189,44 +281,20 @@ class FieldXmlMapper(Mapper):
         self.required = required
 
     def xml(self, obj, root, name=None, ns=None, ns_map=None, idx=None, encoder=default_encoder):
-        name = first(self.name, name)
-        ns = first(self.ns, ns)
-        ns_map = merge_dicts(self.ns_map, ns_map)
-        idx = first(idx, self.idx, 1)
-
-        existing_elements = root.findall(qname(ns=ns_map.get(ns), name=name), ns_map)
-        if idx > len(existing_elements) + 1:
-            raise exc.SerializationError(
-                "serialization can't be completed because {name}[{cur}] is going to be serialized, "
-                "but {name}[{prev}] is not serialized.".format(name=name, cur=idx, prev=idx-1)
-            )
-
-        if obj is None:
-            if self.required:
-                raise exc.SerializationError("required element '{}' is not set".format(name))
-            else:
-                return None
-
-        element = et.SubElement(root, qname(ns=ns_map.get(ns), name=name))
-        element.text = encoder.encode(obj)
-
-        return element
+        return self.compile(name, ns, ns_map, idx).xml(obj, root, encoder)
 
     def obj(self, xml, name=None, ns=None, ns_map=None, idx=None, full_path=()):
+        return self.compile(name, ns, ns_map, idx).obj(xml, full_path)
+
+    def compile(self, name=None, ns=None, ns_map=None, idx=None):
         name = first(self.name, name)
         ns = first(self.ns, ns)
         ns_map = merge_dicts(self.ns_map, ns_map)
         idx = first(idx, self.idx, 1)
 
-        tag = tag_name(ns=ns, name=name, idx=idx)
-
-        xml = xml.find(tag, ns_map)
-        if xml is None or xml.text is None:
-            if self.required:
-                raise exc.DeserializationError("required element '/{}' not found".format('/'.join(full_path + (tag, ))))
-            return None
-
-        return xml.text
+        return plan.FieldPlan(
+            name, resolve_tag(ns, name, ns_map), qname(ns_map.get(ns), name), tag_name(ns, name), idx, self.required,
+        )
 
 
 class WrapperXmlMapper(Mapper):
@@ -247,46 +315,20 @@ class WrapperXmlMapper(Mapper):
             self.wrapped = wrapped
 
     def xml(self, obj, root, name=None, ns=None, ns_map=None, idx=None, encoder=default_encoder):
-        ns = first(self.ns, ns)
-        ns_map = merge_dicts(self.ns_map, ns_map)
-        idx = first(idx, self.idx, 1)
-
-        existing_elements = root.findall(qname(ns=ns_map.get(ns), name=self.name), ns_map)
-        if idx > len(existing_elements) + 1:
-            raise exc.SerializationError(
-                "serialization can't be completed because {name}[{cur}] is going to be serialized, "
-                "but {name}[{prev}] is not serialized.".format(name=name, cur=idx, prev=idx - 1)
-            )
-        if idx == len(existing_elements) + 1:
-            element = et.Element(qname(ns=ns_map.get(ns), name=self.name))
-            new_element = True
-        else:
-            element = existing_elements[idx-1]
-            new_element = False
-
-        serialized = self.wrapped.xml(obj, element, name, ns, ns_map, encoder=encoder)
-        if serialized is None:
-            return None
-
-        if new_element:
-            root.append(element)
-
-        return element
+        return self.compile(name, ns, ns_map, idx).xml(obj, root, encoder)
 
     def obj(self, xml, name=None, ns=None, ns_map=None, idx=None, full_path=()):
+        return self.compile(name, ns, ns_map, idx).obj(xml, full_path)
+
+    def compile(self, name=None, ns=None, ns_map=None, idx=None):
         ns = first(self.ns, ns)
         ns_map = merge_dicts(self.ns_map, ns_map)
         idx = first(idx, self.idx, 1)
 
-        tag = tag_name(ns=ns, name=self.name, idx=idx)
-
-        xml = xml.find(tag, ns_map)
-        if xml is None:
-            if self.wrapped.required:
-                raise exc.DeserializationError("required element '/{}' not found".format('/'.join(full_path + (tag, ))))
-            return None
-
-        return self.wrapped.obj(xml, name, ns, ns_map, full_path=full_path + (tag,))
+        return plan.WrapperPlan(
+            self.name, resolve_tag(ns, self.name, ns_map), qname(ns_map.get(ns), self.name), tag_name(ns, self.name),
+            idx, self.required, self.wrapped.compile(name, ns, ns_map),
+        )
 
 
 class ListXmlWrapper(Mapper):
@@ -299,26 +341,45 @@ class ListXmlWrapper(Mapper):
         self.required = wrapped.required
 
     def xml(self, obj, root, name=None, ns=None, ns_map=None, _=None, encoder=default_encoder):
+        return self.compile(name, ns, ns_map).xml(obj, root, encoder)
+
+    def obj(self, xml, name=None, ns=None, ns_map=None, _=None, full_path=()):
+        return self.compile(name, ns, ns_map).obj(xml, full_path)
+
+    def compile(self, name=None, ns=None, ns_map=None, _=None):
         name = first(self.wrapped.name, name)
         ns = first(self.wrapped.ns, ns)
         ns_map = merge_dicts(self.wrapped.ns_map, ns_map)
 
-        children = []
-        for idx, item in enumerate(obj or []):
-            children.append(self.wrapped.xml(item, root, name, ns, ns_map, idx+1, encoder=encoder))
+        return plan.ListPlan(self.wrapped.compile(name, ns, ns_map), resolve_tag(ns, name, ns_map))
+
 
-        return children or None
+class ArrayXmlMapper(Mapper):
+    """
+    Numeric array to XML mapper. Implements methods for mapping a list of elements or whitespace-separated values
+    to a :py:class:`numpy.ndarray` and vise versa.
+    """
+
+    def __init__(self, wrapped, dtype, packed):
+        self.wrapped = wrapped
+        self.dtype = dtype
+        self.packed = packed
+        self.required = wrapped.required
+
+    def xml(self, obj, root, name=None, ns=None, ns_map=None, _=None, encoder=default_encoder):
+        return self.compile(name, ns, ns_map).xml(obj, root, encoder)
 
     def obj(self, xml, name=None, ns=None, ns_map=None, _=None, full_path=()):
+        return self.compile(name, ns, ns_map).obj(xml, full_path)
+
+    def compile(self, name=None, ns=None, ns_map=None, _=None):
         name = first(self.wrapped.name, name)
         ns = first(self.wrapped.ns, ns)
         ns_map = merge_dicts(self.wrapped.ns_map, ns_map)
 
-        result = []
-        for idx, e in enumerate(xml.iterfind(tag_name(ns=ns, name=name), ns_map)):
-            result.append(self.wrapped.obj(xml, name, ns, ns_map, idx+1, full_path=full_path))
-
-        return result
+        return plan.ArrayPlan(
+            self.wrapped.compile(name, ns, ns_map), resolve_tag(ns, name, ns_map), self.dtype, self.packed,
+        )
 
 
 class ModelXmlMapper(Mapper):
@@ -336,65 +397,17 @@ class ModelXmlMapper(Mapper):
         self.required = required
 
     def xml(self, obj, root, name=None, ns=None, ns_map=None, idx=None, encoder=default_encoder):
-        name = first(self.name, name)
-        ns = first(self.ns, ns)
-        ns_map = merge_dicts(self.ns_map, ns_map)
-        idx = first(idx, self.idx, 1)
-
-        existing_elements = root.findall(qname(ns=ns_map.get(ns), name=name), ns_map)
-        if idx > len(existing_elements) + 1:
-            raise exc.SerializationError(
-                "serialization can't be completed because {name}[{cur}] is going to be serialized, "
-                "but {name}[{prev}] is not serialized.".format(name=name, cur=idx, prev=idx-1)
-            )
-
-        if obj is None:
-            if self.required:
-                raise exc.SerializationError("required element '{}' is not set".format(name))
-            else:
-                return None
-
-        element = et.Element(qname(ns=ns_map.get(ns), name=name))
-
-        serialized_fields = []
-        for field in reorder(attr.fields(self.cls), self.order, op.attrgetter('name')):
-            mapper = field.metadata.get('paxb.mapper')
-            if mapper:
-                serialized = mapper.xml(getattr(obj, field.name), element, field.name, ns, ns_map, encoder=encoder)
-                if serialized is not None:
-                    serialized_fields.append(serialized)
-
-        if not serialized_fields:
-            return None
-        else:
-            root.append(element)
-            return element
+        return self.compile(name, ns, ns_map, idx).xml(obj, root, encoder)
 
     def obj(self, xml, name=None, ns=None, ns_map=None, idx=None, full_path=()):
-        name = first(self.name, name)
-        ns = first(self.ns, ns)
-        ns_map = merge_dicts(self.ns_map, ns_map)
-        idx = first(idx, self.idx, 1)
-
-        tag = tag_name(ns=ns, name=name, idx=idx)
-
-        xml = xml.find(tag, ns_map)
-        if xml is None:
-            if self.required:
-                raise exc.DeserializationError("required element '/{}' not found".format('/'.join(full_path + (tag, ))))
-            return None
-
-        cls_kwargs = {}
-
-        for attr_field in attr.fields(self.cls):
-            mapper = attr_field.metadata.get('paxb.mapper')
-            if mapper:
-                cls_kwargs[attr_field.name] = mapper.obj(xml, attr_field.name, ns, ns_map, full_path=full_path + (tag,))
-
-        # Alter class initialization arguments that start with underscore (_). It is necessary because of
-        # `attrs` library implementation specific. See https://www.attrs.org/en/stable/init.html#private-attributes.
-        cls_kwargs = {k.lstrip('_'): w for k, w in cls_kwargs.items()}
-
-        cls_kwargs = drop_nones(cls_kwargs)
-
-        return self.cls(**cls_kwargs)
+        return self.compile(name, ns, ns_map, idx).obj(xml, full_path)
+
+    def compile(self, name=None, ns=None, ns_map=None, idx=None):
+        return compile_model(
+            self.cls,
+            name=first(self.name, name),
+            ns=first(self.ns, ns),
+            ns_map=merge_dicts(self.ns_map, ns_map),
+            idx=first(idx, self.idx, 1),
+            required=self.required,
+        )
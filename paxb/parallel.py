@@ -0,0 +1,35 @@
+"""
+The module implements the worker side of parallel deserialization (see :py:func:`paxb.from_xml_many`).
+Worker functions are defined on the module level so that they can be pickled by process executors.
+"""
+
+from . import exceptions as exc
+
+
+def load(cls, document, kwargs):
+    """
+    Deserializes a document returning the deserialization error instead of raising it.
+    """
+
+    from .paxb import from_xml
+
+    try:
+        return from_xml(cls, document, **kwargs)
+    except exc.DeserializationError as e:
+        return e
+    except Exception as e:
+        # the original exception might be not picklable so only its description is passed
+        return exc.DeserializationError('{}: {}'.format(e.__class__.__name__, e))
+
+
+def load_chunk(cls, documents, kwargs):
+    """
+    Deserializes a chunk of documents.
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :param list documents: xml documents
+    :param dict kwargs: arguments that will be passed to :py:func:`paxb.from_xml`
+    :return: list of deserialized objects and errors
+    """
+
+    return [load(cls, document, kwargs) for document in documents]
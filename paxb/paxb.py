@@ -1,9 +1,22 @@
-import xml.etree.ElementTree as et
+import io
+import itertools
+import os
+import pathlib
+from concurrent import futures
 
 import attr
+from . import aio
+from . import backends
+from . import codegen
+from . import columns as columns_
 from . import encoder as default_encoder
 from . import exceptions as exc
+from . import lazy as lazy_
 from . import mappers
+from . import parallel
+from . import plan
+from . import sax
+from . import stream
 
 
 def model(maybe_cls=None, name=None, ns=None, ns_map=None, order=None, **kwargs):
@@ -24,7 +37,8 @@ def model(maybe_cls=None, name=None, ns=None, ns_map=None, order=None, **kwargs)
     :param dict ns_map: mapping from a namespace prefix to a full name. It is applied to the current model
                         and it's elements and all nested models
     :param tuple order: class fields serialization order. If `None` in-class definition order is used
-    :param kwargs: arguments that will be passed to :py:func:`attr.ib`
+    :param kwargs: arguments that will be passed to :py:func:`attr.s`. For example ``slots=True`` creates
+                   a slotted class which instances have no ``__dict__`` and take less memory
     """
 
     def decorator(cls):
@@ -114,6 +128,9 @@ def nested(cls, name=None, ns=None, ns_map=None, idx=None, **kwargs):
 
         return value
 
+    # deserialized values are model instances already
+    default_converter.__paxb_passthrough__ = True
+
     required = 'default' not in kwargs
     attrib_kwargs = {'converter': default_converter, **kwargs}
 
@@ -151,36 +168,121 @@ def as_list(wrapped):
     original_converter = wrapped.converter
 
     def list_converter(values):
-        if original_converter is not None and values is not None:
-            return [original_converter(value) for value in values]
+        if values is not None:
+            return list(map(original_converter, values))
 
         return values
 
-    wrapped.converter = list_converter
+    # lists of unconverted items are left without a converter so that the items can be decoded
+    # by the field type decoder (see paxb.decoder)
+    if original_converter is not None:
+        list_converter.__paxb_passthrough__ = plan.passthrough(original_converter)
+        wrapped.converter = list_converter
     wrapped.metadata['paxb.mapper'] = mappers.ListXmlWrapper(wrapped.metadata['paxb.mapper'])
 
     return wrapped
 
 
-def from_xml(cls, xml, envelope=None, name=None, ns=None, ns_map=None, required=True):
+def as_array(wrapped, dtype='float64', packed=False):
+    """
+    The function maps a class field to a :py:class:`numpy.ndarray` of numbers. The array is mapped to an XML
+    element list or to whitespace-separated values of a single element or attribute. All the values
+    are converted at once. Requires `numpy <https://numpy.org>`_ package to be installed.
+
+    Arrays can't be compared by ``==`` so the field is excluded from the model comparison methods.
+
+    :param wrapped: array element field or attribute
+    :param dtype: array data type
+    :param bool packed: map the array to the wrapped element text. Attribute arrays are always packed
+    """
+
+    numpy = plan.import_numpy()
+    if numpy is None:
+        raise ImportError("as_array requires numpy package to be installed")
+
+    mapper = wrapped.metadata['paxb.mapper']
+    if not isinstance(mapper, (mappers.AttributeXmlMapper, mappers.FieldXmlMapper)):
+        raise TypeError("as_array wrapped object must be a field or an attribute")
+
+    packed = packed or isinstance(mapper, mappers.AttributeXmlMapper)
+    wrapped.metadata['paxb.mapper'] = mappers.ArrayXmlMapper(mapper, numpy.dtype(dtype), packed)
+
+    # attrs generated __eq__ would compare the arrays elementwise and fail to get a truth value
+    if hasattr(wrapped, 'eq'):
+        wrapped.eq = wrapped.order = False
+    else:
+        wrapped.cmp = False
+
+    return wrapped
+
+
+def from_xml(
+    cls, xml, envelope=None, name=None, ns=None, ns_map=None, required=True, engine='codegen', backend='etree',
+    lazy=False, fields=None, trusted=False,
+):
     """
     Deserializes xml string to object of `cls` type. `cls` must be a :py:func:`paxb.model` decorated class.
 
     :param cls: class the deserialized object is instance of
-    :param xml: xml string or xml tree to deserialize the object from
-    :type xml: :py:class:`str` or :py:class:`xml.etree.ElementTree.ElementTree`
+    :param xml: xml string or xml tree to deserialize the object from. Trees of any backend (for example
+                ``lxml.etree`` elements) are accepted as is. Regular files (:py:class:`pathlib.Path` paths or binary
+                file objects) are memory-mapped and parsed directly from the mapping, other file objects
+                (compressed files, pipes) are read
+    :type xml: :py:class:`str`, :py:class:`bytes`, :py:class:`pathlib.Path`, file object
+               or :py:class:`xml.etree.ElementTree.ElementTree`
     :param str envelope: root tag where the serializing object will be looked for
     :param str name: name of the serialized object element. If `None` model decorator `name` argument will be used
     :param str ns: namespace of the serialized object element. If `None` model decorator `ns` argument will be used
     :param dict ns_map: mapping from a namespace prefix to a full name
     :param bool required: is the serialized object element required. If element not found and `required` is ``True``
            :py:exc:`paxb.exceptions.DeserializationError` will be raised otherwise ``None`` is returned
+    :param str engine: deserialization engine. ``'codegen'`` uses functions generated for every model,
+                       ``'mappers'`` interprets the compiled mappers which is slower but easier to debug,
+                       ``'expat'`` deserializes xml strings directly from parser events without building
+                       an element tree
+    :param backend: xml tree backend the xml string is parsed by: ``'etree'`` (:py:mod:`xml.etree.ElementTree`)
+                    or ``'lxml'``
+    :param bool lazy: return a lazy instance. A lazy instance keeps a reference to the xml tree and deserializes
+                      a field only the first time it is accessed, the `engine` argument is not used.
+                      Validators and ``__attrs_post_init__`` are not run until the instance is passed
+                      to :py:func:`paxb.materialize`
+    :param fields: names of the fields to be deserialized. Nested model fields are selected by dotted paths,
+                   for example ``'occupations.address'``, a nested model name selects all its fields.
+                   The rest of the fields are not looked up and set to the defaults (``None`` if the field
+                   has no default). The object is created bypassing the model ``__init__`` so validators are not run,
+                   ``__attrs_post_init__`` is still called
+    :param bool trusted: the document is trusted (for example it was serialized by the application itself).
+                         Objects are created bypassing the models ``__init__`` methods: validators are not run and
+                         :py:func:`paxb.nested` and :py:func:`paxb.as_list` converters are not called for
+                         the already deserialized nested objects. Custom converters and ``__attrs_post_init__``
+                         are still called
     :return: deserialized object
     """
 
-    if isinstance(xml, (str, bytes)):
-        root = et.Element(None)
-        root.append(et.fromstring(xml))
+    if isinstance(xml, pathlib.PurePath) or hasattr(xml, 'read'):
+        with backends.mapped(xml) as buffer:
+            return from_xml(cls, buffer, envelope, name, ns, ns_map, required, engine, backend, lazy, fields, trusted)
+
+    model_plan = mappers.ModelXmlMapper(cls, name, ns, ns_map, required=required).compile()
+    plan.check_tag(model_plan.tag)
+    if fields is not None:
+        model_plan = plan.project(model_plan, fields)
+    if trusted:
+        model_plan = plan.trust(model_plan)
+
+    if engine == 'expat' and not lazy:
+        # the document is deserialized by a tree-based engine if the expat engine can't handle it
+        engine = 'codegen'
+        if isinstance(xml, (str, bytes, memoryview)) and (not envelope or sax.SIMPLE_PATH.match(envelope)):
+            try:
+                return sax.obj(model_plan, xml, mappers.resolve_path(envelope, ns_map) if envelope else None)
+            except (sax.Fallback, sax.Unsupported):
+                pass
+
+    if isinstance(xml, (str, bytes, memoryview)):
+        backend = backends.get_backend(backend)
+        root = backend.container()
+        root.append(backend.frombuffer(xml) if isinstance(xml, memoryview) else backend.fromstring(xml))
     else:
         root = xml
 
@@ -192,10 +294,189 @@ def from_xml(cls, xml, envelope=None, name=None, ns=None, ns_map=None, required=
     else:
         full_path = ()
 
-    return mappers.ModelXmlMapper(cls, name, ns, ns_map, required=required).obj(root, full_path=full_path)
+    if lazy:
+        plan.check_lookups(model_plan)
+        element, path = model_plan.find(root, full_path, model_plan.idx)
+        if element is None:
+            if model_plan.required:
+                raise model_plan.not_found(path)
+            return None
+
+        return lazy_.instance(model_plan, element, path)
+
+    if engine == 'codegen':
+        return codegen.obj(model_plan, root, full_path=full_path)
+    elif engine == 'mappers':
+        return model_plan.obj(root, full_path=full_path)
+    else:
+        raise ValueError("unknown engine '{}'".format(engine))
+
 
+def from_xml_many(cls, documents, workers=None, executor='process', chunk_size=None, **kwargs):
+    """
+    Deserializes a number of xml documents to objects of `cls` type in parallel. Documents are split into chunks
+    and every chunk is deserialized by a worker as a whole to amortize the inter-process communication costs.
+
+    A document deserialization error doesn't stop the others from being deserialized: the error is returned
+    in the place of the document object. Errors other than :py:exc:`paxb.exceptions.DeserializationError`
+    (for example parse errors or converter errors) are wrapped into :py:exc:`paxb.exceptions.DeserializationError`.
+
+    :param cls: :py:func:`paxb.model` decorated class. The class must be importable by the worker processes
+                if the process executor is used
+    :param documents: iterable of xml strings
+    :param int workers: number of workers. If ``None`` the number of processors is used. If ``1`` the documents
+                        are deserialized in the current thread
+    :param executor: ``'process'`` (:py:class:`concurrent.futures.ProcessPoolExecutor`), ``'thread'``
+                     (:py:class:`concurrent.futures.ThreadPoolExecutor`) or an executor instance
+                     which is not shut down after the documents are deserialized
+    :param int chunk_size: number of documents deserialized by a worker at once. If ``None`` the documents
+                           are split into four chunks per worker
+    :param kwargs: arguments that will be passed to :py:func:`paxb.from_xml`
+    :return: list of deserialized objects and :py:exc:`paxb.exceptions.DeserializationError` instances
+             in the documents order
+    """
+
+    documents = list(documents)
+    workers = workers or os.cpu_count() or 1
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(documents) // (workers * 4)))
+
+    chunks = [documents[start:start + chunk_size] for start in range(0, len(documents), chunk_size)]
+    if workers == 1 or len(chunks) <= 1:
+        return parallel.load_chunk(cls, documents, kwargs)
 
-def to_xml(obj, envelope=None, name=None, ns=None, ns_map=None, encoder=default_encoder, **kwargs):
+    if isinstance(executor, futures.Executor):
+        pool, shutdown = executor, False
+    elif executor == 'process':
+        pool, shutdown = futures.ProcessPoolExecutor(workers), True
+    elif executor == 'thread':
+        pool, shutdown = futures.ThreadPoolExecutor(workers), True
+    else:
+        raise ValueError("unknown executor '{}'".format(executor))
+
+    try:
+        results = pool.map(parallel.load_chunk, itertools.repeat(cls), chunks, itertools.repeat(kwargs))
+        return [obj for chunk in results for obj in chunk]
+    finally:
+        if shutdown:
+            pool.shutdown()
+
+
+def materialize(obj):
+    """
+    Deserializes all the fields of a lazy instance returned by :py:func:`paxb.from_xml` called with ``lazy=True``
+    and all its nested lazy instances, runs the model validators and ``__attrs_post_init__`` and turns the instance
+    into a regular one releasing the xml tree. Regular instances are returned as is. Lazy instances of slotted models
+    (declared with ``slots=True``) can't be turned into regular ones in place, a new instance is returned for them.
+
+    :param obj: lazy model instance
+    :return: regular model instance
+    """
+
+    return lazy_.materialize(obj)
+
+
+def iter_xml(cls, source, path, ns_map=None, engine='codegen', backend='etree'):
+    """
+    Deserializes ``paxb`` model objects from an xml document incrementally. The document is parsed
+    by :py:func:`xml.etree.ElementTree.iterparse` and every record element is deserialized as soon as it is parsed
+    and removed from the tree afterwards, so documents of any size are processed in a constant memory.
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :param source: file name or file object containing xml data
+    :param str path: slash-separated path to record elements starting from the document root element,
+                     for example ``'envelope/records/record'``. The last path element is the record element name
+    :param dict ns_map: mapping from a namespace prefix to a full name
+    :param str engine: deserialization engine: ``'codegen'`` or ``'mappers'`` (see :py:func:`paxb.from_xml`).
+                       The ``'expat'`` engine is not supported, records are parsed by the `backend`
+    :param backend: xml tree backend the document is parsed by (see :py:func:`paxb.from_xml`)
+    :return: deserialized objects generator
+    """
+
+    backend = backends.get_backend(backend)
+
+    load = stream.loader(mappers.ModelXmlMapper(cls, ns_map=ns_map).compile(), engine)
+    extractor = stream.RecordExtractor(path, ns_map)
+
+    for element, element_path in extractor.process(backend.iterparse(source, events=('start', 'end'))):
+        yield load(element, element_path)
+
+
+def to_columns(cls, source, path, fields=None, ns_map=None, kind='array', backend='etree'):
+    """
+    Extracts repeated records from an xml document into columns. The document is streamed the same way
+    :py:func:`paxb.iter_xml` does but no model objects are created: every record field value is appended
+    to its column directly.
+
+    Numeric fields (annotated as :py:class:`int` or :py:class:`float` and having no converter) are extracted
+    into :py:class:`array.array` columns, the other fields into lists. Missing values are replaced
+    by the field default, missing :py:class:`float` values without a default are replaced by ``nan``.
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :param source: file name or file object containing xml data
+    :param str path: slash-separated path to record elements starting from the document root element
+                     (see :py:func:`paxb.iter_xml`)
+    :param fields: extracted field names. If ``None`` all the attribute and element text fields are extracted.
+                   Nested models and lists can't be extracted
+    :param dict ns_map: mapping from a namespace prefix to a full name
+    :param str kind: column type: ``'array'`` (:py:class:`array.array` and :py:class:`list`) or ``'numpy'``
+                     (:py:class:`numpy.ndarray`, requires numpy package to be installed)
+    :param backend: xml tree backend the document is parsed by (see :py:func:`paxb.from_xml`)
+    :return: mapping from a field name to its column
+    :rtype: dict
+    """
+
+    if kind not in columns_.KINDS:
+        raise ValueError("unknown column kind '{}'".format(kind))
+    if kind == 'numpy' and plan.import_numpy() is None:
+        raise ImportError("numpy columns require numpy package to be installed")
+
+    backend = backends.get_backend(backend)
+
+    extract, columns = columns_.extractor(mappers.ModelXmlMapper(cls, ns_map=ns_map).compile(), fields)
+    values = [column.create() for column in columns]
+    appends = [column_values.append for column_values in values]
+
+    extractor = stream.RecordExtractor(path, ns_map)
+    for element, element_path in extractor.process(backend.iterparse(source, events=('start', 'end'))):
+        extract(element, element_path, *appends)
+
+    return {
+        column.attribute.name: columns_.finalize(column, column_values, kind)
+        for column, column_values in zip(columns, values)
+    }
+
+
+def aiter_xml(cls, reader, path, ns_map=None, engine='codegen', backend='etree', chunk_size=64 * 1024):
+    """
+    Deserializes ``paxb`` model objects from an :py:mod:`asyncio` stream incrementally. The stream is read
+    chunk by chunk and every record element is deserialized as soon as it is parsed, so the event loop
+    is not blocked for the whole document processing time:
+
+    .. code-block:: python
+
+        async for record in paxb.aiter_xml(Record, reader, 'envelope/records/record'):
+            process(record)
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :param reader: :py:class:`asyncio.StreamReader` or any object implementing ``read`` coroutine
+    :param str path: slash-separated path to record elements starting from the document root element
+                     (see :py:func:`paxb.iter_xml`)
+    :param dict ns_map: mapping from a namespace prefix to a full name
+    :param str engine: deserialization engine: ``'codegen'`` or ``'mappers'`` (see :py:func:`paxb.iter_xml`)
+    :param backend: xml tree backend the document is parsed by (see :py:func:`paxb.from_xml`)
+    :param int chunk_size: maximum number of bytes read from the stream at once
+    :return: asynchronous iterator of deserialized objects
+    """
+
+    return aio.RecordIterator(cls, reader, path, ns_map, engine=engine, backend=backend, chunk_size=chunk_size)
+
+
+def to_xml(
+    obj, envelope=None, name=None, ns=None, ns_map=None, encoder=default_encoder, engine='codegen', backend='etree',
+    **kwargs
+):
     """
     Serializes a ``paxb`` model object to an xml string. Object must be an instance
     of a :py:func:`paxb.model` decorated class.
@@ -207,22 +488,81 @@ def to_xml(obj, envelope=None, name=None, ns=None, ns_map=None, encoder=default_
     :param str ns: namespace of the serialized object element. If `None` model decorator `ns` argument will be used
     :param dict ns_map: mapping from a namespace prefix to a full name.
     :param encoder: value encoder. If ``None`` :py:func:`paxb.encoder.encode` is used
-    :param kwargs: arguments that will be passed to :py:func:`xml.etree.ElementTree.tostring` method
+    :param str engine: serialization engine. ``'codegen'`` uses functions generated for every model,
+                       ``'mappers'`` interprets the compiled mappers which is slower but easier to debug
+    :param backend: xml tree backend the document is built and serialized by: ``'etree'``
+                    (:py:mod:`xml.etree.ElementTree`) or ``'lxml'``
+    :param kwargs: arguments that will be passed to the backend ``tostring`` method
+                   (for example :py:func:`xml.etree.ElementTree.tostring`)
     :return: serialized object xml string
     :rtype: :py:class:`bytes` or :py:class:`str`
     """
 
+    backend = backends.get_backend(backend)
+
     if ns_map:
         for alias, uri in ns_map.items():
-            et.register_namespace(alias, uri)
+            backend.register_namespace(alias, uri)
 
-    root = et.Element(envelope)
-    obj = mappers.ModelXmlMapper(obj.__class__, name, ns, ns_map).xml(obj, root, encoder=encoder)
+    model_plan = mappers.ModelXmlMapper(obj.__class__, name, ns, ns_map).compile()
+
+    root = backend.envelope(envelope, ns_map) if envelope else backend.container()
+    if engine == 'codegen':
+        obj = codegen.xml(model_plan, obj, root, encoder, backend)
+    elif engine == 'mappers':
+        obj = model_plan.xml(obj, root, encoder)
+    else:
+        raise ValueError("unknown engine '{}'".format(engine))
 
     if envelope is None:
         root = obj
 
     if root is not None:
-        return et.tostring(root, **kwargs)
+        return backend.tostring(root, **kwargs)
     else:
         return None
+
+
+def to_xml_chunks(
+    objs, envelope=None, ns_map=None, encoder=default_encoder, encoding='utf-8', xml_declaration=False,
+    engine='codegen',
+):
+    """
+    Serializes ``paxb`` model objects to an xml document incrementally. The document is returned
+    as a generator of byte chunks: the envelope opening tags, a chunk for every object and the envelope closing tags.
+    The element tree is never built for the whole document so any number of objects can be serialized
+    in a constant memory (see :py:class:`paxb.XmlWriter`).
+
+    :param objs: iterable of objects to be serialized
+    :param str envelope: slash-separated envelope elements path the objects will be added inside,
+                         for example ``'envelope/records'``
+    :param dict ns_map: mapping from a namespace prefix to a full name
+    :param encoder: value encoder
+    :param str encoding: document encoding
+    :param bool xml_declaration: write xml declaration
+    :param str engine: serialization engine
+    :return: document chunks generator
+    """
+
+    buffer = io.BytesIO()
+
+    def flush():
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer = stream.XmlWriter(buffer, envelope, ns_map, encoder, encoding, xml_declaration, engine)
+
+    writer.open()
+    if buffer.tell():
+        yield flush()
+
+    for obj in objs:
+        writer.write(obj)
+        if buffer.tell():
+            yield flush()
+
+    writer.close()
+    if buffer.tell():
+        yield flush()
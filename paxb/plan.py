@@ -0,0 +1,981 @@
+"""
+The module implements compiled mapping plans. A plan is a tree of mappers bound to a particular
+context (element name, namespace, namespace map and index) with all qualified names, merged namespace maps and
+field orders resolved in advance. Plans are built by :py:meth:`paxb.mappers.Mapper.compile` and cached
+on the model class, so that serialization and deserialization only walk an xml tree.
+"""
+
+import abc
+import functools
+import typing as tp
+import xml.etree.ElementTree as et
+
+import attr
+
+from . import decoder
+from . import exceptions as exc
+
+
+def import_numpy():
+    """
+    Imports `numpy <https://numpy.org>`_. numpy takes a noticeable time to import so it is imported
+    by the array and column code paths only.
+
+    :return: numpy module or ``None`` if numpy is not installed
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+def index_children(element):
+    """
+    Builds an element children index. The index maps a child tag to a list of
+    (child element, child element children index) pairs. Children indexes are built lazily.
+
+    :param element: element to be indexed
+    :return: children index
+    :rtype: dict
+    """
+
+    children = {}
+    for child in element:
+        children.setdefault(child.tag, []).append((child, None))
+
+    return children
+
+
+# a model element children are indexed (see index_elements) if the model looks up at least INDEX_LOOKUPS elements
+# and the element has at least INDEX_CHILDREN children, otherwise the elements are looked up by a linear scan
+INDEX_LOOKUPS = 24
+INDEX_CHILDREN = 8
+
+
+def index_elements(element):
+    """
+    Builds an element children index used for deserialization.
+
+    :param element: indexed element
+    :return: mapping from a child qualified name to the list of children with that name in document order
+    """
+
+    children = {}
+    for child in element:
+        siblings = children.get(child.tag)
+        if siblings is None:
+            children[child.tag] = [child]
+        else:
+            siblings.append(child)
+
+    return children
+
+
+def lookups(fields):
+    """
+    Returns the number of element lookups required to deserialize the fields.
+    """
+
+    return sum(1 for _, _, field_plan in fields if isinstance(field_plan, (ElementPlan, ListPlan, ArrayPlan)))
+
+
+def find(element, tag, idx):
+    """
+    Finds the `idx`-th `element` child with the `tag` qualified name. Children are selected by their position
+    rather than by an indexed ElementPath expression (like ``tag[2]``): ElementPath caches a limited number
+    of compiled expressions, distinct indexes would evict each other while plain names are matched
+    without ElementPath at all.
+
+    :return: found element or ``None``
+    """
+
+    if idx == 1:
+        return element.find(tag)
+
+    siblings = element.findall(tag)
+    return siblings[idx-1] if idx <= len(siblings) else None
+
+
+def check_tag(tag):
+    """
+    Checks that an element qualified name is resolved (see :py:func:`paxb.mappers.resolve_tag`).
+
+    :raises SyntaxError: if the name prefix is not found in the namespace map (the same error ElementPath raises)
+    """
+
+    if tag[:1] != '{' and ':' in tag:
+        raise SyntaxError("prefix '{}' not found in prefix map".format(tag.split(':', 1)[0]))
+
+
+def check_lookups(model_plan):
+    """
+    Checks that the names of all the elements a model plan looks up in the model element are resolved.
+    Names with unknown prefixes never match any element so they are reported instead of deserializing the fields
+    as missing. The check is run once when the plan is used for deserialization for the first time.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`ModelPlan`
+    :raises SyntaxError: if a name prefix is not found in the namespace map
+    """
+
+    if model_plan.compiled.get('checked'):
+        return
+
+    for _, _, field_plan in model_plan.fields:
+        check_field_lookups(field_plan)
+
+    model_plan.compiled['checked'] = True
+
+
+def check_field_lookups(field_plan):
+    if isinstance(field_plan, ModelPlan):
+        check_tag(field_plan.tag)
+        check_lookups(field_plan)
+    elif isinstance(field_plan, (ListPlan, ArrayPlan)):
+        check_tag(field_plan.tag)
+        check_field_lookups(field_plan.item)
+    elif isinstance(field_plan, WrapperPlan):
+        check_tag(field_plan.tag)
+        check_field_lookups(field_plan.wrapped)
+    elif isinstance(field_plan, ElementPlan):
+        check_tag(field_plan.tag)
+
+
+def field_types(cls):
+    """
+    Returns the model attribute types. String annotations (forward references or annotations postponed
+    by ``from __future__ import annotations``) are resolved in the model module namespace, the ones
+    that can't be resolved are returned as is.
+
+    :param cls: model class
+    :return: mapping from an attribute name to its type or ``None`` if the attribute type is not set
+    """
+
+    types = {attribute.name: attribute.type for attribute in attr.fields(cls)}
+    if any(isinstance(value_type, str) for value_type in types.values()):
+        try:
+            hints = tp.get_type_hints(cls)
+        except Exception:
+            hints = {}
+
+        for name, value_type in types.items():
+            if isinstance(value_type, str):
+                types[name] = hints.get(name, value_type)
+
+    return types
+
+
+def item_type(list_type):
+    """
+    Returns the item type of a list type annotation (for example ``typing.List[int]``
+    or ``typing.Optional[typing.List[int]]``).
+
+    :param list_type: field type annotation
+    :return: list item type or ``None`` if the annotation is not a parametrized list
+    """
+
+    list_type = decoder.optional_type(list_type)
+    args = getattr(list_type, '__args__', None)
+    if getattr(list_type, '__origin__', None) in (list, tp.List) and args and len(args) == 1:
+        return args[0]
+
+    return None
+
+
+def value_decoder(field_plan, field_type):
+    """
+    Returns the decoder of a field deserialized value (see :py:mod:`paxb.decoder`). List fields are decoded
+    by a single call converting all the items.
+
+    :param field_plan: field plan
+    :param field_type: field type annotation
+    :return: decoder or ``None`` if the field value is not decoded
+    """
+
+    while isinstance(field_plan, WrapperPlan):
+        field_plan = field_plan.wrapped
+
+    if isinstance(field_plan, (AttributePlan, FieldPlan)):
+        return decoder.dispatch(field_type)
+
+    if isinstance(field_plan, ListPlan):
+        item = field_plan.item
+        while isinstance(item, WrapperPlan):
+            item = item.wrapped
+
+        decode = decoder.dispatch(item_type(field_type)) if isinstance(item, FieldPlan) else None
+        if decode is None:
+            return None
+
+        # missing optional items are deserialized as None
+        if item.required and item is field_plan.item:
+            return functools.partial(decoder.decode_list, decode)
+        else:
+            return functools.partial(decoder.decode_optional_items, decode)
+
+    return None
+
+
+def field_decoders(cls, fields):
+    """
+    Returns the model field value decoders. Fields having a converter are not decoded,
+    the converter is responsible for the value conversion.
+
+    :param cls: model class
+    :param tuple fields: model fields
+    :return: tuple of (initialization argument name, decoder) pairs
+    """
+
+    attributes = {attribute.name: attribute for attribute in attr.fields(cls)}
+    types = field_types(cls)
+
+    decoders = []
+    for name, init_name, field_plan in fields:
+        attribute = attributes[name]
+        if attribute.converter is None and types[name] is not None:
+            decode = value_decoder(field_plan, types[name])
+            if decode is not None:
+                decoders.append((init_name, decode))
+
+    return tuple(decoders)
+
+
+def default_value(attribute, obj):
+    """
+    Returns the attribute default value converted by the attribute converter the same way `attrs` does.
+    ``None`` is returned if the attribute has no default.
+
+    :param attribute: `attrs` attribute
+    :param obj: the instance the default is calculated for
+    """
+
+    default = attribute.default
+    if default is attr.NOTHING:
+        return None
+
+    if isinstance(default, attr.Factory):
+        value = default.factory(obj) if default.takes_self else default.factory()
+    else:
+        value = default
+
+    return attribute.converter(value) if attribute.converter is not None else value
+
+
+def passthrough(converter):
+    """
+    Checks that a converter returns deserialized values as is. Such converters (like the :py:func:`paxb.nested`
+    one converting dictionaries to model instances) are not called for trusted documents (see :py:func:`trust`).
+    """
+
+    return getattr(converter, '__paxb_passthrough__', False)
+
+
+def instance_fields(cls, trusted=False):
+    """
+    Returns the model attributes description used by :py:func:`partial_instance`.
+
+    :param cls: model class
+    :param bool trusted: skip the passthrough converters (see :py:func:`passthrough`)
+    :return: tuple of (attribute, initialization argument name, converter or ``None``) tuples
+    """
+
+    return tuple(
+        (
+            attribute,
+            attribute.name.lstrip('_'),
+            None if trusted and passthrough(attribute.converter) else attribute.converter,
+        )
+        for attribute in attr.fields(cls)
+    )
+
+
+def partial_instance(cls, kwargs, fields=None):
+    """
+    Creates a model instance bypassing the model ``__init__`` method. The passed values are converted
+    by the attribute converters, the missing ones are set to the defaults. Validators are not run,
+    ``__attrs_post_init__`` is called if the model defines it.
+
+    :param cls: model class
+    :param dict kwargs: initialization arguments
+    :param fields: precomputed model attributes description (see :py:func:`instance_fields`)
+    :return: model instance
+    """
+
+    if fields is None:
+        fields = instance_fields(cls)
+
+    set_attribute = object.__setattr__
+
+    obj = cls.__new__(cls)
+    for attribute, init_name, converter in fields:
+        value = kwargs.get(init_name)
+        if value is None:
+            value = default_value(attribute, obj)
+        elif converter is not None:
+            value = converter(value)
+
+        # frozen models don't allow attributes assignment
+        set_attribute(obj, attribute.name, value)
+
+    if hasattr(cls, '__attrs_post_init__'):
+        obj.__attrs_post_init__()
+
+    return obj
+
+
+def project(model_plan, fields):
+    """
+    Returns a partial model plan deserializing only the selected fields. The rest of the fields are set
+    to the defaults (see :py:func:`partial_instance`).
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`ModelPlan`
+    :param fields: selected field names. Nested model fields are selected using dotted paths,
+                   for example ``'occupations.address'``
+    :return: partial model plan
+    :rtype: :py:class:`ModelPlan`
+    """
+
+    # a tree of selected fields, None means the whole field is selected
+    tree = {}
+    for path in fields:
+        node = tree
+        *names, last = path.split('.')
+        for name in names:
+            node = node.setdefault(name, {})
+            if node is None:
+                break
+        else:
+            node[last] = None
+
+    return project_model(model_plan, tree)
+
+
+def project_model(model_plan, tree):
+    key = ('projection', repr(sorted(tree.items(), key=repr)))
+
+    projected = model_plan.compiled.get(key)
+    if projected is None:
+        field_names = {name for name, _, _ in model_plan.fields}
+        for name in tree:
+            if name not in field_names:
+                raise ValueError("{} has no field '{}'".format(model_plan.cls.__name__, name))
+
+        fields = tuple(
+            (name, init_name, project_field(field_plan, name, tree[name]))
+            for name, init_name, field_plan in model_plan.fields if name in tree
+        )
+        projected = model_plan.compiled[key] = ModelPlan(
+            model_plan.cls, model_plan.name, model_plan.tag, model_plan.xml_tag, model_plan.path_name,
+            model_plan.idx, model_plan.required, fields, fields, partial=True,
+        )
+
+    return projected
+
+
+def project_field(field_plan, name, tree):
+    if tree is None:
+        return field_plan
+
+    if isinstance(field_plan, ModelPlan):
+        return project_model(field_plan, tree)
+    if isinstance(field_plan, WrapperPlan):
+        return WrapperPlan(
+            field_plan.name, field_plan.tag, field_plan.xml_tag, field_plan.path_name, field_plan.idx,
+            field_plan.required, project_field(field_plan.wrapped, name, tree),
+        )
+    if isinstance(field_plan, ListPlan):
+        return ListPlan(project_field(field_plan.item, name, tree), field_plan.tag)
+
+    raise ValueError("field '{}' is not a nested model".format(name))
+
+
+def trust(model_plan):
+    """
+    Returns a model plan deserializing trusted documents. Objects are created bypassing the model ``__init__``
+    method (see :py:func:`partial_instance`) so validators are not run, the converters returning deserialized
+    values as is are not called. Nested models are deserialized by the trusted plans too.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`ModelPlan`
+    :return: trusted model plan
+    :rtype: :py:class:`ModelPlan`
+    """
+
+    if model_plan.trusted:
+        return model_plan
+
+    trusted = model_plan.compiled.get('trusted')
+    if trusted is None:
+        fields = {name: (name, init_name, trust_field(field_plan)) for name, init_name, field_plan in model_plan.fields}
+        trusted = model_plan.compiled['trusted'] = ModelPlan(
+            model_plan.cls, model_plan.name, model_plan.tag, model_plan.xml_tag, model_plan.path_name,
+            model_plan.idx, model_plan.required, tuple(fields.values()),
+            tuple(fields[name] for name, _, _ in model_plan.xml_fields), partial=model_plan.partial, trusted=True,
+        )
+
+    return trusted
+
+
+def trust_field(field_plan):
+    if isinstance(field_plan, ModelPlan):
+        return trust(field_plan)
+    if isinstance(field_plan, WrapperPlan):
+        return WrapperPlan(
+            field_plan.name, field_plan.tag, field_plan.xml_tag, field_plan.path_name, field_plan.idx,
+            field_plan.required, trust_field(field_plan.wrapped),
+        )
+    if isinstance(field_plan, ListPlan):
+        return ListPlan(trust_field(field_plan.item), field_plan.tag)
+
+    return field_plan
+
+
+class WrapperGroup:
+    """
+    Wrapper fields sharing the same wrapper element (wrappers with the same name and index).
+    The wrapper element is looked up once for all the group members.
+
+    :param wrapper: plan of the first group member. It is used to look up the wrapper element
+    :param list members: list of (key, wrapper plan) pairs
+    """
+
+    __slots__ = ('wrapper', 'members', 'wrapped')
+
+    def __init__(self, wrapper, members):
+        self.wrapper = wrapper
+        self.members = members
+        # wrapped plans grouped recursively so that the wrappers with a common path prefix share all the elements
+        self.wrapped = ()
+
+    @property
+    def required(self):
+        return any(wrapper.required for _, wrapper in self.members)
+
+    def keys(self):
+        """
+        Returns the keys of all the group members.
+        """
+
+        return [key for key, _ in self.members]
+
+
+def group_wrappers(members):
+    """
+    Groups wrapper plans by the wrapper element. Members are returned in the order of the first occurrence,
+    every group takes the place of its first member.
+
+    :param members: iterable of (key, plan) pairs
+    :return: list of (key, plan) pairs and :py:class:`WrapperGroup` instances
+    """
+
+    grouped, groups = [], {}
+    for key, member_plan in members:
+        if isinstance(member_plan, WrapperPlan):
+            group = groups.get((member_plan.tag, member_plan.idx))
+            if group is None:
+                group = groups[(member_plan.tag, member_plan.idx)] = WrapperGroup(member_plan, [])
+                grouped.append(group)
+            group.members.append((key, member_plan))
+        else:
+            grouped.append((key, member_plan))
+
+    for group in groups.values():
+        group.wrapped = group_wrappers((key, wrapper.wrapped) for key, wrapper in group.members)
+
+    return grouped
+
+
+class Plan(abc.ABC):
+    """
+    Base plan class. All plans are inherited from it.
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def xml(self, obj, root, encoder, idx=None, children=None):
+        """
+        Serialization method.
+
+        :param obj: object to be serialized
+        :param root: root element the object will be added inside
+        :type root: :py:class:`xml.etree.ElementTree.Element`
+        :param encoder: value encoder
+        :param int idx: element index in the xml tree. If `None` the compiled index is used
+        :param dict children: `root` children index (see :py:func:`index_children`). Every added element is
+                              registered in the index. If `None` the index is built from `root`
+        :return: added xml tree node
+        """
+
+    @abc.abstractmethod
+    def obj(self, xml, full_path=(), idx=None, children=None):
+        """
+        Deserialization method.
+
+        :param xml: xml tree to deserialize the object from
+        :type xml: :py:class:`xml.etree.ElementTree.Element`
+        :param tuple full_path: full path to the current element
+        :param int idx: element index in the xml tree. If `None` the compiled index is used
+        :param dict children: `xml` children index (see :py:func:`index_elements`). If `None` the elements
+                              are looked up in `xml` directly
+        :return: deserialized object
+        """
+
+
+class MapperPlan(Plan):
+    """
+    Adapter plan for mappers that don't implement compilation. Delegates to the mapper methods.
+    """
+
+    __slots__ = ('mapper', 'name', 'ns', 'ns_map')
+
+    def __init__(self, mapper, name, ns, ns_map):
+        self.mapper = mapper
+        self.name = name
+        self.ns = ns
+        self.ns_map = ns_map
+
+    def xml(self, obj, root, encoder, idx=None, children=None):
+        serialized = self.mapper.xml(obj, root, self.name, self.ns, self.ns_map, idx, encoder=encoder)
+        if children is not None and et.iselement(serialized):
+            children.setdefault(serialized.tag, []).append((serialized, None))
+
+        return serialized
+
+    def obj(self, xml, full_path=(), idx=None, children=None):
+        return self.mapper.obj(xml, self.name, self.ns, self.ns_map, idx, full_path=full_path)
+
+
+class AttributePlan(Plan):
+    """
+    Compiled attribute mapper.
+    """
+
+    __slots__ = ('name', 'tag', 'required')
+
+    def __init__(self, name, tag, required):
+        self.name = name
+        self.tag = tag
+        self.required = required
+
+    def xml(self, obj, root, encoder, idx=None, children=None):
+        if obj is None:
+            if self.required:
+                raise exc.SerializationError("required attribute '{}' is not set".format(self.name))
+            else:
+                return None
+
+        attrib = encoder.encode(obj)
+        root.attrib[self.tag] = attrib
+
+        return attrib
+
+    def obj(self, xml, full_path=(), idx=None, children=None):
+        attribute = xml.get(self.tag)
+        if attribute is None and self.required:
+            raise exc.DeserializationError(
+                "required attribute '/{}' not found".format('/'.join(full_path + (self.name,)))
+            )
+
+        return attribute
+
+
+class ElementPlan(Plan):
+    """
+    Base class for plans mapped to an xml element.
+
+    :param str name: element local name
+    :param str tag: qualified name the element is looked up by
+    :param str xml_tag: qualified name the element is created with
+    :param str path_name: element name as it appears in error messages
+    :param int idx: element index
+    :param bool required: is the element required
+    """
+
+    __slots__ = ('name', 'tag', 'xml_tag', 'path_name', 'idx', 'required')
+
+    def __init__(self, name, tag, xml_tag, path_name, idx, required):
+        self.name = name
+        self.tag = tag
+        self.xml_tag = xml_tag
+        self.path_name = path_name
+        self.idx = idx
+        self.required = required
+
+    def find(self, xml, full_path, idx, children=None):
+        """
+        Finds the `idx`-th element in `xml` children.
+
+        :param dict children: `xml` children index (see :py:func:`index_elements`)
+        :return: found element and its path or `None` and its path if the element not found
+        """
+
+        path_tag = '{}[{}]'.format(self.path_name, idx)
+        if children is not None:
+            siblings = children.get(self.tag, ())
+            element = siblings[idx-1] if idx <= len(siblings) else None
+        else:
+            element = find(xml, self.tag, idx)
+
+        return element, full_path + (path_tag,)
+
+    def siblings(self, root, children, idx):
+        """
+        Returns already serialized elements with the same tag checking that the `idx`-th element can be added.
+
+        :return: list of (element, element children index) pairs
+        """
+
+        if children is None:
+            children = index_children(root)
+
+        siblings = children.setdefault(self.xml_tag, [])
+        if idx > len(siblings) + 1:
+            raise exc.SerializationError(
+                "serialization can't be completed because {name}[{cur}] is going to be serialized, "
+                "but {name}[{prev}] is not serialized.".format(name=self.name, cur=idx, prev=idx-1)
+            )
+
+        return siblings
+
+    @abc.abstractmethod
+    def load(self, xml, full_path=()):
+        """
+        Deserializes the object from the already found element.
+
+        :param xml: the element the object is mapped to
+        :param tuple full_path: full path to the element including the element itself
+        :return: deserialized object
+        """
+
+    def not_found(self, path):
+        return exc.DeserializationError("required element '/{}' not found".format('/'.join(path)))
+
+
+class FieldPlan(ElementPlan):
+    """
+    Compiled element text mapper.
+    """
+
+    __slots__ = ()
+
+    def xml(self, obj, root, encoder, idx=None, children=None):
+        siblings = self.siblings(root, children, idx or self.idx)
+
+        if obj is None:
+            if self.required:
+                raise exc.SerializationError("required element '{}' is not set".format(self.name))
+            else:
+                return None
+
+        element = root.makeelement(self.xml_tag, {})
+        element.text = encoder.encode(obj)
+        root.append(element)
+        siblings.append((element, None))
+
+        return element
+
+    def obj(self, xml, full_path=(), idx=None, children=None):
+        xml, path = self.find(xml, full_path, idx or self.idx, children)
+        if xml is None:
+            if self.required:
+                raise self.not_found(path)
+            return None
+
+        return self.load(xml, path)
+
+    def load(self, xml, full_path=()):
+        if xml.text is None:
+            if self.required:
+                raise self.not_found(full_path)
+            return None
+
+        return xml.text
+
+
+class WrapperPlan(ElementPlan):
+    """
+    Compiled wrapper mapper.
+    """
+
+    __slots__ = ('wrapped',)
+
+    def __init__(self, name, tag, xml_tag, path_name, idx, required, wrapped):
+        super().__init__(name, tag, xml_tag, path_name, idx, required)
+        self.wrapped = wrapped
+
+    def xml(self, obj, root, encoder, idx=None, children=None):
+        idx = idx or self.idx
+
+        siblings = self.siblings(root, children, idx)
+        if idx == len(siblings) + 1:
+            element, element_children = root.makeelement(self.xml_tag, {}), {}
+            new_element = True
+        else:
+            element, element_children = siblings[idx-1]
+            if element_children is None:
+                element_children = index_children(element)
+                siblings[idx-1] = (element, element_children)
+            new_element = False
+
+        serialized = self.wrapped.xml(obj, element, encoder, children=element_children)
+        if serialized is None:
+            return None
+
+        if new_element:
+            root.append(element)
+            siblings.append((element, element_children))
+
+        return element
+
+    def obj(self, xml, full_path=(), idx=None, children=None):
+        xml, path = self.find(xml, full_path, idx or self.idx, children)
+        if xml is None:
+            if self.required:
+                raise self.not_found(path)
+            return None
+
+        return self.load(xml, path)
+
+    def load(self, xml, full_path=()):
+        return self.wrapped.obj(xml, full_path)
+
+
+class ListPlan(Plan):
+    """
+    Compiled element list mapper.
+
+    :param item: list item plan
+    :param str tag: qualified name of the list items
+    """
+
+    __slots__ = ('item', 'tag')
+
+    def __init__(self, item, tag):
+        self.item = item
+        self.tag = tag
+
+    def xml(self, obj, root, encoder, idx=None, children=None):
+        if children is None:
+            children = index_children(root)
+
+        serialized = []
+        for idx, item in enumerate(obj or [], start=1):
+            serialized.append(self.item.xml(item, root, encoder, idx, children))
+
+        return serialized or None
+
+    def obj(self, xml, full_path=(), idx=None, children=None):
+        item = self.item
+        elements = children.get(self.tag, ()) if children is not None else xml.findall(self.tag)
+        if not isinstance(item, ElementPlan):
+            return [item.obj(xml, full_path, idx, children) for idx in range(1, len(elements) + 1)]
+
+        # every matched element is deserialized directly instead of being looked up by its index
+        # that makes deserialization linear in the list length
+        return [
+            item.load(element, full_path + ('{}[{}]'.format(item.path_name, idx),))
+            for idx, element in enumerate(elements, start=1)
+        ]
+
+
+class ArrayPlan(Plan):
+    """
+    Compiled numeric array mapper. Values are mapped to a list of elements or to a single element text
+    or attribute holding whitespace-separated values and converted to a :py:class:`numpy.ndarray` at once.
+
+    :param item: array item plan (field or attribute plan)
+    :param str tag: qualified name of the array items
+    :param dtype: array data type
+    :param bool packed: values are packed into a single element or attribute
+    """
+
+    __slots__ = ('item', 'tag', 'dtype', 'packed')
+
+    def __init__(self, item, tag, dtype, packed):
+        self.item = item
+        self.tag = tag
+        self.dtype = dtype
+        self.packed = packed
+
+    def xml(self, obj, root, encoder, idx=None, children=None):
+        if obj is None:
+            return None
+
+        # values are formatted in bulk at the array precision (float32 0.1 is formatted as 0.1,
+        # not as the widened 0.10000000149011612) without the encoder dispatch
+        texts = import_numpy().asarray(obj, dtype=self.dtype).astype(str).tolist()
+        if self.packed:
+            return self.item.xml(' '.join(texts), root, encoder, children=children)
+
+        elements = []
+        for text in texts:
+            element = root.makeelement(self.item.xml_tag, {})
+            element.text = text
+            root.append(element)
+            elements.append((element, None))
+
+        if children is not None:
+            children.setdefault(self.item.xml_tag, []).extend(elements)
+
+        return texts or None
+
+    def obj(self, xml, full_path=(), idx=None, children=None):
+        numpy = import_numpy()
+        item = self.item
+        if self.packed:
+            if isinstance(item, AttributePlan):
+                text = item.obj(xml, full_path)
+                if text is None:
+                    return None
+            else:
+                element, path = item.find(xml, full_path, item.idx, children)
+                if element is None:
+                    if item.required:
+                        raise item.not_found(path)
+                    return None
+                # an empty element is an empty array
+                text = element.text
+
+            return numpy.array(text.split() if text else (), dtype=self.dtype)
+
+        elements = children.get(self.tag, ()) if children is not None else xml.findall(self.tag)
+        texts = [element.text for element in elements]
+        if None in texts:
+            raise item.not_found(full_path + ('{}[{}]'.format(item.path_name, texts.index(None) + 1),))
+
+        return numpy.array(texts, dtype=self.dtype)
+
+
+class ModelPlan(ElementPlan):
+    """
+    Compiled model mapper.
+
+    :param cls: model class
+    :param tuple fields: model fields in definition order. Every field is a (attribute name,
+                         initialization argument name, field plan) tuple
+    :param tuple xml_fields: model fields in serialization order
+    :param bool partial: the plan deserializes a part of the model fields (see :py:func:`project`)
+    :param bool trusted: the plan deserializes trusted documents (see :py:func:`trust`)
+    """
+
+    __slots__ = ('cls', 'fields', 'xml_fields', 'partial', 'trusted', 'indexed', 'groups', 'decoders', 'compiled')
+
+    def __init__(
+        self, cls, name, tag, xml_tag, path_name, idx, required, fields, xml_fields, partial=False, trusted=False,
+    ):
+        super().__init__(name, tag, xml_tag, path_name, idx, required)
+        self.cls = cls
+        self.fields = fields
+        self.xml_fields = xml_fields
+        self.partial = partial
+        self.trusted = trusted
+        # wide model elements are indexed instead of being scanned for every field
+        self.indexed = lookups(fields) >= INDEX_LOOKUPS
+        # fields grouped by the wrapper elements, the keys are the initialization argument names
+        self.groups = group_wrappers((init_name, field_plan) for _, init_name, field_plan in fields)
+        # typed field value decoders (see field_decoders)
+        self.decoders = field_decoders(cls, fields)
+        # engine specific artifacts (like generated functions) built for the plan
+        self.compiled = {}
+
+    def xml(self, obj, root, encoder, idx=None, children=None):
+        siblings = self.siblings(root, children, idx or self.idx)
+
+        if obj is None:
+            if self.required:
+                raise exc.SerializationError("required element '{}' is not set".format(self.name))
+            else:
+                return None
+
+        element, element_children = root.makeelement(self.xml_tag, {}), {}
+
+        serialized_fields = False
+        for name, _, plan in self.xml_fields:
+            if plan.xml(getattr(obj, name), element, encoder, children=element_children) is not None:
+                serialized_fields = True
+
+        if not serialized_fields:
+            return None
+        else:
+            root.append(element)
+            siblings.append((element, element_children))
+            return element
+
+    def obj(self, xml, full_path=(), idx=None, children=None):
+        xml, path = self.find(xml, full_path, idx or self.idx, children)
+        if xml is None:
+            if self.required:
+                raise self.not_found(path)
+            return None
+
+        return self.load(xml, path)
+
+    def load(self, xml, full_path=()):
+        if not self.compiled.get('checked'):
+            check_lookups(self)
+
+        children = index_elements(xml) if self.indexed and len(xml) >= INDEX_CHILDREN else None
+
+        values = {}
+        load_members(self.groups, xml, full_path, children, values)
+
+        cls_kwargs = {}
+        for _, init_name, _ in self.fields:
+            value = values.get(init_name)
+            if value is not None:
+                cls_kwargs[init_name] = value
+
+        return self.construct(cls_kwargs)
+
+    def construct(self, kwargs):
+        """
+        Creates a model instance.
+
+        :param dict kwargs: model initialization arguments. Typed field values are decoded in place
+        :return: model instance
+        """
+
+        for init_name, decode in self.decoders:
+            value = kwargs.get(init_name)
+            if value is not None:
+                kwargs[init_name] = decode(value)
+
+        if self.partial or self.trusted:
+            fields = self.compiled.get('instance')
+            if fields is None:
+                fields = self.compiled['instance'] = instance_fields(self.cls, self.trusted)
+
+            return partial_instance(self.cls, kwargs, fields)
+        else:
+            return self.cls(**kwargs)
+
+
+def load_members(members, xml, full_path, children, values):
+    """
+    Deserializes grouped fields (see :py:func:`group_wrappers`) looking up every wrapper element once.
+
+    :param members: grouped fields
+    :param xml: element the fields are looked up in
+    :param tuple full_path: full path to the element
+    :param dict children: `xml` children index (see :py:func:`index_elements`)
+    :param dict values: mapping the deserialized values are stored in by the field keys
+    """
+
+    for member in members:
+        if isinstance(member, WrapperGroup):
+            wrapper = member.wrapper
+            element, path = wrapper.find(xml, full_path, wrapper.idx, children)
+            if element is None:
+                if member.required:
+                    raise wrapper.not_found(path)
+                continue
+
+            load_members(member.wrapped, element, path, None, values)
+        else:
+            key, field_plan = member
+            values[key] = field_plan.obj(xml, full_path, children=children)
@@ -0,0 +1,357 @@
+"""
+The module implements the event-driven deserialization engine. Instead of building an element tree
+the document is parsed by :py:mod:`xml.parsers.expat` and its events are dispatched through a state machine compiled
+from the model plan: every open element gets a frame of watchers waiting for its children, values are delivered
+to the containing model as soon as their elements are closed and model objects are created when the model
+elements are closed.
+
+The engine handles well-formed documents only. If a required value is missing, a converter fails or the document
+can't be parsed the engine raises :py:exc:`Fallback` so that the caller can deserialize the document by
+a tree-based engine which reports the error the same way as for any other engine.
+"""
+
+import re
+from xml.parsers import expat
+
+from . import plan
+
+
+class Fallback(Exception):
+    """
+    Raised when the document can't be deserialized by the engine.
+    """
+
+
+class Unsupported(Exception):
+    """
+    Raised when a model plan can't be compiled for the engine.
+    """
+
+
+# value of an element that is not found
+NOT_FOUND = object()
+
+
+class Frame:
+    """
+    Open element state.
+    """
+
+    __slots__ = ('watchers', 'counts', 'text', 'text_open', 'closers')
+
+    def __init__(self):
+        # child tag -> list of callables accepting a child frame, the child index and the child attributes
+        self.watchers = {}
+        self.counts = {}
+        self.text = None
+        self.text_open = False
+        # callables called when the element is closed
+        self.closers = []
+
+
+class AttributeGetter:
+    """
+    Gets an attribute value from the context element.
+    """
+
+    __slots__ = ('tag', 'required')
+
+    def __init__(self, tag, required):
+        self.tag = tag
+        self.required = required
+
+    def attach(self, frame, attrib):
+        value = attrib.get(self.tag)
+        return [NOT_FOUND if value is None else value]
+
+
+class ChildGetter:
+    """
+    Gets a value from the `idx`-th context element child with the `tag` name.
+    """
+
+    __slots__ = ('tag', 'idx', 'required', 'loader')
+
+    def __init__(self, tag, idx, required, loader):
+        self.tag = tag
+        self.idx = idx
+        self.required = required
+        self.loader = loader
+
+    def attach(self, frame, attrib):
+        cell = [NOT_FOUND]
+        idx, loader = self.idx, self.loader
+
+        def deliver(value):
+            cell[0] = value
+
+        def watch(child_frame, child_idx, child_attrib):
+            if child_idx == idx:
+                loader.start(child_frame, child_attrib, deliver)
+
+        frame.watchers.setdefault(self.tag, []).append(watch)
+
+        return cell
+
+
+class ListGetter:
+    """
+    Gets a list of values from all the context element children with the `tag` name.
+    """
+
+    __slots__ = ('tag', 'loader')
+
+    required = False
+
+    def __init__(self, tag, loader):
+        self.tag = tag
+        self.loader = loader
+
+    def attach(self, frame, attrib):
+        cell = [[]]
+        start, deliver = self.loader.start, cell[0].append
+
+        def watch(child_frame, child_idx, child_attrib):
+            start(child_frame, child_attrib, deliver)
+
+        frame.watchers.setdefault(self.tag, []).append(watch)
+
+        return cell
+
+
+def get(getter, cell):
+    """
+    Returns a getter value checking the required value is found.
+    """
+
+    value = cell[0]
+    if value is NOT_FOUND:
+        if getter.required:
+            raise Fallback()
+        return None
+
+    return value
+
+
+class FieldLoader:
+    """
+    Loads the element text.
+    """
+
+    __slots__ = ('required',)
+
+    def __init__(self, required):
+        self.required = required
+
+    def start(self, frame, attrib, deliver):
+        if frame.text is None:
+            frame.text = []
+            frame.text_open = True
+
+        def close(frame):
+            text = ''.join(frame.text) if frame.text else None
+            if text is None and self.required:
+                raise Fallback()
+            deliver(text)
+
+        frame.closers.append(close)
+
+
+class WrapperLoader:
+    """
+    Loads the wrapped value from the element.
+    """
+
+    __slots__ = ('getter',)
+
+    def __init__(self, getter):
+        self.getter = getter
+
+    def start(self, frame, attrib, deliver):
+        getter = self.getter
+        cell = getter.attach(frame, attrib)
+
+        def close(frame):
+            deliver(get(getter, cell))
+
+        frame.closers.append(close)
+
+
+class ModelLoader:
+    """
+    Loads a model object from the element.
+    """
+
+    __slots__ = ('construct', 'fields')
+
+    def __init__(self, construct):
+        self.construct = construct
+        self.fields = ()
+
+    def start(self, frame, attrib, deliver):
+        construct, fields = self.construct, self.fields
+        cells = [getter.attach(frame, attrib) for _, getter in fields]
+
+        def close(frame):
+            kwargs = {}
+            for (init_name, getter), cell in zip(fields, cells):
+                value = get(getter, cell)
+                if value is not None:
+                    kwargs[init_name] = value
+
+            deliver(construct(kwargs))
+
+        frame.closers.append(close)
+
+
+def compile_getter(field_plan):
+    if isinstance(field_plan, plan.AttributePlan):
+        return AttributeGetter(field_plan.tag, field_plan.required)
+    if isinstance(field_plan, (plan.FieldPlan, plan.WrapperPlan, plan.ModelPlan)):
+        return ChildGetter(field_plan.tag, field_plan.idx, field_plan.required, compile_loader(field_plan))
+    if isinstance(field_plan, plan.ListPlan) and isinstance(field_plan.item, plan.ElementPlan):
+        return ListGetter(field_plan.tag, compile_loader(field_plan.item))
+
+    raise Unsupported()
+
+
+def compile_loader(element_plan):
+    if isinstance(element_plan, plan.FieldPlan):
+        return FieldLoader(element_plan.required)
+    if isinstance(element_plan, plan.WrapperPlan):
+        return WrapperLoader(compile_getter(element_plan.wrapped))
+    if isinstance(element_plan, plan.ModelPlan):
+        return loader(element_plan)
+
+    raise Unsupported()
+
+
+def loader(model_plan):
+    """
+    Returns the model plan loader. The loader is compiled on the first call.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`paxb.plan.ModelPlan`
+    :return: model loader
+    :raise Unsupported: if the model plan contains plans the engine doesn't support
+    """
+
+    model_loader = model_plan.compiled.get('sax')
+    if model_loader is None:
+        plan.check_lookups(model_plan)
+        model_loader = model_plan.compiled['sax'] = ModelLoader(model_plan.construct)
+        try:
+            model_loader.fields = tuple(
+                (init_name, compile_getter(field_plan)) for _, init_name, field_plan in model_plan.fields
+            )
+        except Unsupported:
+            model_loader = model_plan.compiled['sax'] = False
+
+    if model_loader is False:
+        raise Unsupported()
+
+    return model_loader
+
+
+SIMPLE_PATH = re.compile(r'^[^/*.\[\]@()]+(/[^/*.\[\]@()]+)*$')
+
+
+def qualify(name):
+    """
+    Converts an expat name to an ElementTree qualified name.
+    """
+
+    return '{' + name if '}' in name else name
+
+
+def obj(model_plan, xml, envelope_tags=None):
+    """
+    Deserializes a model object from an xml document.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`paxb.plan.ModelPlan`
+    :param xml: xml document
+    :type xml: :py:class:`str` or bytes-like object
+    :param tuple envelope_tags: qualified names of the envelope elements the model element is located inside
+    :return: deserialized object
+    :raise Fallback: if the document can't be deserialized by the engine
+    :raise Unsupported: if the model plan contains plans the engine doesn't support
+    """
+
+    getter = ChildGetter(model_plan.tag, model_plan.idx, model_plan.required, loader(model_plan))
+
+    root = Frame()
+    result = []
+
+    if envelope_tags:
+        last = len(envelope_tags) - 1
+
+        def watcher(depth):
+            def watch(child_frame, child_idx, child_attrib):
+                if result:
+                    return
+                if depth == last:
+                    result.append(getter.attach(child_frame, child_attrib))
+                else:
+                    child_frame.watchers.setdefault(envelope_tags[depth + 1], []).append(watcher(depth + 1))
+
+            return watch
+
+        root.watchers[envelope_tags[0]] = [watcher(0)]
+    else:
+        result.append(getter.attach(root, {}))
+
+    stack = [root]
+
+    def start(tag, attrib):
+        parent = stack[-1]
+        if parent is None:
+            stack.append(None)
+            return
+
+        parent.text_open = False
+
+        tag = qualify(tag)
+        watchers = parent.watchers.get(tag)
+        if watchers is None:
+            stack.append(None)
+            return
+
+        if attrib:
+            attrib = {qualify(key): value for key, value in attrib.items()}
+
+        frame = Frame()
+        idx = parent.counts[tag] = parent.counts.get(tag, 0) + 1
+        for watch in watchers:
+            watch(frame, idx, attrib)
+
+        stack.append(frame)
+
+    def end(tag):
+        frame = stack.pop()
+        if frame is not None:
+            for close in frame.closers:
+                close(frame)
+
+    def data(text):
+        frame = stack[-1]
+        if frame is not None and frame.text_open:
+            frame.text.append(text)
+
+    parser = expat.ParserCreate(None, '}')
+    parser.buffer_text = True
+    parser.StartElementHandler = start
+    parser.EndElementHandler = end
+    parser.CharacterDataHandler = data
+
+    try:
+        parser.Parse(xml, True)
+    except Fallback:
+        raise
+    except Exception as e:
+        raise Fallback() from e
+
+    if not result:
+        raise Fallback()
+
+    return get(getter, result[0])
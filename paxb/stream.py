@@ -0,0 +1,370 @@
+"""
+The module implements streaming processing of large xml documents. Record elements are extracted from
+parser events as soon as they are parsed and removed from the tree afterwards, serialized records are written
+to the output one by one, so that a document of any size is processed in a constant memory.
+"""
+
+import collections
+import itertools
+import xml.etree.ElementTree as et
+
+from . import backends
+from . import codegen
+from . import encoder as default_encoder
+from . import exceptions as exc
+from . import mappers
+
+
+class RecordExtractor:
+    """
+    Record elements extractor. Consumes ``start`` and ``end`` parser events and returns completed
+    record elements located by the `path`. Processed elements are removed from their parents.
+
+    :param str path: slash-separated path to record elements starting from the document root element.
+                     The last path element is the record element name
+    :param dict ns_map: mapping from a namespace prefix to a full name
+    """
+
+    def __init__(self, path, ns_map=None):
+        names = path.split('/')
+
+        self.tags = mappers.resolve_path(path, ns_map)
+        self.parent_path = codegen.root_path(tuple(names[:-1]))
+        self.name = names[-1]
+
+        self.depth = 0
+        self.matched = 0
+        self.count = 0
+        # open elements that are not record descendants
+        self.stack = []
+
+    def process(self, events):
+        """
+        Processes parser events.
+
+        :param events: iterable of (event, element) pairs
+        :return: generator of completed (record element, record element linked path) pairs
+        """
+
+        tags, stack = self.tags, self.stack
+        record_depth = len(tags)
+
+        for event, element in events:
+            if event == 'start':
+                self.depth += 1
+                if self.depth > record_depth:
+                    continue
+
+                stack.append(element)
+                if self.matched == self.depth - 1 and element.tag == tags[self.matched]:
+                    self.matched += 1
+                    if self.matched == record_depth - 1:
+                        self.count = 0
+
+            elif event == 'end':
+                self.depth -= 1
+                if self.depth >= record_depth:
+                    continue
+
+                stack.pop()
+                if self.matched == self.depth + 1:
+                    self.matched -= 1
+                    if self.matched == record_depth - 1:
+                        self.count += 1
+                        yield element, (self.parent_path, self.name, self.count)
+
+                # all the record element descendants are removed together with it
+                if stack:
+                    stack[-1].remove(element)
+
+
+def loader(model_plan, engine):
+    """
+    Returns a function deserializing a model object from a record element.
+
+    :param model_plan: model plan
+    :type model_plan: :py:class:`paxb.plan.ModelPlan`
+    :param str engine: deserialization engine
+    :return: function accepting a record element and its linked path
+    """
+
+    if engine == 'codegen':
+        return codegen.loader(model_plan)
+    elif engine == 'mappers':
+        return lambda element, path: model_plan.load(element, codegen.flatten(path))
+    else:
+        raise ValueError("unknown engine '{}'".format(engine))
+
+
+class FeedDeserializer:
+    """
+    Push-style incremental deserializer. Data chunks are fed to the deserializer as soon as they are received
+    and the model objects are read as soon as their record elements are parsed, so that neither the whole
+    document nor its element tree is kept in memory.
+
+    .. code-block:: python
+
+        deserializer = paxb.FeedDeserializer(Record, 'envelope/records/record')
+        for chunk in chunks:
+            deserializer.feed(chunk)
+            for obj in deserializer.read_objects():
+                process(obj)
+        deserializer.close()
+        for obj in deserializer.read_objects():
+            process(obj)
+
+    :param cls: :py:func:`paxb.model` decorated class
+    :param str path: slash-separated path to record elements starting from the document root element
+                     (see :py:func:`paxb.iter_xml`)
+    :param dict ns_map: mapping from a namespace prefix to a full name
+    :param str engine: deserialization engine: ``'codegen'`` or ``'mappers'`` (see :py:func:`paxb.iter_xml`)
+    :param backend: xml tree backend the document is parsed by (see :py:func:`paxb.from_xml`)
+    """
+
+    def __init__(self, cls, path, ns_map=None, engine='codegen', backend='etree'):
+        self.load = loader(mappers.ModelXmlMapper(cls, ns_map=ns_map).compile(), engine)
+        self.extractor = RecordExtractor(path, ns_map)
+        self.parser = backends.get_backend(backend).pull_parser(events=('start', 'end'))
+
+    def feed(self, data):
+        """
+        Feeds a document chunk to the parser.
+
+        :param data: document chunk
+        :type data: :py:class:`bytes` or :py:class:`str`
+        """
+
+        self.parser.feed(data)
+
+    def close(self):
+        """
+        Signals the parser the document is complete. Raises a parse error if the document is not well-formed.
+        The objects parsed on closing are returned by the following :py:meth:`read_objects` call.
+        """
+
+        self.parser.close()
+
+    def read_objects(self):
+        """
+        Returns the objects parsed from the data fed since the previous call.
+
+        :return: deserialized objects generator
+        """
+
+        for element, path in self.extractor.process(self.parser.read_events()):
+            yield self.load(element, path)
+
+
+def escape_text(text):
+    """
+    Escapes element text.
+    """
+
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+
+    return text
+
+
+def escape_attribute(value):
+    """
+    Escapes attribute value.
+    """
+
+    value = escape_text(value)
+    if '"' in value:
+        value = value.replace('"', '&quot;')
+    if '\n' in value:
+        value = value.replace('\n', '&#10;')
+    if '\r' in value:
+        value = value.replace('\r', '&#13;')
+    if '\t' in value:
+        value = value.replace('\t', '&#09;')
+
+    return value
+
+
+class XmlWriter:
+    """
+    Streaming xml writer. Serializes ``paxb`` model objects one by one and writes them
+    to a binary file object inside the envelope elements. Only the element tree of the object being written
+    is kept in memory so that any number of objects can be written incrementally.
+
+    Namespaces from `ns_map` are declared on the outermost envelope element, namespaces missing
+    in `ns_map` are declared on the serialized elements they are used by.
+
+    The writer can be used as a context manager closing the envelope elements on exit.
+
+    :param file: binary file object the document is written to
+    :param str envelope: slash-separated envelope elements path, for example ``'envelope/records'``.
+                         If ``None`` objects are written without an envelope
+    :param dict ns_map: mapping from a namespace prefix to a full name
+    :param encoder: value encoder
+    :param str encoding: document encoding
+    :param bool xml_declaration: write xml declaration
+    :param str engine: serialization engine (see :py:func:`paxb.to_xml`)
+    """
+
+    def __init__(
+        self, file, envelope=None, ns_map=None, encoder=default_encoder, encoding='utf-8', xml_declaration=False,
+        engine='codegen',
+    ):
+        if engine not in ('codegen', 'mappers'):
+            raise ValueError("unknown engine '{}'".format(engine))
+
+        self.file = file
+        self.envelope = envelope.split('/') if envelope else []
+        self.ns_map = ns_map or {}
+        self.encoder = encoder
+        self.encoding = encoding
+        self.xml_declaration = xml_declaration
+        self.engine = engine
+
+        self.prefixes = {uri: prefix for prefix, uri in self.ns_map.items()}
+        self.prefix_counter = itertools.count()
+        # namespaces declared on the envelope: a mapping from a namespace full name to a prefix,
+        # None key holds the default namespace
+        self.scope = {None: None}
+        self.opened = False
+        self.closed = False
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+
+    def open(self):
+        """
+        Writes xml declaration and envelope opening tags. Called automatically on the first object writing.
+        """
+
+        if self.opened:
+            return
+        self.opened = True
+
+        chunks = []
+        if self.xml_declaration:
+            chunks.append("<?xml version='1.0' encoding='{}'?>\n".format(self.encoding))
+
+        for depth, name in enumerate(self.envelope):
+            chunks.append('<' + name)
+            if depth == 0:
+                for prefix, uri in sorted(self.ns_map.items()):
+                    self.declare(uri, prefix, self.scope, chunks)
+            chunks.append('>')
+
+        self.flush(chunks)
+
+    def write(self, obj, name=None, ns=None):
+        """
+        Serializes an object and writes it inside the envelope.
+
+        :param obj: object to be serialized
+        :param str name: name of the serialized object element. If `None` model decorator `name` argument will be used
+        :param str ns: namespace of the serialized object element. If `None` model decorator `ns` argument will be used
+        """
+
+        if self.closed:
+            raise exc.SerializationError("writer is closed")
+
+        self.open()
+
+        model_plan = mappers.ModelXmlMapper(obj.__class__, name, ns, self.ns_map).compile()
+        if self.engine == 'codegen':
+            element = codegen.dumper(model_plan, inline=self.encoder is default_encoder)(obj, self.encoder)
+        else:
+            element = model_plan.xml(obj, et.Element(None), self.encoder, idx=1, children={})
+
+        if element is not None:
+            chunks = []
+            self.serialize(element, self.scope, chunks)
+            self.flush(chunks)
+
+    def close(self):
+        """
+        Writes envelope closing tags.
+        """
+
+        if self.closed:
+            return
+
+        self.open()
+        self.closed = True
+        self.flush(['</{}>'.format(name) for name in reversed(self.envelope)])
+
+    def flush(self, chunks):
+        if chunks:
+            self.file.write(''.join(chunks).encode(self.encoding, 'xmlcharrefreplace'))
+
+    def declare(self, uri, prefix, scope, chunks):
+        scope[uri] = prefix
+        if prefix:
+            chunks.append(' xmlns:{}="{}"'.format(prefix, escape_attribute(uri)))
+        else:
+            scope[None] = uri
+            chunks.append(' xmlns="{}"'.format(escape_attribute(uri)))
+
+    def qualify(self, tag, scope, declarations, attribute=False):
+        """
+        Returns a prefixed name of the `tag`. Namespaces not declared in the `scope` are added to `declarations`
+        (a mapping from a namespace full name to a prefix, ``None`` key undeclares the default namespace).
+        """
+
+        if tag[:1] != '{':
+            if not attribute and scope[None] is not None:
+                # the default namespace is not applied to unqualified elements
+                declarations[None] = None
+            return tag
+
+        uri, name = tag[1:].split('}', 1)
+
+        prefix = declarations.get(uri, scope.get(uri))
+        if prefix is None or (attribute and not prefix):
+            # attributes are not qualified by the default namespace so they require a prefix
+            prefix = self.prefixes.get(uri)
+            if not prefix or prefix in scope.values() or prefix in declarations.values():
+                prefix = 'ns{}'.format(next(self.prefix_counter))
+            declarations[uri] = prefix
+
+        return '{}:{}'.format(prefix, name) if prefix else name
+
+    def serialize(self, element, scope, chunks):
+        declarations = collections.OrderedDict()
+        tag = self.qualify(element.tag, scope, declarations)
+        attributes = [
+            (self.qualify(key, scope, declarations, attribute=True), value) for key, value in element.attrib.items()
+        ]
+
+        chunks.append('<' + tag)
+        if declarations:
+            scope = dict(scope)
+            for uri, prefix in declarations.items():
+                if uri is None:
+                    del scope[scope[None]]
+                    scope[None] = None
+                    chunks.append(' xmlns=""')
+                else:
+                    self.declare(uri, prefix, scope, chunks)
+
+        for key, value in attributes:
+            chunks.append(' {}="{}"'.format(key, escape_attribute(value)))
+
+        if element.text or len(element):
+            chunks.append('>')
+            if element.text:
+                chunks.append(escape_text(element.text))
+            for child in element:
+                self.serialize(child, scope, chunks)
+            chunks.append('</{}>'.format(tag))
+        else:
+            chunks.append(' />')
+
+        if element.tail:
+            chunks.append(escape_text(element.tail))
@@ -57,6 +57,10 @@ setup(
     packages=find_packages(),
     install_requires=requirements,
     tests_require=test_requirements,
+    extras_require={
+        'lxml': ['lxml'],
+        'numpy': ['numpy'],
+    },
     classifiers=[
         'Development Status :: 4 - Beta',
         'Intended Audience :: Developers',
@@ -0,0 +1,146 @@
+import asyncio
+import io
+
+import pytest
+
+import paxb as pb
+from paxb import exceptions as exc
+
+
+@pb.model(name='record', ns='data')
+class Record:
+    id = pb.attr(converter=int)
+    value = pb.field(default=None)
+
+
+ns_map = {'data': 'http://www.test1.org'}
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<envelope xmlns:data="http://www.test1.org">
+    <header>
+        <data:record id="0"/>
+    </header>
+    <records>
+        <data:record id="1"><data:value>value1</data:value></data:record>
+        <data:record id="2"/>
+        <data:other id="3"/>
+    </records>
+    <records>
+        <data:record id="4"><data:record id="5"/></data:record>
+    </records>
+</envelope>
+'''
+
+
+@pb.model(name='user', ns='doc', ns_map={'data': 'http://www.test2.org'})
+class User:
+    name = pb.attr()
+    email = pb.field(ns='data', default=None)
+    occupations = pb.wrap('occupations', pb.as_list(pb.field(name='occupation', factory=list)))
+
+
+users = [
+    User(name='Alex', email='alex@gmail.com', occupations=['yandex', 'skbkontur']),
+    User(name='Anna "A&A"'),
+    User(name='Анна'),
+]
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+async def read_objects(iterator):
+    objects = []
+    async for obj in iterator:
+        objects.append(obj)
+
+    return objects
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1024])
+def test_aiter_xml(chunk_size):
+
+    async def test():
+        reader = asyncio.StreamReader()
+        reader.feed_data(xml.encode())
+        reader.feed_eof()
+
+        iterator = pb.aiter_xml(Record, reader, 'envelope/records/data:record', ns_map, chunk_size=chunk_size)
+        return await read_objects(iterator)
+
+    assert run(test()) == [
+        Record(id=1, value='value1'),
+        Record(id=2),
+        Record(id=4),
+    ]
+
+
+def test_aiter_xml_incremental():
+
+    async def test():
+        reader = asyncio.StreamReader()
+        iterator = pb.aiter_xml(Record, reader, 'records/record', ns_map)
+
+        reader.feed_data(b'<records><record id="1"/><rec')
+        assert await iterator.__anext__() == Record(id=1)
+
+        reader.feed_data(b'ord id="2"/></records>')
+        reader.feed_eof()
+        assert await read_objects(iterator) == [Record(id=2)]
+
+    run(test())
+
+
+def test_aiter_xml_errors():
+
+    async def test():
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'<records><record/></records>')
+        reader.feed_eof()
+
+        await read_objects(pb.aiter_xml(Record, reader, 'records/record', ns_map))
+
+    with pytest.raises(exc.DeserializationError, match=r"required attribute '/records/record\[1\]/id' not found"):
+        run(test())
+
+    with pytest.raises(ValueError, match="unknown engine 'expat'"):
+        pb.aiter_xml(Record, asyncio.StreamReader(), 'records/record', ns_map, engine='expat')
+
+
+class StreamWriter:
+    """
+    In-memory stream writer implementing :py:class:`asyncio.StreamWriter` writing interface.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.drained = 0
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        self.drained = len(self.chunks)
+
+
+def test_async_xml_writer():
+    ns_map = {'doc': 'http://www.test1.org', 'data': 'http://www.test2.org'}
+    writer = StreamWriter()
+
+    async def test():
+        async with pb.AsyncXmlWriter(writer, 'envelope', ns_map=ns_map) as xml_writer:
+            for user in users:
+                await xml_writer.write(user)
+                assert writer.drained == len(writer.chunks)
+
+    run(test())
+
+    assert len(writer.chunks) == 5
+    assert writer.drained == 5
+    assert writer.chunks == list(pb.to_xml_chunks(users, envelope='envelope', ns_map=ns_map))
+    assert list(pb.iter_xml(User, io.BytesIO(b''.join(writer.chunks)), 'envelope/doc:user', ns_map)) == users
@@ -0,0 +1,126 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import paxb as pb
+from paxb import exceptions as exc
+
+numpy = pytest.importorskip('numpy')
+
+
+@pb.model(name='telemetry')
+class Telemetry:
+    ids = pb.as_array(pb.attribute(), dtype='int32')
+    samples = pb.as_array(pb.field(name='sample'))
+    counts = pb.wrap('counts', pb.as_array(pb.field(name='count'), dtype='int64'))
+    packed = pb.as_array(pb.field(), dtype='float32', packed=True)
+
+
+xml = (
+    b'<telemetry ids="1 2 3">'
+    b'<sample>0.5</sample><sample>1.5</sample><sample>-2.0</sample>'
+    b'<counts><count>10</count><count>20</count></counts>'
+    b'<packed>0.25 0.5</packed>'
+    b'</telemetry>'
+)
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_array_deserialization(engine):
+    obj = pb.from_xml(Telemetry, xml, engine=engine)
+
+    assert obj.ids.dtype == numpy.int32
+    assert obj.ids.tolist() == [1, 2, 3]
+    assert obj.samples.dtype == numpy.float64
+    assert obj.samples.tolist() == [0.5, 1.5, -2.0]
+    assert obj.counts.dtype == numpy.int64
+    assert obj.counts.tolist() == [10, 20]
+    assert obj.packed.dtype == numpy.float32
+    assert obj.packed.tolist() == [0.25, 0.5]
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_array_serialization(engine):
+    obj = Telemetry(
+        ids=numpy.array([1, 2, 3], dtype='int32'),
+        samples=numpy.array([0.5, 1.5, -2.0]),
+        counts=[10, 20],
+        packed=numpy.array([0.25, 0.5], dtype='float32'),
+    )
+
+    assert pb.to_xml(obj, engine=engine) == xml
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_empty_arrays(engine):
+    obj = Telemetry(ids=[], samples=[], counts=[0], packed=[])
+    serialized = pb.to_xml(obj, engine=engine)
+    assert serialized == b'<telemetry ids=""><counts><count>0</count></counts><packed /></telemetry>'
+
+    obj = pb.from_xml(Telemetry, serialized, engine=engine)
+    assert [len(array) for array in (obj.ids, obj.samples, obj.packed)] == [0, 0, 0]
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_missing_arrays(engine):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        attribute = pb.as_array(pb.attribute(default=None))
+        packed = pb.as_array(pb.field(default=None), packed=True)
+        samples = pb.as_array(pb.field(name='sample', default=None))
+
+    obj = pb.from_xml(TestModel, '<test_model/>', engine=engine)
+    assert (obj.attribute, obj.packed) == (None, None)
+    assert obj.samples.tolist() == []
+
+    obj = pb.from_xml(TestModel, '<test_model attribute=""><packed/></test_model>', engine=engine)
+    assert (obj.attribute.tolist(), obj.packed.tolist()) == ([], [])
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_array_precision(engine):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        single = pb.as_array(pb.attribute(), dtype='float32')
+        double = pb.as_array(pb.field(name='double'))
+
+    obj = TestModel(single=[0.1, 1 / 3], double=[0.1, 1 / 3])
+    serialized = pb.to_xml(obj, engine=engine)
+    assert serialized == (
+        b'<test_model single="0.1 0.33333334"><double>0.1</double><double>0.3333333333333333</double></test_model>'
+    )
+
+    loaded = pb.from_xml(TestModel, serialized, engine=engine)
+    assert numpy.array_equal(loaded.single, numpy.array(obj.single, dtype='float32'))
+    assert pb.to_xml(loaded, engine=engine) == serialized
+
+
+def test_array_comparison():
+    obj1 = Telemetry(ids=[1], samples=[0.5], counts=[1], packed=[])
+    obj2 = Telemetry(ids=[2], samples=[1.5], counts=[2], packed=[])
+
+    # array fields are excluded from the comparison
+    assert obj1 == obj2
+    assert pb.from_xml(Telemetry, xml) == pb.from_xml(Telemetry, xml)
+
+
+def test_array_errors():
+    with pytest.raises(exc.DeserializationError, match=r"required element '/telemetry\[1\]/sample\[2\]' not found"):
+        pb.from_xml(Telemetry, '<telemetry ids="1"><sample>1</sample><sample/><packed/></telemetry>')
+
+    with pytest.raises(exc.DeserializationError, match=r"required element '/telemetry\[1\]/packed\[1\]' not found"):
+        pb.from_xml(Telemetry, '<telemetry ids="1"><counts/></telemetry>')
+
+    with pytest.raises(TypeError, match='as_array wrapped object must be a field or an attribute'):
+        pb.as_array(pb.as_list(pb.field()))
+
+
+def test_numpy_imported_on_demand():
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(pb.__file__)))
+    code = 'import sys, paxb; assert "numpy" not in sys.modules'
+
+    subprocess.run([sys.executable, '-c', code], env=env, check=True)
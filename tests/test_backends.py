@@ -0,0 +1,144 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+import paxb as pb
+from paxb import backends
+
+lxml_etree = pytest.importorskip('lxml.etree')
+
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<doc:envelope xmlns:doc="http://www.test1.org" xmlns:data="http://www.test2.org">
+    <doc:user name="Alex" age="26">
+        <doc:contacts>
+            <doc:phone>+79204563539</doc:phone>
+            <doc:email>alex@gmail.com</doc:email>
+            <doc:email>alex@mail.ru</doc:email>
+        </doc:contacts>
+        <data:occupations>
+            <data:occupation title="yandex">
+                <data:address>Moscow</data:address>
+                <data:employees>8854</data:employees>
+            </data:occupation>
+            <data:occupation title="skbkontur">
+                <data:address>Yekaterinburg</data:address>
+                <data:employees>7742</data:employees>
+            </data:occupation>
+        </data:occupations>
+    </doc:user>
+</doc:envelope>
+'''
+
+
+@pb.model(name='occupation', ns='data', ns_map={'data': 'http://www.test2.org'})
+class Occupation:
+    title = pb.attr()
+    address = pb.field()
+    employees = pb.field(converter=int)
+
+
+@pb.model(name='user', ns='doc', ns_map={'doc': 'http://www.test1.org'})
+class User:
+    name = pb.attr()
+    age = pb.attr(converter=int)
+
+    phone = pb.wrap('contacts', pb.field())
+    emails = pb.wrap('contacts', pb.as_list(pb.field(name='email')))
+
+    occupations = pb.wrap(
+        'occupations', pb.lst(pb.nested(Occupation)), ns='data', ns_map={'data': 'http://www.test2.org'},
+    )
+    occupation = pb.nested(Occupation, default=None)
+
+
+ns_map = {'doc': 'http://www.test1.org'}
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_lxml_deserialization(engine):
+    expected = pb.from_xml(User, xml, envelope='doc:envelope', ns_map=ns_map)
+
+    assert pb.from_xml(User, xml, envelope='doc:envelope', ns_map=ns_map, engine=engine, backend='lxml') == expected
+    assert pb.from_xml(User, xml.encode(), envelope='doc:envelope', ns_map=ns_map, backend='lxml') == expected
+
+
+def test_lxml_tree_deserialization():
+    expected = pb.from_xml(User, xml, envelope='doc:envelope', ns_map=ns_map)
+
+    root = lxml_etree.fromstring(xml.encode())
+    assert pb.from_xml(User, root) == expected
+    assert pb.from_xml(User, lxml_etree.ElementTree(root)) == expected
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+@pytest.mark.parametrize('envelope', [None, 'doc:envelope'])
+def test_lxml_serialization(engine, envelope):
+    user = pb.from_xml(User, xml, envelope='doc:envelope', ns_map=ns_map)
+    user.occupation = user.occupations[0]
+
+    serialized = pb.to_xml(user, envelope=envelope, ns_map=ns_map, engine=engine, backend='lxml')
+    assert serialized.startswith(b'<doc:envelope' if envelope else b'<doc:user')
+
+    expected = pb.to_xml(user, envelope=envelope, ns_map=ns_map)
+    kwargs = dict(envelope='doc:envelope', ns_map=ns_map) if envelope else {}
+    assert pb.from_xml(User, serialized, **kwargs) == pb.from_xml(User, expected, **kwargs)
+
+
+def test_lxml_iter_xml():
+    objects = pb.iter_xml(User, io.BytesIO(xml.encode()), 'doc:envelope/doc:user', ns_map, backend='lxml')
+
+    assert list(objects) == [pb.from_xml(User, xml, envelope='doc:envelope', ns_map=ns_map)]
+
+
+def test_get_backend():
+    assert backends.get_backend('etree') is backends.etree
+
+    lxml = backends.get_backend('lxml')
+    assert backends.get_backend('lxml') is lxml
+    assert backends.get_backend(lxml) is lxml
+
+    with pytest.raises(ValueError, match="unknown backend 'unknown'"):
+        backends.get_backend('unknown')
+
+
+def test_lxml_feed_deserializer():
+    deserializer = pb.FeedDeserializer(User, 'doc:envelope/doc:user', ns_map, backend='lxml')
+
+    data = xml.encode()
+    for start in range(0, len(data), 10):
+        deserializer.feed(data[start:start + 10])
+    deserializer.close()
+
+    assert list(deserializer.read_objects()) == [pb.from_xml(User, xml, envelope='doc:envelope', ns_map=ns_map)]
+
+
+def test_lxml_entities_not_resolved(tmp_path):
+    secret = tmp_path / 'secret.txt'
+    secret.write_text('secret')
+
+    @pb.model(name='test_model')
+    class TestModel:
+        element = pb.field(default=None)
+
+    xml = (
+        '<!DOCTYPE test_model [<!ENTITY secret SYSTEM "file://{}">]>'
+        '<test_model><element>&secret;</element></test_model>'
+    ).format(secret)
+
+    lxml = backends.get_backend('lxml')
+    for document in (xml, xml.encode(), memoryview(xml.encode())):
+        assert pb.from_xml(TestModel, document, backend=lxml).element != 'secret'
+
+    objects = pb.iter_xml(TestModel, io.BytesIO(xml.encode()), 'test_model', backend='lxml')
+    assert [obj.element for obj in objects] != ['secret']
+
+
+def test_lxml_imported_on_demand():
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(pb.__file__)))
+    code = 'import sys, paxb; assert "lxml" not in sys.modules'
+
+    subprocess.run([sys.executable, '-c', code], env=env, check=True)
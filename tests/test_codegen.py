@@ -0,0 +1,204 @@
+import linecache
+
+import attr
+import pytest
+
+import paxb as pb
+from paxb import codegen
+from paxb import exceptions as exc
+from paxb import mappers
+
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<doc:envelope xmlns:doc="http://www.test1.org" xmlns:data="http://www.test2.org">
+    <doc:user name="Alex" surname="Ivanov" age="26">
+        <doc:birthdate year="1992" month="06" day="14"/>
+        <doc:contacts>
+            <doc:phone>+79204563539</doc:phone>
+            <doc:email>alex@gmail.com</doc:email>
+            <doc:email>alex@mail.ru</doc:email>
+        </doc:contacts>
+        <doc:documents>
+            <doc:passport series="3127" number="836815"/>
+        </doc:documents>
+        <data:occupations>
+            <data:occupation title="yandex">
+                <data:address>Moscow</data:address>
+                <data:employees>8854</data:employees>
+            </data:occupation>
+            <data:occupation title="skbkontur">
+                <data:address>Yekaterinburg</data:address>
+                <data:employees>7742</data:employees>
+            </data:occupation>
+        </data:occupations>
+        <doc:grades>
+            <doc:grade>5</doc:grade>
+        </doc:grades>
+        <doc:grades>
+            <doc:grade>4</doc:grade>
+            <doc:grade>3</doc:grade>
+        </doc:grades>
+    </doc:user>
+</doc:envelope>
+'''
+
+
+@pb.model(name='occupation', ns='data', ns_map={'data': 'http://www.test2.org'})
+class Occupation:
+    title = pb.attr()
+    address = pb.field()
+    employees = pb.field(converter=int)
+
+
+@pb.model(name='user', ns='doc', ns_map={'doc': 'http://www.test1.org'})
+class User:
+    name = pb.attr()
+    surname = pb.attr()
+    age = pb.attr(converter=int)
+    _nickname = pb.attr(default=None)
+
+    birth_year = pb.wrap('birthdate', pb.attr('year', converter=int))
+    birth_month = pb.wrap('birthdate', pb.attr('month', converter=int))
+
+    phone = pb.wrap('contacts', pb.field())
+    emails = pb.wrap('contacts', pb.as_list(pb.field(name='email')))
+
+    passport_series = pb.wrap('documents/passport', pb.attr('series'))
+    passport_number = pb.wrap('documents/passport', pb.attr('number'))
+
+    occupations = pb.wrap(
+        'occupations', pb.lst(pb.nested(Occupation)), ns='data', ns_map={'data': 'http://www.test2.org'},
+    )
+    grades = pb.as_list(pb.wrap('grades', pb.as_list(pb.field('grade'))))
+
+    citizenship = pb.field(default='RU')
+    aliases = pb.field(factory=list)
+    occupation = pb.nested(Occupation, default=None)
+
+
+def test_engines_equivalence():
+    kwargs = dict(envelope='doc:envelope', ns_map={'doc': 'http://www.test1.org'})
+
+    codegen_user = pb.from_xml(User, xml, engine='codegen', **kwargs)
+    mappers_user = pb.from_xml(User, xml, engine='mappers', **kwargs)
+
+    assert codegen_user == mappers_user
+    assert attr.asdict(codegen_user) == {
+        'name': 'Alex',
+        'surname': 'Ivanov',
+        'age': 26,
+        '_nickname': None,
+        'birth_year': 1992,
+        'birth_month': 6,
+        'phone': '+79204563539',
+        'emails': ['alex@gmail.com', 'alex@mail.ru'],
+        'passport_series': '3127',
+        'passport_number': '836815',
+        'occupations': [
+            {'title': 'yandex', 'address': 'Moscow', 'employees': 8854},
+            {'title': 'skbkontur', 'address': 'Yekaterinburg', 'employees': 7742},
+        ],
+        'grades': [['5'], ['4', '3']],
+        'citizenship': 'RU',
+        'aliases': [],
+        'occupation': None,
+    }
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_engines_errors(engine):
+
+    @pb.model(name='nested')
+    class Nested:
+        elements = pb.as_list(pb.field(name='element'))
+
+    @pb.model(name='test_model')
+    class TestModel:
+        nested = pb.as_list(pb.wrap('wrapper', pb.nested(Nested)))
+
+    xml = '<test_model><wrapper><nested><element>1</element><element/></nested></wrapper></test_model>'
+
+    with pytest.raises(
+        exc.DeserializationError,
+        match=r"required element '/root/test_model\[1\]/wrapper\[1\]/nested\[1\]/element\[2\]' not found",
+    ):
+        pb.from_xml(TestModel, '<root>{}</root>'.format(xml), envelope='root', engine=engine)
+
+
+def test_serialization_engines_equivalence():
+    kwargs = dict(envelope='doc:envelope', ns_map={'doc': 'http://www.test1.org'})
+
+    user = pb.from_xml(User, xml, **kwargs)
+    user.occupation = user.occupations[1]
+    user.grades.append([])
+
+    assert pb.to_xml(user, engine='codegen', **kwargs) == pb.to_xml(user, engine='mappers', **kwargs)
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_serialization_engines_errors(engine):
+
+    @pb.model(name='nested')
+    class Nested:
+        element1 = pb.field(idx=2)
+        element2 = pb.field(default=None)
+
+    @pb.model(name='test_model')
+    class TestModel:
+        nested = pb.as_list(pb.wrap('wrapper', pb.nested(Nested)))
+
+    with pytest.raises(
+        exc.SerializationError,
+        match=r"serialization can't be completed because element1\[2\] is going to be serialized, "
+              r"but element1\[1\] is not serialized.",
+    ):
+        pb.to_xml(TestModel(nested=[Nested(element1='1')]), engine=engine)
+
+    with pytest.raises(exc.SerializationError, match=r"required element 'nested' is not set"):
+        pb.to_xml(TestModel(nested=[None]), engine=engine)
+
+
+def test_shared_wrapper_tag_serialization():
+
+    @pb.model(name='test_model')
+    class TestModel:
+        element = pb.field(name='wrapper')
+        wrapped = pb.wrap('wrapper', pb.field(name='element'), idx=2)
+        listed = pb.as_list(pb.wrap('listed', pb.field(name='element')))
+        listed_wrapped = pb.wrap('listed', pb.attr(name='attrib'))
+
+    obj = TestModel(element='1', wrapped='2', listed=['3', '4'], listed_wrapped='5')
+
+    assert pb.to_xml(obj, engine='codegen') == pb.to_xml(obj, engine='mappers')
+
+
+def test_generated_source():
+
+    @pb.model(name='test_model')
+    class TestModel:
+        element = pb.field()
+
+    load = codegen.loader(mappers.ModelXmlMapper(TestModel).compile())
+
+    source = ''.join(linecache.getlines(load.__code__.co_filename))
+    assert source.startswith('def load_TestModel(element, path):')
+    assert load is codegen.loader(mappers.ModelXmlMapper(TestModel).compile())
+
+    dump = codegen.dumper(mappers.ModelXmlMapper(TestModel).compile())
+
+    source = ''.join(linecache.getlines(dump.__code__.co_filename))
+    assert source.startswith('def dump_TestModel(obj, encoder):')
+    assert dump is codegen.dumper(mappers.ModelXmlMapper(TestModel).compile())
+
+
+def test_unknown_engine():
+
+    @pb.model
+    class TestModel:
+        pass
+
+    with pytest.raises(ValueError, match="unknown engine 'unknown'"):
+        pb.from_xml(TestModel, '<TestModel/>', engine='unknown')
+
+    with pytest.raises(ValueError, match="unknown engine 'unknown'"):
+        pb.to_xml(TestModel(), engine='unknown')
@@ -0,0 +1,124 @@
+import array
+import datetime as dt
+import io
+import math
+import typing as tp
+
+import pytest
+
+import paxb as pb
+from paxb import exceptions as exc
+
+
+@pb.model(name='record', ns='data')
+class Record:
+    id: int = pb.attr()
+    price: float = pb.field(default=None)
+    quantity: int = pb.wrap('stock', pb.field(name='quantity', default=0))
+    date: dt.date = pb.field(default=None)
+    name = pb.field(default='unknown')
+    code = pb.attr(converter=lambda value: value and value.upper(), default=None)
+    tags = pb.as_list(pb.field(name='tag'))
+
+
+ns_map = {'data': 'http://www.test1.org'}
+
+xml = b'''<?xml version="1.0" encoding="utf-8"?>
+<envelope xmlns:data="http://www.test1.org">
+    <records>
+        <data:record id="1" code="a">
+            <data:price>1.5</data:price>
+            <data:stock><data:quantity>10</data:quantity></data:stock>
+            <data:date>2020-01-02</data:date>
+            <data:name>first</data:name>
+            <data:tag>tag</data:tag>
+        </data:record>
+        <data:record id="2"/>
+    </records>
+</envelope>
+'''
+
+path = 'envelope/records/data:record'
+
+
+def test_to_columns():
+    columns = pb.to_columns(Record, io.BytesIO(xml), path, ns_map=ns_map)
+
+    assert list(columns) == ['id', 'price', 'quantity', 'date', 'name', 'code']
+    assert columns['id'] == array.array('q', [1, 2])
+    assert columns['price'][0] == 1.5 and math.isnan(columns['price'][1])
+    assert columns['quantity'] == array.array('q', [10, 0])
+    assert columns['date'] == [dt.date(2020, 1, 2), None]
+    assert columns['name'] == ['first', 'unknown']
+    assert columns['code'] == ['A', None]
+
+
+def test_to_columns_selected_fields():
+    columns = pb.to_columns(Record, io.BytesIO(xml), path, fields=['quantity', 'id'], ns_map=ns_map)
+
+    assert columns == {'id': array.array('q', [1, 2]), 'quantity': array.array('q', [10, 0])}
+
+
+def test_to_numpy_columns():
+    numpy = pytest.importorskip('numpy')
+
+    columns = pb.to_columns(Record, io.BytesIO(xml), path, ns_map=ns_map, kind='numpy')
+
+    assert columns['id'].dtype == numpy.int64
+    assert columns['id'].tolist() == [1, 2]
+    assert columns['price'].dtype == numpy.float64
+    assert columns['name'].dtype == object
+    assert columns['name'].tolist() == ['first', 'unknown']
+
+    columns = pb.to_columns(Record, io.BytesIO(b'<envelope/>'), 'envelope/record', ns_map=ns_map, kind='numpy')
+    assert columns['id'].dtype == numpy.int64
+    assert len(columns['id']) == 0
+
+
+def test_to_columns_optional_and_string_annotations():
+
+    @pb.model(name='record')
+    class TestRecord:
+        price: tp.Optional[float] = pb.attr(default=None)
+        quantity: 'int' = pb.attr(default=0)
+        amount: 'tp.Optional[float]' = pb.field(default=None)
+        date: 'dt.date' = pb.field(default=None)
+
+    xml = (
+        b'<records>'
+        b'<record price="1.5" quantity="2"><amount>3.5</amount><date>2020-01-02</date></record>'
+        b'<record/>'
+        b'</records>'
+    )
+
+    columns = pb.to_columns(TestRecord, io.BytesIO(xml), 'records/record')
+
+    assert columns['price'].typecode == 'd'
+    assert columns['price'][0] == 1.5 and math.isnan(columns['price'][1])
+    assert columns['quantity'] == array.array('q', [2, 0])
+    assert columns['amount'].typecode == 'd'
+    assert columns['amount'][0] == 3.5 and math.isnan(columns['amount'][1])
+    assert columns['date'] == [dt.date(2020, 1, 2), None]
+
+    obj = pb.from_xml(TestRecord, xml, envelope='records')
+    assert (obj.quantity, obj.amount, obj.date) == (2, 3.5, dt.date(2020, 1, 2))
+
+
+def test_to_columns_errors():
+
+    @pb.model(name='record')
+    class IntRecord:
+        value: int = pb.field(default=None)
+
+    with pytest.raises(exc.DeserializationError, match=r"field 'value' of '/envelope/record\[2\]' is not set"):
+        pb.to_columns(IntRecord, io.BytesIO(b'<envelope><record><value>1</value></record><record/></envelope>'),
+                      'envelope/record')
+
+    with pytest.raises(ValueError, match="field 'tags' can't be extracted into a column"):
+        pb.to_columns(Record, io.BytesIO(xml), path, fields=['tags'], ns_map=ns_map)
+
+    with pytest.raises(ValueError, match="Record has no field 'unknown'"):
+        pb.to_columns(Record, io.BytesIO(xml), path, fields=['unknown'], ns_map=ns_map)
+
+    with pytest.raises(ValueError, match="unknown column kind 'list'"):
+        pb.to_columns(Record, io.BytesIO(xml), path, kind='list')
@@ -0,0 +1,157 @@
+import datetime as dt
+import decimal
+import enum
+import typing as tp
+
+import pytest
+
+import paxb as pb
+from paxb import decoder
+
+
+class Color(enum.Enum):
+    RED = 1
+    GREEN = 'green'
+
+
+def test_default_decoders():
+    assert decoder.dispatch(str) is None
+    assert decoder.dispatch(int)('1') == 1
+    assert decoder.dispatch(float)('1.5') == 1.5
+    assert decoder.dispatch(decimal.Decimal)('1.10') == decimal.Decimal('1.10')
+    assert decoder.dispatch(bytes)('dmFsdWU=') == b'value'
+    assert decoder.dispatch(dt.date)('2020-01-02') == dt.date(2020, 1, 2)
+    assert decoder.dispatch(dt.datetime)('2020-01-02T03:04:05') == dt.datetime(2020, 1, 2, 3, 4, 5)
+
+    decode_bool = decoder.dispatch(bool)
+    assert [decode_bool(value) for value in ('true', '1', 'True')] == [True] * 3
+    assert [decode_bool(value) for value in ('false', '0', 'False')] == [False] * 3
+    with pytest.raises(ValueError, match="invalid boolean value 'yes'"):
+        decode_bool('yes')
+
+    decode_color = decoder.dispatch(Color)
+    assert decoder.dispatch(Color) is decode_color
+    assert [decode_color(value) for value in ('1', 'RED', 'Color.RED')] == [Color.RED] * 3
+    assert decode_color('green') is Color.GREEN
+    with pytest.raises(ValueError, match="'blue' is not a valid Color"):
+        decode_color('blue')
+
+
+def test_datetime_decoding():
+    assert decoder.parse_datetime('2020-01-02T03:04:05.123Z') == dt.datetime(
+        2020, 1, 2, 3, 4, 5, 123000, dt.timezone.utc,
+    )
+    assert decoder.parse_datetime('2020-01-02 03:04-02:30') == dt.datetime(
+        2020, 1, 2, 3, 4, tzinfo=dt.timezone(-dt.timedelta(hours=2, minutes=30)),
+    )
+    with pytest.raises(ValueError, match="invalid datetime value '2020-01-02'"):
+        decoder.parse_datetime('2020-01-02')
+
+    # date fields holding a full datetime are truncated to the date
+    assert decoder.decode_date('2020-01-02T03:04:05') == dt.date(2020, 1, 2)
+    assert decoder.decode_date('2020-01-02') == dt.date(2020, 1, 2)
+    with pytest.raises(ValueError, match="invalid datetime value '2020-01'"):
+        decoder.decode_date('2020-01')
+
+    # repeated values are parsed once
+    assert decoder.decode_datetime('2020-01-02T03:04:05') is decoder.decode_datetime('2020-01-02T03:04:05')
+
+
+def test_decoder_registration():
+
+    class Point:
+        def __init__(self, x, y):
+            self.x, self.y = x, y
+
+    @decoder.register(Point)
+    def decode_point(value):
+        return Point(*map(int, value.split(',')))
+
+    assert decoder.dispatch(Point) is decode_point
+
+    @pb.model(name='test_model')
+    class TestModel:
+        point: Point = pb.attr()
+
+    obj = pb.from_xml(TestModel, '<test_model point="1,2"/>')
+    assert (obj.point.x, obj.point.y) == (1, 2)
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_annotated_fields_decoding(engine):
+
+    @pb.model(name='record')
+    class Record:
+        id: int = pb.attr()
+        flag: bool = pb.attr(default=False)
+        amount: decimal.Decimal = pb.field()
+        date: dt.date = pb.field(default=None)
+        color: Color = pb.wrap('color', pb.field(name='value'))
+        payload = pb.field(type=bytes)
+        ratio: float = pb.field(converter=lambda value: float(value) * 100)
+        values: tp.List[int] = pb.as_list(pb.field(name='value'))
+        labels: tp.List[str] = pb.as_list(pb.field(name='label'))
+
+    xml = '''
+    <record id="1">
+        <amount>1.50</amount>
+        <color><value>green</value></color>
+        <payload>dmFsdWU=</payload>
+        <ratio>0.5</ratio>
+        <value>1</value>
+        <value>2</value>
+        <label>a</label>
+    </record>
+    '''
+
+    obj = pb.from_xml(Record, xml, engine=engine)
+    assert obj == Record(
+        id=1, flag=False, amount=decimal.Decimal('1.50'), date=None, color=Color.GREEN, payload=b'value',
+        ratio='0.5', values=[1, 2], labels=['a'],
+    )
+
+    obj = pb.from_xml(Record, xml, engine=engine, lazy=True) if engine != 'expat' else obj
+    assert obj.id == 1
+    assert obj.values == [1, 2]
+    assert obj.ratio == 50.0
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_optional_list_items_decoding(engine):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        values: tp.List[int] = pb.as_list(pb.field(name='value', default=None))
+        wrapped: tp.List[int] = pb.as_list(pb.wrap('wrapper', pb.field(name='value', default=None)))
+
+    xml = '<test_model><value>1</value><value/><wrapper/><wrapper><value>2</value></wrapper></test_model>'
+
+    obj = pb.from_xml(TestModel, xml, engine=engine)
+    assert obj.values == [1, None]
+    assert obj.wrapped == [None, 2]
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_optional_fields_decoding(engine):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        number: tp.Optional[int] = pb.attr(default=None)
+        color: tp.Optional[Color] = pb.field(default=None)
+        date: tp.Union[None, dt.date] = pb.field(default=None)
+        values: tp.Optional[tp.List[float]] = pb.as_list(pb.field(name='value'))
+        union: tp.Union[int, str] = pb.field(default=None)
+
+    xml = (
+        '<test_model number="1"><color>1</color><date>2020-01-02T03:04:05</date>'
+        '<value>1.5</value><union>2</union></test_model>'
+    )
+
+    obj = pb.from_xml(TestModel, xml, engine=engine)
+    assert obj == TestModel(number=1, color=Color.RED, date=dt.date(2020, 1, 2), values=[1.5], union='2')
+
+    obj = pb.from_xml(TestModel, '<test_model/>', engine=engine)
+    assert obj == TestModel(number=None, color=None, date=None, values=[], union=None)
+
+    assert decoder.optional_type(tp.Optional[int]) is int
+    assert decoder.optional_type(tp.Union[int, str]) == tp.Union[int, str]
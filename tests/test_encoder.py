@@ -0,0 +1,78 @@
+import datetime as dt
+import typing as tp
+
+import pytest
+
+import paxb as pb
+from paxb import encoder
+
+
+def test_default_encoders():
+    assert encoder.encode('value') == 'value'
+    assert encoder.encode(b'value') == b'dmFsdWU='
+    assert encoder.encode(bytearray(b'value')) == b'dmFsdWU='
+    assert encoder.encode(dt.date(2020, 1, 2)) == '2020-01-02'
+    assert encoder.encode(dt.datetime(2020, 1, 2, 3, 4, 5)) == '2020-01-02T03:04:05'
+    assert encoder.encode(1) == '1'
+    assert encoder.encode(True) == 'True'
+
+
+def test_encoder_registration():
+
+    class Base:
+        pass
+
+    class Derived(Base):
+        pass
+
+    version = encoder.version
+
+    @encoder.register(Base)
+    def encode_base(value):
+        return 'base'
+
+    assert encoder.version == version + 1
+    assert encoder.dispatch(Base) is encode_base
+    # the encoder is resolved by the value type MRO
+    assert encoder.encode(Derived()) == 'base'
+
+    encoder.register(Derived, lambda value: 'derived')
+    assert encoder.encode(Derived()) == 'derived'
+    assert encoder.encode(Base()) == 'base'
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_annotated_fields_encoding(engine):
+
+    class Celsius(float):
+        pass
+
+    class Kelvin(Celsius):
+        pass
+
+    @pb.model(name='test_model')
+    class TestModel:
+        temperature: Celsius = pb.attr()
+        name: str = pb.field()
+        temperatures = pb.as_list(pb.field(name='temperature', type=tp.List[Celsius]))
+
+    obj = TestModel(temperature=Celsius(1), name='name', temperatures=[Celsius(2), Kelvin(3)])
+    assert pb.to_xml(obj, engine=engine) == (
+        b'<test_model temperature="1.0"><name>name</name>'
+        b'<temperature>2.0</temperature><temperature>3.0</temperature></test_model>'
+    )
+
+    # annotated type encoders are re-resolved after the registration
+    encoder.register(Celsius, lambda value: '{:g}C'.format(value))
+    assert pb.to_xml(obj, engine=engine) == (
+        b'<test_model temperature="1C"><name>name</name>'
+        b'<temperature>2C</temperature><temperature>3C</temperature></test_model>'
+    )
+
+    # values of the annotated type subclasses are encoded by their own encoders
+    encoder.register(Kelvin, lambda value: '{:g}K'.format(value))
+    obj.temperature = Kelvin(4)
+    assert pb.to_xml(obj, engine=engine) == (
+        b'<test_model temperature="4K"><name>name</name>'
+        b'<temperature>2C</temperature><temperature>3K</temperature></test_model>'
+    )
@@ -123,3 +123,34 @@ def test_indexes_deserialization():
             match=r"serialization can't be completed because field\[2\] is going to be serialized, "
                   r"but field\[1\] is not serialized."):
         pb.to_xml(obj)
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_unknown_prefix_error(engine):
+
+    @pb.model(name='nested_model')
+    class NestedModel:
+        element = pb.field(ns='unknown', default=None)
+
+    @pb.model(name='test_model', ns_map={'data': 'http://www.test.org'})
+    class TestModel:
+        element = pb.wrap('data:wrapper', pb.field(default=None))
+        nested = pb.nested(NestedModel, default=None)
+
+    xml = '<test_model xmlns:data="http://www.test.org"><data:wrapper><element>1</element></data:wrapper></test_model>'
+
+    with pytest.raises(SyntaxError, match="prefix 'unknown' not found in prefix map"):
+        pb.from_xml(TestModel, xml, engine=engine)
+
+    with pytest.raises(SyntaxError, match="prefix 'unknown' not found in prefix map"):
+        pb.from_xml(TestModel, xml, lazy=True)
+
+    with pytest.raises(SyntaxError, match="prefix 'unknown' not found in prefix map"):
+        pb.from_xml(NestedModel, '<unknown:nested_model/>', ns='unknown', engine=engine)
+
+    # prefixed wrapper names are resolved, names with unknown prefixes are not used for serialization
+    assert pb.from_xml(TestModel, xml, fields=['element'], engine=engine).element == '1'
+    assert pb.to_xml(TestModel(element='1', nested=NestedModel(element='2'))) == (
+        b'<test_model><data:wrapper><element>1</element></data:wrapper>'
+        b'<nested_model><element>2</element></nested_model></test_model>'
+    )
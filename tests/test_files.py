@@ -0,0 +1,135 @@
+import gzip
+import io
+import os
+import pathlib
+import threading
+
+import pytest
+
+import paxb as pb
+from paxb import backends
+
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<doc:envelope xmlns:doc="http://www.test1.org" xmlns:data="http://www.test2.org">
+    <doc:user name="Alex" age="26">
+        <doc:contacts>
+            <doc:phone>+79204563539</doc:phone>
+        </doc:contacts>
+        <data:occupations>
+            <data:occupation title="yandex">
+                <data:address>Moscow</data:address>
+                <data:employees>8854</data:employees>
+            </data:occupation>
+            <data:occupation title="skbkontur">
+                <data:address>Yekaterinburg</data:address>
+                <data:employees>7742</data:employees>
+            </data:occupation>
+        </data:occupations>
+    </doc:user>
+</doc:envelope>
+'''
+
+
+@pb.model(name='occupation', ns='data', ns_map={'data': 'http://www.test2.org'})
+class Occupation:
+    title = pb.attr()
+    address = pb.field()
+    employees = pb.field(converter=int)
+
+
+@pb.model(name='user', ns='doc', ns_map={'doc': 'http://www.test1.org'})
+class User:
+    name = pb.attr()
+    age = pb.attr(converter=int)
+    phone = pb.wrap('contacts', pb.field())
+    occupations = pb.wrap(
+        'occupations', pb.lst(pb.nested(Occupation)), ns='data', ns_map={'data': 'http://www.test2.org'},
+    )
+
+
+kwargs = dict(envelope='doc:envelope', ns_map={'doc': 'http://www.test1.org'})
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / 'document.xml'
+    path.write_bytes(xml.encode())
+
+    return path
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_file_deserialization(path, engine, monkeypatch):
+    expected = pb.from_xml(User, xml, **kwargs)
+
+    # the mapping is fed to the parser in several slices
+    monkeypatch.setattr(backends, 'CHUNK_SIZE', 100)
+
+    with path.open('rb') as file:
+        assert pb.from_xml(User, file, engine=engine, **kwargs) == expected
+
+    assert pb.from_xml(User, pathlib.Path(path), engine=engine, **kwargs) == expected
+    assert pb.from_xml(User, pathlib.Path(path), engine=engine, fields=['name'], **kwargs).name == 'Alex'
+    assert pb.from_xml(User, io.BytesIO(xml.encode()), engine=engine, **kwargs) == expected
+    assert pb.from_xml(User, io.StringIO(xml), engine=engine, **kwargs) == expected
+
+
+def test_lxml_file_deserialization(path):
+    pytest.importorskip('lxml.etree')
+
+    assert pb.from_xml(User, path, backend='lxml', **kwargs) == pb.from_xml(User, xml, **kwargs)
+
+
+def test_mapped(path):
+    with path.open('rb') as file:
+        file.seek(5)
+        with backends.mapped(file) as buffer:
+            assert bytes(buffer) == xml.encode()[5:]
+
+        # the file is not closed, the position is moved to the end of the file
+        assert file.read() == b''
+
+    with backends.mapped(str(path)) as buffer:
+        assert bytes(buffer) == xml.encode()
+
+    empty = path.with_name('empty.xml')
+    empty.write_bytes(b'')
+    with backends.mapped(empty) as buffer:
+        assert buffer == b''
+
+    file = io.BytesIO(b'<a/>')
+    with backends.mapped(file) as buffer:
+        assert bytes(buffer) == b'<a/>'
+
+    # the file object buffer is released
+    file.write(b'<b/>')
+
+
+def test_gzip_file_deserialization(tmp_path):
+    path = tmp_path / 'document.xml.gz'
+    with gzip.open(str(path), 'wb') as file:
+        file.write(xml.encode())
+
+    with gzip.open(str(path), 'rb') as file:
+        assert pb.from_xml(User, file, **kwargs) == pb.from_xml(User, xml, **kwargs)
+        assert file.read() == b''
+
+
+@pytest.mark.parametrize('compressed', [False, True])
+def test_pipe_deserialization(compressed):
+    data = gzip.compress(xml.encode()) if compressed else xml.encode()
+    read_fd, write_fd = os.pipe()
+
+    def write():
+        with os.fdopen(write_fd, 'wb') as pipe:
+            pipe.write(data)
+
+    writer = threading.Thread(target=write)
+    writer.start()
+    try:
+        with os.fdopen(read_fd, 'rb') as pipe:
+            source = gzip.GzipFile(fileobj=pipe) if compressed else pipe
+            assert pb.from_xml(User, source, **kwargs) == pb.from_xml(User, xml, **kwargs)
+    finally:
+        writer.join()
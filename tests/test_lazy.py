@@ -0,0 +1,144 @@
+import attr
+import pytest
+
+import paxb as pb
+from paxb import exceptions as exc
+
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<doc:envelope xmlns:doc="http://www.test1.org" xmlns:data="http://www.test2.org">
+    <doc:user name="Alex" age="26">
+        <doc:contacts>
+            <doc:phone>+79204563539</doc:phone>
+        </doc:contacts>
+        <data:occupations>
+            <data:occupation title="yandex">
+                <data:address>Moscow</data:address>
+                <data:employees>8854</data:employees>
+            </data:occupation>
+            <data:occupation title="skbkontur">
+                <data:address>Yekaterinburg</data:address>
+                <data:employees>7742</data:employees>
+            </data:occupation>
+        </data:occupations>
+    </doc:user>
+</doc:envelope>
+'''
+
+
+@pb.model(name='occupation', ns='data', ns_map={'data': 'http://www.test2.org'})
+class Occupation:
+    title = pb.attr()
+    address = pb.field()
+    employees = pb.field(converter=int)
+
+
+@pb.model(name='user', ns='doc', ns_map={'doc': 'http://www.test1.org'})
+class User:
+    name = pb.attr()
+    age = pb.attr(converter=int)
+    phone = pb.wrap('contacts', pb.field())
+    occupations = pb.wrap(
+        'occupations', pb.lst(pb.nested(Occupation)), ns='data', ns_map={'data': 'http://www.test2.org'},
+    )
+    aliases = pb.field(factory=list)
+
+
+kwargs = dict(envelope='doc:envelope', ns_map={'doc': 'http://www.test1.org'})
+
+
+def test_lazy_instance():
+    user = pb.from_xml(User, xml, lazy=True, **kwargs)
+
+    assert isinstance(user, User)
+    assert vars(user).keys() == {'__paxb_source__'}
+
+    assert user.age == 26
+    assert vars(user).keys() == {'__paxb_source__', 'age'}
+
+    occupations = user.occupations
+    assert isinstance(occupations[0], Occupation)
+    assert vars(occupations[0]).keys() == {'__paxb_source__'}
+    assert occupations[1].employees == 7742
+
+    assert user == pb.from_xml(User, xml, **kwargs)
+    assert pb.from_xml(User, xml, **kwargs) == user
+    assert repr(user) == repr(pb.from_xml(User, xml, **kwargs))
+
+
+def test_lazy_instance_errors():
+
+    @pb.model(name='test_model')
+    class TestModel:
+        element1 = pb.field()
+        element2 = pb.field(converter=int)
+
+    obj = pb.from_xml(TestModel, '<test_model><element2>a</element2></test_model>', lazy=True)
+
+    with pytest.raises(exc.DeserializationError, match=r"required element '/test_model\[1\]/element1\[1\]' not found"):
+        obj.element1
+
+    with pytest.raises(ValueError):
+        obj.element2
+
+    with pytest.raises(AttributeError):
+        obj.element3
+
+    with pytest.raises(exc.DeserializationError, match=r"required element '/test_model\[1\]' not found"):
+        pb.from_xml(TestModel, '<root/>', lazy=True)
+
+    assert pb.from_xml(TestModel, '<root/>', lazy=True, required=False) is None
+
+
+def test_materialize():
+
+    @pb.model(name='nested')
+    class Nested:
+        element = pb.field(validator=attr.validators.instance_of(int), converter=int)
+
+    @pb.model(name='test_model', frozen=True)
+    class TestModel:
+        attrib = pb.attr(default='default')
+        nested = pb.as_list(pb.nested(Nested))
+
+    obj = pb.from_xml(TestModel, '<test_model><nested><element>1</element></nested></test_model>', lazy=True)
+    nested = obj.nested[0]
+
+    assert pb.materialize(obj) is obj
+    assert type(obj) is TestModel
+    assert type(nested) is Nested
+    assert obj == TestModel(nested=[Nested(element=1)])
+    assert pb.materialize(obj) is obj
+
+    @pb.model(name='test_model')
+    class ValidatedModel:
+        element = pb.field(validator=attr.validators.in_(['valid']))
+
+    obj = pb.from_xml(ValidatedModel, '<test_model><element>invalid</element></test_model>', lazy=True)
+    assert obj.element == 'invalid'
+
+    with pytest.raises(ValueError):
+        pb.materialize(obj)
+
+
+@pytest.mark.parametrize('slots', [False, True])
+def test_materialize_post_init(slots):
+
+    @pb.model(name='test_model', slots=slots)
+    class TestModel:
+        x = pb.attr(converter=int)
+        z = pb.attr(converter=int)
+
+        def __attrs_post_init__(self):
+            self.z = self.x + self.z
+
+    xml = '<test_model x="100" z="1"/>'
+    assert pb.from_xml(TestModel, xml).z == 101
+
+    obj = pb.from_xml(TestModel, xml, lazy=True)
+    # fields accessed one by one are returned as deserialized
+    assert obj.z == 1
+
+    obj = pb.materialize(obj)
+    assert obj.z == 101
+    assert obj == pb.from_xml(TestModel, xml)
@@ -0,0 +1,57 @@
+from concurrent import futures
+
+import pytest
+
+import paxb as pb
+from paxb import exceptions as exc
+
+
+@pb.model(name='record')
+class Record:
+    id = pb.attr(converter=int)
+    value = pb.field(default=None)
+
+
+documents = ['<record id="{0}"><value>value{0}</value></record>'.format(i) for i in range(50)]
+documents[7] = '<record><value>value7</value></record>'
+documents[21] = '<record id="a"/>'
+documents[33] = '<record id="33">'
+
+
+def check(results):
+    assert len(results) == len(documents)
+
+    for idx, result in enumerate(results):
+        if idx == 7:
+            assert isinstance(result, exc.DeserializationError)
+            assert str(result) == "required attribute '/record[1]/id' not found"
+        elif idx == 21:
+            assert isinstance(result, exc.DeserializationError)
+            assert str(result).startswith('ValueError: invalid literal')
+        elif idx == 33:
+            assert isinstance(result, exc.DeserializationError)
+            assert str(result).startswith('ParseError: ')
+        else:
+            assert result == Record(id=idx, value='value{}'.format(idx))
+
+
+@pytest.mark.parametrize('executor', ['process', 'thread'])
+@pytest.mark.parametrize('chunk_size', [None, 1, 7])
+def test_from_xml_many(executor, chunk_size):
+    check(pb.from_xml_many(Record, iter(documents), workers=2, executor=executor, chunk_size=chunk_size))
+
+
+def test_from_xml_many_sequential():
+    check(pb.from_xml_many(Record, documents, workers=1))
+    assert pb.from_xml_many(Record, []) == []
+
+
+def test_from_xml_many_executor_instance():
+    with futures.ThreadPoolExecutor(2) as executor:
+        check(pb.from_xml_many(Record, documents, workers=2, executor=executor, engine='mappers'))
+        check(pb.from_xml_many(Record, documents, workers=2, executor=executor, engine='expat'))
+
+
+def test_from_xml_many_errors():
+    with pytest.raises(ValueError, match="unknown executor 'unknown'"):
+        pb.from_xml_many(Record, documents, workers=2, executor='unknown')
@@ -0,0 +1,87 @@
+"""
+Large documents tests. The timings are not asserted here (see benchmarks/scaling.py), the tests check
+that the single pass list deserialization, the serialized children tracking and the wide model children
+indexing produce the same results as small documents do.
+"""
+
+import pytest
+
+import paxb as pb
+
+SIZE = 5000
+
+
+@pb.model(name='item')
+class Item:
+    attrib = pb.attr()
+    element = pb.field()
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_field_list_deserialization(engine):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        items = pb.as_list(pb.field(name='item'))
+
+    xml = '<test_model>{}</test_model>'.format(''.join('<item>{}</item>'.format(i) for i in range(SIZE)))
+
+    obj = pb.from_xml(TestModel, xml, engine=engine)
+    assert obj.items == [str(i) for i in range(SIZE)]
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_nested_list_deserialization(engine):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        items = pb.as_list(pb.nested(Item))
+
+    xml = '<test_model>{}</test_model>'.format(
+        ''.join('<item attrib="{0}"><element>{0}</element></item>'.format(i) for i in range(SIZE)),
+    )
+
+    obj = pb.from_xml(TestModel, xml, engine=engine)
+    assert obj.items == [Item(attrib=str(i), element=str(i)) for i in range(SIZE)]
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_list_serialization(engine):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        items = pb.as_list(pb.nested(Item))
+        wrapped_items = pb.as_list(pb.wrap('wrapper', pb.field(name='item')))
+        values = pb.as_list(pb.field(name='value'))
+
+    obj = TestModel(
+        items=[Item(attrib=str(i), element=str(i)) for i in range(SIZE)],
+        wrapped_items=[str(i) for i in range(SIZE)],
+        values=[str(i) for i in range(SIZE)],
+    )
+
+    xml = pb.to_xml(obj, engine=engine, encoding='unicode')
+    assert xml == '<test_model>{}{}{}</test_model>'.format(
+        ''.join('<item attrib="{0}"><element>{0}</element></item>'.format(i) for i in range(SIZE)),
+        ''.join('<wrapper><item>{}</item></wrapper>'.format(i) for i in range(SIZE)),
+        ''.join('<value>{}</value>'.format(i) for i in range(SIZE)),
+    )
+    assert pb.from_xml(TestModel, xml, engine=engine) == obj
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_wide_model_deserialization(engine):
+    size = 500
+
+    fields = {'element{}'.format(i): pb.field(default=None) for i in range(size)}
+    TestModel = pb.model(type('TestModel', (), fields), name='test_model')
+
+    # the elements are in the reversed order so the field lookups don't match the document order
+    xml = '<test_model>{}</test_model>'.format(
+        ''.join('<element{0}>{0}</element{0}>'.format(i) for i in reversed(range(0, size, 2))),
+    )
+
+    obj = pb.from_xml(TestModel, xml, engine=engine)
+    assert [getattr(obj, 'element{}'.format(i)) for i in range(size)] == [
+        str(i) if i % 2 == 0 else None for i in range(size)
+    ]
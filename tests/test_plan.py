@@ -0,0 +1,179 @@
+import xml.etree.ElementTree as et
+from xml.etree import ElementPath
+
+import pytest
+
+import paxb as pb
+from paxb import exceptions as exc
+from paxb import mappers
+from paxb import plan
+
+
+def test_model_plan_cache():
+
+    @pb.model(name='nested_model', ns='testns1')
+    class NestedModel:
+        element = pb.field()
+
+    @pb.model(name='test_model', ns_map={'testns1': 'http://www.test1.org'})
+    class TestModel:
+        attrib = pb.attr()
+        nested = pb.nested(NestedModel)
+
+    plan1 = mappers.ModelXmlMapper(TestModel).compile()
+    plan2 = mappers.ModelXmlMapper(TestModel).compile()
+    assert plan1 is plan2
+
+    plan3 = mappers.ModelXmlMapper(TestModel, name='other_model').compile()
+    assert plan3 is not plan1
+    assert plan3.tag == 'other_model'
+
+    assert [name for name, _, _ in plan1.fields] == ['attrib', 'nested']
+    nested_plan = plan1.fields[1][2]
+    assert nested_plan.tag == '{http://www.test1.org}nested_model'
+    assert nested_plan.fields[0][2].tag == '{http://www.test1.org}element'
+
+
+def test_model_plan_order():
+
+    @pb.model(order=('element2', 'element1'))
+    class TestModel:
+        element1 = pb.field()
+        element2 = pb.field()
+        _element3 = pb.field()
+
+    plan = mappers.ModelXmlMapper(TestModel).compile()
+
+    assert [name for name, _, _ in plan.fields] == ['element1', 'element2', '_element3']
+    assert [name for name, _, _ in plan.xml_fields] == ['element2', 'element1', '_element3']
+    assert [init_name for _, init_name, _ in plan.fields] == ['element1', 'element2', 'element3']
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_children_index(engine):
+
+    @pb.model(name='nested')
+    class Nested:
+        element = pb.field()
+
+    fields = {'element{}'.format(i): pb.field(default=None) for i in range(plan.INDEX_LOOKUPS)}
+    fields.update(
+        second=pb.field(name='element1', idx=2, default=None),
+        third=pb.field(name='element1', idx=3, default=None),
+        items=pb.as_list(pb.field(name='item', default=None)),
+        nested=pb.as_list(pb.nested(Nested, default=None)),
+        wrapped=pb.wrap('wrapper', pb.field(name='element', default=None)),
+    )
+    TestModel = pb.model(type('TestModel', (), fields), name='test_model')
+
+    assert mappers.ModelXmlMapper(TestModel).compile().indexed
+
+    # the wide element is indexed, the narrow one is scanned
+    for children in [range(plan.INDEX_LOOKUPS), [1]]:
+        xml = (
+            '<test_model>' +
+            ''.join('<element{0}>value{0}</element{0}><item>item{0}</item>'.format(i) for i in children) +
+            '<element1>second</element1><wrapper><element>wrapped</element></wrapper>'
+            '<nested><element>nested1</element></nested><nested><element>nested2</element></nested>'
+            '</test_model>'
+        )
+        obj = pb.from_xml(TestModel, xml, engine=engine)
+
+        assert [getattr(obj, 'element{}'.format(i)) for i in children] == ['value{}'.format(i) for i in children]
+        assert obj.element3 == (None if len(children) == 1 else 'value3')
+        assert obj.second == 'second'
+        assert obj.third is None
+        assert obj.items == ['item{}'.format(i) for i in children]
+        assert obj.nested == [Nested(element='nested1'), Nested(element='nested2')]
+        assert obj.wrapped == 'wrapped'
+
+    with pytest.raises(exc.DeserializationError, match=r"required element '/test_model\[1\]/nested\[2\]/element\[1\]"):
+        pb.from_xml(TestModel, xml.replace('nested2', ''), engine=engine)
+
+
+def test_index_elements():
+    element = et.fromstring('<root><a>1</a><b/><!-- comment --><a>2</a></root>')
+
+    children = plan.index_elements(element)
+
+    assert [child.text for child in children['a']] == ['1', '2']
+    assert len(children['b']) == 1
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_indexed_elements_lookup(engine):
+    fields = {'element{}'.format(idx): pb.field(name='element', ns='test', idx=idx) for idx in range(1, 6)}
+    fields['missing'] = pb.field(name='element', ns='test', idx=6, default=None)
+    TestModel = pb.model(
+        type('TestModel', (), fields), name='test_model', ns='test', ns_map={'test': 'http://www.test1.org'},
+    )
+
+    xml = '<test_model xmlns="http://www.test1.org">{}</test_model>'.format(
+        ''.join('<element>{}</element>'.format(idx) for idx in range(1, 6)),
+    )
+
+    # elements are looked up without ElementPath expressions
+    ElementPath._cache.clear()
+    obj = pb.from_xml(TestModel, xml, engine=engine)
+    assert not ElementPath._cache
+
+    assert [getattr(obj, 'element{}'.format(idx)) for idx in range(1, 6)] == ['1', '2', '3', '4', '5']
+    assert obj.missing is None
+
+
+def test_group_wrappers():
+
+    @pb.model(name='test_model')
+    class TestModel:
+        attrib = pb.wrap('wrapper1/wrapper2', pb.attr())
+        element1 = pb.wrap('wrapper1', pb.field(default=None))
+        element2 = pb.field(default=None)
+        element3 = pb.wrap('wrapper1/wrapper2', pb.field(default=None))
+        element4 = pb.wrap('wrapper1', pb.field(), idx=2)
+
+    groups = mappers.ModelXmlMapper(TestModel).compile().groups
+
+    assert [type(member) for member in groups] == [plan.WrapperGroup, tuple, plan.WrapperGroup]
+
+    wrapper1 = groups[0]
+    assert wrapper1.keys() == ['attrib', 'element1', 'element3']
+    assert wrapper1.required
+    assert [type(member) for member in wrapper1.wrapped] == [plan.WrapperGroup, tuple]
+    assert wrapper1.wrapped[0].keys() == ['attrib', 'element3']
+    assert wrapper1.wrapped[1][0] == 'element1'
+
+    assert groups[2].keys() == ['element4']
+    assert groups[2].wrapper.idx == 2
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_shared_wrappers_deserialization(engine):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        attrib = pb.wrap('wrapper1/wrapper2', pb.attr(default=None))
+        element1 = pb.wrap('wrapper1', pb.field(default=None))
+        element2 = pb.wrap('wrapper1/wrapper2', pb.field(default=None))
+        element3 = pb.wrap('wrapper1', pb.field(name='element1', default=None), idx=2)
+
+    xml = (
+        '<test_model>'
+        '<wrapper1><element1>1</element1><wrapper2 attrib="a"><element2>2</element2></wrapper2></wrapper1>'
+        '<wrapper1><element1>3</element1></wrapper1>'
+        '</test_model>'
+    )
+    assert pb.from_xml(TestModel, xml, engine=engine) == TestModel(attrib='a', element1='1', element2='2', element3='3')
+    assert pb.from_xml(TestModel, '<test_model/>', engine=engine) == TestModel()
+
+    @pb.model(name='test_model')
+    class RequiredModel:
+        element1 = pb.wrap('wrapper1', pb.field(default=None))
+        element2 = pb.wrap('wrapper1/wrapper2', pb.field())
+
+    with pytest.raises(exc.DeserializationError, match=r"required element '/test_model\[1\]/wrapper1\[1\]' not found"):
+        pb.from_xml(RequiredModel, '<test_model/>', engine=engine)
+
+    with pytest.raises(
+        exc.DeserializationError, match=r"required element '/test_model\[1\]/wrapper1\[1\]/wrapper2\[1\]' not found",
+    ):
+        pb.from_xml(RequiredModel, '<test_model><wrapper1><element1/></wrapper1></test_model>', engine=engine)
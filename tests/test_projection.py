@@ -0,0 +1,136 @@
+import attr
+import pytest
+
+import paxb as pb
+
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<doc:envelope xmlns:doc="http://www.test1.org" xmlns:data="http://www.test2.org">
+    <doc:user name="Alex" age="26">
+        <doc:birthdate year="1992"/>
+        <doc:contacts>
+            <doc:phone>+79204563539</doc:phone>
+            <doc:email>alex@gmail.com</doc:email>
+            <doc:email>alex@mail.ru</doc:email>
+        </doc:contacts>
+        <data:occupations>
+            <data:occupation title="yandex">
+                <data:address>Moscow</data:address>
+                <data:employees>8854</data:employees>
+            </data:occupation>
+            <data:occupation title="skbkontur">
+                <data:address>Yekaterinburg</data:address>
+                <data:employees>7742</data:employees>
+            </data:occupation>
+        </data:occupations>
+    </doc:user>
+</doc:envelope>
+'''
+
+
+@pb.model(name='occupation', ns='data', ns_map={'data': 'http://www.test2.org'})
+class Occupation:
+    title = pb.attr()
+    address = pb.field()
+    employees = pb.field(converter=int)
+
+
+@pb.model(name='user', ns='doc', ns_map={'doc': 'http://www.test1.org'})
+class User:
+    name = pb.attr()
+    age = pb.attr(converter=int)
+    birth_year = pb.wrap('birthdate', pb.attr('year', converter=int))
+
+    phone = pb.wrap('contacts', pb.field())
+    emails = pb.wrap('contacts', pb.as_list(pb.field(name='email')))
+
+    occupations = pb.wrap(
+        'occupations', pb.lst(pb.nested(Occupation)), ns='data', ns_map={'data': 'http://www.test2.org'},
+    )
+
+    citizenship = pb.field(default='RU')
+    aliases = pb.field(factory=list)
+    occupation = pb.nested(Occupation, default=None)
+
+
+kwargs = dict(envelope='doc:envelope', ns_map={'doc': 'http://www.test1.org'})
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_projection(engine):
+    user = pb.from_xml(User, xml, fields=['age', 'phone', 'occupations.address'], engine=engine, **kwargs)
+
+    assert type(user) is User
+    assert attr.asdict(user) == {
+        'name': None,
+        'age': 26,
+        'birth_year': None,
+        'phone': '+79204563539',
+        'emails': None,
+        'occupations': [
+            {'title': None, 'address': 'Moscow', 'employees': None},
+            {'title': None, 'address': 'Yekaterinburg', 'employees': None},
+        ],
+        'citizenship': 'RU',
+        'aliases': [],
+        'occupation': None,
+    }
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_projection_whole_nested_model(engine):
+    user = pb.from_xml(User, xml, fields=['occupations.title', 'occupations', 'aliases'], engine=engine, **kwargs)
+
+    assert user.occupations == pb.from_xml(User, xml, **kwargs).occupations
+    assert user.name is None
+
+
+def test_projection_defaults():
+
+    @pb.model(name='test_model', frozen=True)
+    class TestModel:
+        element1 = pb.field(converter=int, validator=attr.validators.instance_of(int))
+        element2 = pb.field(converter=int, default='2')
+        element3 = pb.field(default=attr.Factory(lambda self: self.element1 and self.element1 * 3, takes_self=True))
+        element4 = pb.field(factory=list)
+
+    xml = '<test_model><element1>1</element1><element2>a</element2><element4>b</element4></test_model>'
+
+    for engine in ['codegen', 'mappers']:
+        obj = pb.from_xml(TestModel, xml, fields=['element1'], engine=engine)
+        assert obj == TestModel(element1=1, element2=2, element3=3, element4=[])
+
+        obj1, obj2 = (pb.from_xml(TestModel, xml, fields=['element1'], engine=engine) for _ in range(2))
+        assert obj1.element4 is not obj2.element4
+
+        obj = pb.from_xml(TestModel, '<test_model><element1>a</element1></test_model>', fields=[], engine=engine)
+        assert attr.astuple(obj) == (None, 2, None, [])
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_projection_post_init(engine):
+
+    @pb.model(name='test_model', frozen=True)
+    class TestModel:
+        element1 = pb.field()
+        element2 = pb.field(default='b')
+
+        def __attrs_post_init__(self):
+            object.__setattr__(self, 'element2', self.element2.upper())
+
+    xml = '<test_model><element1>a</element1><element2>c</element2></test_model>'
+
+    assert pb.from_xml(TestModel, xml, engine=engine) == TestModel(element1='a', element2='c')
+    assert attr.astuple(pb.from_xml(TestModel, xml, fields=['element2'], engine=engine)) == (None, 'C')
+    assert attr.astuple(pb.from_xml(TestModel, xml, fields=['element1'], engine=engine)) == ('a', 'B')
+
+
+def test_projection_errors():
+    with pytest.raises(ValueError, match="User has no field 'unknown'"):
+        pb.from_xml(User, xml, fields=['unknown'], **kwargs)
+
+    with pytest.raises(ValueError, match="Occupation has no field 'unknown'"):
+        pb.from_xml(User, xml, fields=['occupations.unknown'], **kwargs)
+
+    with pytest.raises(ValueError, match="field 'phone' is not a nested model"):
+        pb.from_xml(User, xml, fields=['phone.number'], **kwargs)
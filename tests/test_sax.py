@@ -0,0 +1,158 @@
+import pytest
+
+import paxb as pb
+from paxb import exceptions as exc
+from paxb import mappers
+from paxb import sax
+
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<doc:envelope xmlns:doc="http://www.test1.org" xmlns:data="http://www.test2.org">
+    <doc:user name="Alex" age="26">
+        <doc:birthdate year="1992" month="06"/>
+        <doc:contacts>
+            <doc:phone>+79204563539</doc:phone>
+            <doc:email>alex@gmail.com</doc:email>
+            <doc:email>alex@mail.ru</doc:email>
+        </doc:contacts>
+        <doc:documents>
+            <doc:passport series="3127" number="836815"/>
+        </doc:documents>
+        <data:occupations>
+            <data:occupation title="yandex">
+                <data:address>Moscow</data:address>
+                <data:employees>8854</data:employees>
+            </data:occupation>
+            <data:occupation title="skbkontur">
+                <data:address>Yekaterinburg</data:address>
+                <data:employees>7742</data:employees>
+            </data:occupation>
+        </data:occupations>
+        <doc:grades>
+            <doc:grade>5</doc:grade>
+        </doc:grades>
+        <doc:grades>
+            <doc:grade>4</doc:grade>
+            <doc:grade>3</doc:grade>
+        </doc:grades>
+    </doc:user>
+</doc:envelope>
+'''
+
+
+@pb.model(name='occupation', ns='data', ns_map={'data': 'http://www.test2.org'})
+class Occupation:
+    title = pb.attr()
+    address = pb.field()
+    employees = pb.field(converter=int)
+
+
+@pb.model(name='user', ns='doc', ns_map={'doc': 'http://www.test1.org'})
+class User:
+    name = pb.attr()
+    age = pb.attr(converter=int)
+    nickname = pb.attr(default=None)
+
+    birth_year = pb.wrap('birthdate', pb.attr('year', converter=int))
+    birth_month = pb.wrap('birthdate', pb.attr('month', converter=int))
+
+    phone = pb.wrap('contacts', pb.field())
+    emails = pb.wrap('contacts', pb.as_list(pb.field(name='email')))
+
+    passport_series = pb.wrap('documents/passport', pb.attr('series'))
+    passport_number = pb.wrap('documents/passport', pb.attr('number'))
+
+    occupations = pb.wrap(
+        'occupations', pb.lst(pb.nested(Occupation)), ns='data', ns_map={'data': 'http://www.test2.org'},
+    )
+    grades = pb.as_list(pb.wrap('grades', pb.as_list(pb.field('grade'))))
+
+    citizenship = pb.field(default='RU')
+    occupation = pb.nested(Occupation, default=None)
+
+
+def test_expat_engine():
+    kwargs = dict(envelope='doc:envelope', ns_map={'doc': 'http://www.test1.org'})
+
+    assert pb.from_xml(User, xml, engine='expat', **kwargs) == pb.from_xml(User, xml, **kwargs)
+    assert pb.from_xml(User, xml.encode(), engine='expat', **kwargs) == pb.from_xml(User, xml, **kwargs)
+
+    model_plan = mappers.ModelXmlMapper(User, ns_map=kwargs['ns_map']).compile()
+    envelope = mappers.resolve_path('doc:envelope', kwargs['ns_map'])
+    assert sax.obj(model_plan, xml, envelope) == pb.from_xml(User, xml, **kwargs)
+
+
+def test_expat_engine_elements_lookup():
+
+    @pb.model(name='nested')
+    class Nested:
+        attrib = pb.attr(ns='test', default=None)
+        text = pb.field(default=None)
+
+    @pb.model(name='test_model', ns_map={'test': 'http://www.test.org'})
+    class TestModel:
+        text = pb.field()
+        empty = pb.field(default=None)
+        second = pb.field(name='element', idx=2)
+        elements = pb.as_list(pb.field(name='element'))
+        nested = pb.as_list(pb.wrap('wrapper', pb.nested(Nested)))
+        missing = pb.wrap('wrapper', pb.field(default=None), idx=3)
+
+    xml = '''
+    <root>
+        <test_model>
+            <text> text <ignored>ignored</ignored> tail </text>
+            <empty></empty>
+            <element>1</element>
+            <element>2<element>nested</element></element>
+            <wrapper><nested xmlns:test="http://www.test.org" test:attrib="a1"/></wrapper>
+            <wrapper><nested attrib="ignored"><text>&lt;text&gt;<![CDATA[ & cdata]]></text></nested></wrapper>
+        </test_model>
+        <test_model><text>second</text></test_model>
+    </root>
+    '''
+
+    obj = sax.obj(mappers.ModelXmlMapper(TestModel).compile(), xml, ('root',))
+    assert obj == pb.from_xml(TestModel, xml, envelope='root', engine='codegen')
+    assert obj == TestModel(
+        text=' text ',
+        second='2',
+        elements=['1', '2'],
+        nested=[Nested(attrib='a1'), Nested(text='<text> & cdata')],
+    )
+
+
+@pytest.mark.parametrize('xml, envelope, error', [
+    ('<root><test_model/></root>', 'root', "required element '/root/test_model[1]/element[1]' not found"),
+    ('<root><test_model><element/></test_model></root>', 'root',
+     "required element '/root/test_model[1]/element[1]' not found"),
+    ('<root><test_model/></root>', 'envelope', "required element 'envelope' not found"),
+    ('<root></root>', 'root', "required element '/root/test_model[1]' not found"),
+])
+def test_expat_engine_errors(xml, envelope, error):
+
+    @pb.model(name='test_model')
+    class TestModel:
+        element = pb.field()
+
+    with pytest.raises(exc.DeserializationError) as e:
+        pb.from_xml(TestModel, xml, envelope=envelope, engine='expat')
+
+    assert str(e.value) == error
+
+
+def test_expat_engine_fallback():
+
+    @pb.model(name='test_model')
+    class TestModel:
+        element = pb.field(converter=int)
+
+    with pytest.raises(ValueError):
+        pb.from_xml(TestModel, '<test_model><element>a</element></test_model>', engine='expat')
+
+    with pytest.raises(SyntaxError):
+        pb.from_xml(TestModel, '<test_model><element>a</element>', engine='expat')
+
+    assert pb.from_xml(TestModel, '<root><x><test_model><element>1</element></test_model></x></root>',
+                       envelope='root/*', engine='expat') == TestModel(element=1)
+    assert pb.from_xml(TestModel, '<root/>', envelope='root', required=False, engine='expat') is None
@@ -0,0 +1,77 @@
+import pickle
+import typing as tp
+
+import attr
+import pytest
+
+import paxb as pb
+
+
+@pb.model(name='occupation', slots=True)
+class Occupation:
+    title = pb.attr()
+    rate: int = pb.field(validator=attr.validators.instance_of(int))
+
+
+@pb.model(name='user', slots=True, frozen=True)
+class User:
+    _name = pb.attr()
+    occupation = pb.nested(Occupation)
+    occupations = pb.wrap('occupations', pb.as_list(pb.nested(Occupation)))
+    emails: tp.List[str] = pb.as_list(pb.field(name='email'))
+
+
+xml = (
+    b'<user _name="Alex">'
+    b'<occupation title="yandex"><rate>1</rate></occupation>'
+    b'<occupations><occupation title="google"><rate>2</rate></occupation></occupations>'
+    b'<email>alex@gmail.com</email>'
+    b'</user>'
+)
+
+
+def expected():
+    return User(
+        name='Alex',
+        occupation={'title': 'yandex', 'rate': 1},
+        occupations=[Occupation(title='google', rate=2)],
+        emails=['alex@gmail.com'],
+    )
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_slotted_models(engine):
+    obj = pb.from_xml(User, xml, engine=engine)
+
+    assert not hasattr(obj, '__dict__')
+    assert not hasattr(obj.occupation, '__dict__')
+    assert obj == expected()
+    assert pickle.loads(pickle.dumps(obj)) == obj
+
+    if engine != 'expat':
+        assert pb.to_xml(obj, engine=engine) == xml
+
+
+def test_slotted_partial_models():
+    obj = pb.from_xml(User, xml, fields=['occupations.title'])
+
+    assert not hasattr(obj, '__dict__')
+    assert [attr.astuple(occupation) for occupation in obj.occupations] == [('google', None)]
+    assert obj.emails is None
+
+
+def test_slotted_lazy_models():
+    obj = pb.from_xml(User, xml, lazy=True)
+    assert obj.occupations[0].rate == 2
+
+    materialized = pb.materialize(obj)
+    assert type(materialized) is User
+    assert not hasattr(materialized, '__dict__')
+    assert type(materialized.occupation) is Occupation
+    assert type(materialized.occupations[0]) is Occupation
+    assert materialized == expected()
+    assert pb.materialize(materialized) is materialized
+
+    obj = pb.from_xml(Occupation, '<occupation title="yandex"><rate>invalid</rate></occupation>', lazy=True)
+    with pytest.raises(ValueError):
+        pb.materialize(obj)
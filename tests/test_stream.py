@@ -0,0 +1,198 @@
+import io
+import xml.etree.ElementTree as et
+
+import pytest
+
+import paxb as pb
+from paxb import exceptions as exc
+from paxb import stream
+
+
+@pb.model(name='record', ns='data')
+class Record:
+    id = pb.attr(converter=int)
+    value = pb.field(default=None)
+
+
+ns_map = {'data': 'http://www.test1.org'}
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<envelope xmlns:data="http://www.test1.org">
+    <header>
+        <data:record id="0"/>
+    </header>
+    <records>
+        <data:record id="1"><data:value>value1</data:value></data:record>
+        <data:record id="2"/>
+        <data:other id="3"/>
+    </records>
+    <records>
+        <data:record id="4"><data:record id="5"/></data:record>
+    </records>
+</envelope>
+'''
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_iter_xml(engine):
+    objects = pb.iter_xml(Record, io.BytesIO(xml.encode()), 'envelope/records/data:record', ns_map, engine=engine)
+
+    assert list(objects) == [
+        Record(id=1, value='value1'),
+        Record(id=2),
+        Record(id=4),
+    ]
+
+
+def test_iter_xml_root_record():
+    assert list(pb.iter_xml(Record, io.StringIO('<record id="1"/>'), 'record', ns_map)) == [Record(id=1)]
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+def test_iter_xml_errors(engine):
+    xml = '<envelope><records><record id="1"/><record/></records></envelope>'
+
+    with pytest.raises(
+        exc.DeserializationError, match=r"required attribute '/envelope/records/record\[2\]/id' not found",
+    ):
+        list(pb.iter_xml(Record, io.StringIO(xml), 'envelope/records/record', ns_map, engine=engine))
+
+
+def test_iter_xml_unknown_engine():
+    with pytest.raises(ValueError, match="unknown engine 'expat'"):
+        list(pb.iter_xml(Record, io.StringIO(xml), 'envelope/records/record', ns_map, engine='expat'))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1000])
+def test_feed_deserializer(chunk_size):
+    data = xml.encode()
+    deserializer = pb.FeedDeserializer(Record, 'envelope/records/data:record', ns_map)
+
+    objects = []
+    for start in range(0, len(data), chunk_size):
+        deserializer.feed(data[start:start + chunk_size])
+        objects.extend(deserializer.read_objects())
+
+        if start + chunk_size > data.index(b'<data:other'):
+            assert objects[:2] == [Record(id=1, value='value1'), Record(id=2)]
+
+    deserializer.close()
+    objects.extend(deserializer.read_objects())
+
+    assert objects == [
+        Record(id=1, value='value1'),
+        Record(id=2),
+        Record(id=4),
+    ]
+
+
+def test_feed_deserializer_errors():
+    deserializer = pb.FeedDeserializer(Record, 'records/record', ns_map)
+    deserializer.feed('<records><record id="1"/><record/>')
+
+    with pytest.raises(exc.DeserializationError, match=r"required attribute '/records/record\[2\]/id' not found"):
+        list(deserializer.read_objects())
+
+    deserializer = pb.FeedDeserializer(Record, 'records/record', ns_map)
+    deserializer.feed('<records><record id="1"/>')
+    assert list(deserializer.read_objects()) == [Record(id=1)]
+
+    with pytest.raises(et.ParseError):
+        deserializer.close()
+
+    with pytest.raises(ValueError, match="unknown engine 'expat'"):
+        pb.FeedDeserializer(Record, 'records/record', ns_map, engine='expat')
+
+
+def test_processed_elements_removed():
+    extractor = stream.RecordExtractor('envelope/records/data:record', ns_map)
+    parser = et.iterparse(io.BytesIO(xml.encode()), events=('start', 'end'))
+
+    records = []
+    for element, path in extractor.process(parser):
+        records.append((element.get('id'), path))
+        assert [stack_element.tag for stack_element in extractor.stack] == ['envelope', 'records']
+        assert extractor.stack[-1][0] is element
+
+    parent_path = (None, ('envelope', 'records'), None)
+    assert records == [
+        ('1', (parent_path, 'data:record', 1)),
+        ('2', (parent_path, 'data:record', 2)),
+        ('4', (parent_path, 'data:record', 1)),
+    ]
+    assert len(parser.root) == 0
+
+
+@pb.model(name='user', ns='doc', ns_map={'data': 'http://www.test2.org'})
+class User:
+    name = pb.attr()
+    nickname = pb.attr(ns='data', default=None)
+    email = pb.field(ns='data', default=None)
+    note = pb.field(ns='', default=None)
+    occupations = pb.wrap('occupations', pb.as_list(pb.field(name='occupation', factory=list)))
+
+
+users = [
+    User(name='Alex', nickname='al<e>x', email='alex@gmail.com', occupations=['yandex', 'skbkontur']),
+    User(name='Anna "A&A"', note='line1\nline2'),
+    User(name='Анна'),
+]
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers'])
+@pytest.mark.parametrize('ns_map', [
+    {'doc': 'http://www.test1.org', 'data': 'http://www.test2.org'},
+    {'': 'http://www.test1.org', 'doc': 'http://www.test1.org'},
+    {'doc': 'http://www.test1.org'},
+])
+def test_xml_writer(engine, ns_map):
+    file = io.BytesIO()
+    with pb.XmlWriter(file, 'envelope/users', ns_map=ns_map, xml_declaration=True, engine=engine) as writer:
+        for user in users:
+            writer.write(user)
+
+    document = file.getvalue()
+    assert document.startswith(b"<?xml version='1.0' encoding='utf-8'?>\n<envelope")
+    assert list(pb.iter_xml(User, io.BytesIO(document), 'envelope/users/doc:user', ns_map)) == users
+
+
+def test_xml_writer_output():
+    ns_map = {'doc': 'http://www.test1.org', 'data': 'http://www.test2.org'}
+
+    file = io.BytesIO()
+    with pb.XmlWriter(file, 'envelope', ns_map={'doc': 'http://www.test1.org'}) as writer:
+        writer.write(users[0])
+
+    assert file.getvalue() == (
+        b'<envelope xmlns:doc="http://www.test1.org">'
+        b'<doc:user xmlns:ns0="http://www.test2.org" name="Alex" ns0:nickname="al&lt;e&gt;x">'
+        b'<ns0:email>alex@gmail.com</ns0:email>'
+        b'<doc:occupations><doc:occupation>yandex</doc:occupation><doc:occupation>skbkontur</doc:occupation>'
+        b'</doc:occupations>'
+        b'</doc:user>'
+        b'</envelope>'
+    )
+    assert list(pb.iter_xml(User, io.BytesIO(file.getvalue()), 'envelope/doc:user', ns_map)) == users[:1]
+
+
+def test_xml_writer_closed():
+    writer = pb.XmlWriter(io.BytesIO())
+    writer.close()
+
+    with pytest.raises(exc.SerializationError, match='writer is closed'):
+        writer.write(users[0])
+
+
+def test_to_xml_chunks():
+    ns_map = {'doc': 'http://www.test1.org', 'data': 'http://www.test2.org'}
+
+    chunks = list(pb.to_xml_chunks(iter(users), envelope='envelope', ns_map=ns_map, encoding='cp1251'))
+
+    assert len(chunks) == 5
+    assert chunks[0] == b'<envelope xmlns:data="http://www.test2.org" xmlns:doc="http://www.test1.org">'
+    assert chunks[-1] == b'</envelope>'
+
+    document = b''.join(chunks).decode('cp1251')
+    assert list(pb.iter_xml(User, io.StringIO(document), 'envelope/doc:user', ns_map)) == users
+
+    assert list(pb.to_xml_chunks([users[2]])) == [pb.to_xml(users[2], encoding='utf-8')]
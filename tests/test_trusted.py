@@ -0,0 +1,129 @@
+import attr
+import pytest
+
+import paxb as pb
+from paxb import plan
+
+
+xml = '''<?xml version="1.0" encoding="utf-8"?>
+<doc:envelope xmlns:doc="http://www.test1.org">
+    <doc:user name="Alex" age="26">
+        <doc:contacts>
+            <doc:phone>+79204563539</doc:phone>
+            <doc:email>alex@gmail.com</doc:email>
+            <doc:email>alex@mail.ru</doc:email>
+        </doc:contacts>
+        <doc:occupations>
+            <doc:occupation title="yandex">
+                <doc:employees>8854</doc:employees>
+            </doc:occupation>
+            <doc:occupation title="skbkontur">
+                <doc:employees>7742</doc:employees>
+            </doc:occupation>
+        </doc:occupations>
+    </doc:user>
+</doc:envelope>
+'''
+
+
+@pb.model(name='occupation', ns='doc')
+class Occupation:
+    title = pb.attr()
+    employees = pb.field(converter=int)
+
+
+@pb.model(name='user', ns='doc', ns_map={'doc': 'http://www.test1.org'})
+class User:
+    name = pb.attr()
+    age = pb.attr(converter=int)
+    phone = pb.wrap('contacts', pb.field())
+    emails = pb.wrap('contacts', pb.as_list(pb.field(name='email')))
+    occupations = pb.wrap('occupations', pb.lst(pb.nested(Occupation)))
+    occupation = pb.nested(Occupation, default=None)
+
+
+kwargs = dict(envelope='doc:envelope', ns_map={'doc': 'http://www.test1.org'})
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_trusted_deserialization(engine):
+    obj = pb.from_xml(User, xml, engine=engine, trusted=True, **kwargs)
+
+    assert type(obj) is User
+    assert obj == pb.from_xml(User, xml, engine=engine, **kwargs)
+    assert obj.occupations[1] == Occupation(title='skbkontur', employees=7742)
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_trusted_validators_and_converters(engine):
+
+    @pb.model(name='nested')
+    class Nested:
+        element = pb.field(validator=attr.validators.instance_of(int))
+
+    @pb.model(name='test_model', frozen=True)
+    class TestModel:
+        attrib = pb.attr(converter=int)
+        element = pb.field(default='default', validator=attr.validators.in_(['valid']))
+        nested = pb.nested(Nested)
+        nested_list = pb.as_list(pb.nested(Nested, name='item'))
+
+    xml = (
+        '<test_model attrib="1">'
+        '<element>invalid</element><nested><element>a</element></nested><item><element>b</element></item>'
+        '</test_model>'
+    )
+
+    with pytest.raises((TypeError, ValueError)):
+        pb.from_xml(TestModel, xml, engine=engine)
+
+    obj = pb.from_xml(TestModel, xml, engine=engine, trusted=True)
+    assert attr.astuple(obj, recurse=False)[:2] == (1, 'invalid')
+    assert attr.astuple(obj.nested) == ('a',)
+    assert [attr.astuple(item) for item in obj.nested_list] == [('b',)]
+
+    xml = '<test_model attrib="2"><nested><element>c</element></nested></test_model>'
+    obj = pb.from_xml(TestModel, xml, engine=engine, trusted=True)
+    assert (obj.attrib, obj.element, obj.nested_list) == (2, 'default', [])
+
+
+@pytest.mark.parametrize('engine', ['codegen', 'mappers', 'expat'])
+def test_trusted_post_init(engine):
+
+    @pb.model(name='nested')
+    class Nested:
+        element = pb.field()
+
+        def __attrs_post_init__(self):
+            self.element = self.element.upper()
+
+    @pb.model(name='test_model', frozen=True)
+    class TestModel:
+        attrib = pb.attr()
+        nested = pb.nested(Nested)
+        total = attr.ib(init=False, default=None)
+
+        def __attrs_post_init__(self):
+            object.__setattr__(self, 'total', self.attrib + self.nested.element)
+
+    xml = '<test_model attrib="x"><nested><element>y</element></nested></test_model>'
+
+    obj = pb.from_xml(TestModel, xml, engine=engine, trusted=True)
+    assert obj == pb.from_xml(TestModel, xml, engine=engine)
+    assert (obj.nested.element, obj.total) == ('Y', 'xY')
+
+
+def test_trusted_plans():
+    model_plan = pb.mappers.ModelXmlMapper(User).compile()
+
+    trusted = plan.trust(model_plan)
+    assert trusted.trusted and not model_plan.trusted
+    assert plan.trust(model_plan) is trusted
+    assert plan.trust(trusted) is trusted
+
+    nested = {name: field_plan for name, _, field_plan in trusted.fields}['occupation']
+    assert nested.trusted
+
+    assert plan.passthrough(attr.fields(User).occupation.converter)
+    assert plan.passthrough(attr.fields(User).occupations.converter)
+    assert not plan.passthrough(attr.fields(User).age.converter)